@@ -1,10 +1,61 @@
-from django.contrib import admin
+import uuid
 
-from .models import TrainingProgram, Skill, EmployeeTraining
+from django.contrib import admin, messages
+from django.utils.translation import gettext_lazy as _, ngettext
+
+from .models import (
+    CLOSED_STATUSES, TrainingProgram, Skill, EmployeeTraining, TrainingSession, SessionBooking, TrainingHoursEntry,
+    ReminderOutbox, ProgramPrerequisite, ProgramClosure, TrendRollup, CohortRollup,
+    TranscriptJob, TrainingSettings,
+)
+from .pagination import EstimatingPaginator
+from .services.enrollment import complete_enrollments, soft_delete_enrollments
+
+ENROLLMENT_STATUSES = ('enrolled', 'in_progress', *CLOSED_STATUSES)
+
+
+class HubListFilter(admin.SimpleListFilter):
+    """Hubs taken from the (small) program table, never from enrollments."""
+    title = _('hub')
+    parameter_name = 'hub_id'
+
+    def lookups(self, request, model_admin):
+        hubs = TrainingProgram.all_objects.exclude(hub_id=None).values_list('hub_id', flat=True).order_by('hub_id')
+        return [(str(hub_id), str(hub_id)) for hub_id in hubs.distinct()]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(hub_id=self.value())
+        return queryset
+
+
+class StatusListFilter(admin.SimpleListFilter):
+    """Fixed choices, instead of a ``DISTINCT status`` over every enrollment."""
+    title = _('status')
+    parameter_name = 'status'
+
+    def lookups(self, request, model_admin):
+        return [(status, status.replace('_', ' ').capitalize()) for status in ENROLLMENT_STATUSES]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(status=self.value())
+        return queryset
+
+
+class ProgramListFilter(admin.RelatedFieldListFilter):
+    """Programs of the selected hub only."""
+
+    def field_choices(self, field, request, model_admin):
+        hub_id = request.GET.get(HubListFilter.parameter_name)
+        programs = TrainingProgram.all_objects.order_by('name')
+        if hub_id:
+            programs = programs.filter(hub_id=hub_id)
+        return [(program.pk, program.name) for program in programs.only('pk', 'name')]
 
 @admin.register(TrainingProgram)
 class TrainingProgramAdmin(admin.ModelAdmin):
-    list_display = ['name', 'duration_hours', 'is_mandatory', 'is_active', 'created_at']
+    list_display = ['name', 'duration_hours', 'is_mandatory', 'is_active', 'enrollment_count', 'completed_count', 'created_at']
     search_fields = ['name', 'description']
     readonly_fields = ['created_at', 'updated_at']
 
@@ -16,7 +67,115 @@ class SkillAdmin(admin.ModelAdmin):
 
 @admin.register(EmployeeTraining)
 class EmployeeTrainingAdmin(admin.ModelAdmin):
-    list_display = ['employee_id', 'employee_name', 'program', 'status', 'start_date', 'created_at']
+    # program_name is the denormalized program, so rows need no join.
+    list_display = ['employee_id', 'employee_name', 'program_name', 'status', 'start_date', 'created_at']
+    list_filter = [
+        HubListFilter, StatusListFilter, ('program', ProgramListFilter), 'start_date', 'completion_date',
+    ]
+    # Searched by get_search_results: stock lookups would cast the uuid to text.
+    search_fields = ['employee_id', 'employee_name']
+    readonly_fields = ['program_name', 'created_at', 'updated_at']
+    raw_id_fields = ['program']
+    ordering = ['-created_at']
+    paginator = EstimatingPaginator
+    show_full_result_count = False
+    actions = ['mark_completed', 'soft_delete']
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        An employee id matches exactly (``employee_id`` index). Any other
+        term is an ``employee_name`` prefix, searched only within the selected
+        hub, where the ``(hub_id, UPPER(employee_name))`` index from
+        migration 0007 serves it; across every hub it would scan the table.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        try:
+            return queryset.filter(employee_id=uuid.UUID(term)), False
+        except ValueError:
+            pass
+        if not request.GET.get(HubListFilter.parameter_name):
+            self.message_user(request, _('Select a hub to search by employee name.'), messages.WARNING)
+            return queryset.none(), False
+        return queryset.filter(employee_name__istartswith=term), False
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # The stock action loads and hard-deletes every selected row at once.
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(description=_('Mark selected enrollments completed'), permissions=['change'])
+    def mark_completed(self, request, queryset):
+        changed = complete_enrollments(queryset)
+        self.message_user(request, ngettext(
+            '%(count)d enrollment marked completed.', '%(count)d enrollments marked completed.', changed,
+        ) % {'count': changed})
+
+    @admin.action(description=_('Soft-delete selected enrollments'), permissions=['delete'])
+    def soft_delete(self, request, queryset):
+        removed = soft_delete_enrollments(queryset)
+        self.message_user(request, ngettext(
+            '%(count)d enrollment deleted.', '%(count)d enrollments deleted.', removed,
+        ) % {'count': removed})
+
+
+@admin.register(TrainingSession)
+class TrainingSessionAdmin(admin.ModelAdmin):
+    list_display = ['program', 'starts_at', 'location', 'capacity', 'seats_taken', 'created_at']
+    search_fields = ['location', 'program__name']
+    readonly_fields = ['seats_taken', 'created_at', 'updated_at']
+
+@admin.register(SessionBooking)
+class SessionBookingAdmin(admin.ModelAdmin):
+    list_display = ['employee_name', 'session', 'status', 'created_at']
     search_fields = ['employee_name', 'status']
     readonly_fields = ['created_at', 'updated_at']
 
+@admin.register(TrainingHoursEntry)
+class TrainingHoursEntryAdmin(admin.ModelAdmin):
+    list_display = ['employee_name', 'program', 'hours', 'occurred_on', 'created_at']
+    search_fields = ['employee_name']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(ReminderOutbox)
+class ReminderOutboxAdmin(admin.ModelAdmin):
+    list_display = ['recipient_kind', 'recipient_name', 'status', 'created_at', 'sent_at']
+    search_fields = ['recipient_name']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(ProgramPrerequisite)
+class ProgramPrerequisiteAdmin(admin.ModelAdmin):
+    list_display = ['program', 'requires', 'created_at']
+    search_fields = ['program__name', 'requires__name']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(ProgramClosure)
+class ProgramClosureAdmin(admin.ModelAdmin):
+    list_display = ['program', 'prerequisite', 'depth']
+    search_fields = ['program__name', 'prerequisite__name']
+    readonly_fields = ['program', 'prerequisite', 'depth', 'created_at', 'updated_at']
+
+@admin.register(TrendRollup)
+class TrendRollupAdmin(admin.ModelAdmin):
+    list_display = ['hub_id', 'program', 'grain', 'period', 'enrolled', 'completed', 'failed']
+    list_filter = ['grain']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(CohortRollup)
+class CohortRollupAdmin(admin.ModelAdmin):
+    list_display = ['hub_id', 'program', 'cohort', 'enrolled', 'completed', 'completed_30d']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(TranscriptJob)
+class TranscriptJobAdmin(admin.ModelAdmin):
+    list_display = ['pk', 'format', 'status', 'rendered', 'total', 'created_at', 'finished_at']
+    list_filter = ['status', 'format']
+    readonly_fields = ['employee_ids', 'archive_path', 'created_at', 'updated_at']
+
+@admin.register(TrainingSettings)
+class TrainingSettingsAdmin(admin.ModelAdmin):
+    list_display = ['hub_id', 'default_per_page', 'search_mode', 'export_row_limit', 'archive_retention_days']
+    readonly_fields = ['created_at', 'updated_at']
@@ -20,14 +20,40 @@ CONTEXT = """
 - employee_id (UUID, indexed) — references the employee's UUID
 - employee_name (str, cached)
 - program (FK → TrainingProgram)
+- program_name (str, cached copy of program.name; kept in sync on rename)
 - status (str, default 'enrolled') — typical values: enrolled | in_progress | completed | failed | cancelled
 - start_date (optional), completion_date (optional)
 - score (Decimal, optional) — e.g. 85.00 for 85%
 
+**TrainingSession**
+- program (FK → TrainingProgram), starts_at, ends_at (optional), location
+- capacity (int), seats_taken (int, maintained by the booking service)
+
+**SessionBooking**
+- session (FK → TrainingSession), employee_id (UUID), employee_name
+- status: confirmed | waitlisted | attended | cancelled
+- Book through services.sessions.book_seat so full sessions waitlist instead of overbooking
+
+**TrainingHoursEntry / EmployeeHoursRollup / HubHoursRollup**
+- Written automatically: completing an enrollment or marking a booking attended records hours
+- For hours per employee or quarter, read the monthly rollups (services.hours.employee_hours), not EmployeeTraining
+
+**TrendRollup / CohortRollup**
+- Weekly/monthly enrolled, completed and failed counts, and start-month cohorts with completions within 7/30/90 days
+- Maintained automatically on enrollment save/delete; program empty = hub total
+- For trend questions use services.trends.trend / cohorts instead of aggregating EmployeeTraining dates
+- For "top scorers" or "fastest completions" per program use get_training_leaderboard
+
+**ProgramPrerequisite / ProgramClosure**
+- ProgramPrerequisite: program requires `requires` to be completed first (direct edges, no cycles)
+- ProgramClosure: every direct and indirect prerequisite with its depth; maintained by services.prerequisites
+- Add or remove edges with services.prerequisites.add_prerequisite / remove_prerequisite, never directly
+- Eligibility: services.prerequisites.missing_prerequisites(program, employee_id); next steps: next_programs(hub_id, employee_id)
+
 ### Key flows
 
 1. **Create training catalog**: Create TrainingProgram records; mark mandatory ones with is_mandatory=True
-2. **Enroll employee**: Create EmployeeTraining with employee_id, program, status=enrolled, start_date
+2. **Enroll employee**: Create EmployeeTraining with employee_id, program, status=enrolled, start_date (refused while prerequisites are not completed)
 3. **Start training**: Update status → in_progress
 4. **Complete training**: Update status → completed, set completion_date, set score if assessed
 5. **Failed training**: Update status → failed, optionally re-enroll
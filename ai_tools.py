@@ -1,32 +1,49 @@
-"""AI tools for the Training module."""
+"""
+AI tools for the Training module.
+
+This module is imported at boot to register the tools, so it only declares
+their metadata. ``execute`` resolves the matching function in
+``training.tool_handlers`` on first call, keeping the ORM and service
+imports off the startup path.
+"""
+from importlib import import_module
+
 from assistant.tools import AssistantTool, register_tool
 
 
+def _handler(name):
+    return getattr(import_module('training.tool_handlers'), name)
+
+
+class _DelegatingTool(AssistantTool):
+    def execute(self, args, request):
+        return _handler(self.name)(args, request)
+
+
+class _AsyncDelegatingTool(_DelegatingTool):
+    async def aexecute(self, args, request):
+        return await _handler(f'a{self.name}')(args, request)
+
+
 @register_tool
-class ListTrainingPrograms(AssistantTool):
+class ListTrainingPrograms(_AsyncDelegatingTool):
     name = "list_training_programs"
-    description = "List training programs."
+    description = "List training programs with their enrollment, in-progress and completed counts."
     module_id = "training"
     required_permission = "training.view_trainingprogram"
     parameters = {
         "type": "object",
-        "properties": {"is_active": {"type": "boolean"}, "is_mandatory": {"type": "boolean"}},
+        "properties": {
+            "is_active": {"type": "boolean"}, "is_mandatory": {"type": "boolean"},
+            "sort": {"type": "string", "enum": ["name", "popularity", "completion_rate"]},
+        },
         "required": [],
         "additionalProperties": False,
     }
 
-    def execute(self, args, request):
-        from training.models import TrainingProgram
-        qs = TrainingProgram.objects.all()
-        if 'is_active' in args:
-            qs = qs.filter(is_active=args['is_active'])
-        if 'is_mandatory' in args:
-            qs = qs.filter(is_mandatory=args['is_mandatory'])
-        return {"programs": [{"id": str(p.id), "name": p.name, "duration_hours": p.duration_hours, "is_mandatory": p.is_mandatory, "is_active": p.is_active} for p in qs]}
-
 
 @register_tool
-class CreateTrainingProgram(AssistantTool):
+class CreateTrainingProgram(_DelegatingTool):
     name = "create_training_program"
     description = "Create a training program."
     module_id = "training"
@@ -42,16 +59,11 @@ class CreateTrainingProgram(AssistantTool):
         "additionalProperties": False,
     }
 
-    def execute(self, args, request):
-        from training.models import TrainingProgram
-        p = TrainingProgram.objects.create(name=args['name'], description=args.get('description', ''), duration_hours=args.get('duration_hours', 0), is_mandatory=args.get('is_mandatory', False))
-        return {"id": str(p.id), "name": p.name, "created": True}
-
 
 @register_tool
-class EnrollEmployeeInTraining(AssistantTool):
+class EnrollEmployeeInTraining(_DelegatingTool):
     name = "enroll_employee_in_training"
-    description = "Enroll an employee in a training program."
+    description = "Enroll an employee in a training program. Fails if the employee has not completed its prerequisites."
     module_id = "training"
     required_permission = "training.add_employeetraining"
     requires_confirmation = True
@@ -65,14 +77,9 @@ class EnrollEmployeeInTraining(AssistantTool):
         "additionalProperties": False,
     }
 
-    def execute(self, args, request):
-        from training.models import EmployeeTraining
-        t = EmployeeTraining.objects.create(employee_id=args['employee_id'], employee_name=args['employee_name'], program_id=args['program_id'], start_date=args.get('start_date'))
-        return {"id": str(t.id), "created": True}
-
 
 @register_tool
-class GetTrainingProgram(AssistantTool):
+class GetTrainingProgram(_DelegatingTool):
     name = "get_training_program"
     description = "Get details of a specific training program by ID."
     module_id = "training"
@@ -84,17 +91,9 @@ class GetTrainingProgram(AssistantTool):
         "additionalProperties": False,
     }
 
-    def execute(self, args, request):
-        from training.models import TrainingProgram
-        try:
-            p = TrainingProgram.objects.get(id=args['program_id'])
-        except TrainingProgram.DoesNotExist:
-            return {"error": "Training program not found"}
-        return {"id": str(p.id), "name": p.name, "description": p.description, "duration_hours": p.duration_hours, "is_mandatory": p.is_mandatory, "is_active": p.is_active}
-
 
 @register_tool
-class UpdateTrainingProgram(AssistantTool):
+class UpdateTrainingProgram(_DelegatingTool):
     name = "update_training_program"
     description = "Update a training program's details."
     module_id = "training"
@@ -112,21 +111,9 @@ class UpdateTrainingProgram(AssistantTool):
         "additionalProperties": False,
     }
 
-    def execute(self, args, request):
-        from training.models import TrainingProgram
-        try:
-            p = TrainingProgram.objects.get(id=args['program_id'])
-        except TrainingProgram.DoesNotExist:
-            return {"error": "Training program not found"}
-        for field in ('name', 'description', 'duration_hours', 'is_mandatory', 'is_active'):
-            if field in args:
-                setattr(p, field, args[field])
-        p.save()
-        return {"id": str(p.id), "name": p.name, "updated": True}
-
 
 @register_tool
-class DeleteTrainingProgram(AssistantTool):
+class DeleteTrainingProgram(_DelegatingTool):
     name = "delete_training_program"
     description = "Delete a training program by ID."
     module_id = "training"
@@ -139,18 +126,9 @@ class DeleteTrainingProgram(AssistantTool):
         "additionalProperties": False,
     }
 
-    def execute(self, args, request):
-        from training.models import TrainingProgram
-        try:
-            p = TrainingProgram.objects.get(id=args['program_id'])
-        except TrainingProgram.DoesNotExist:
-            return {"error": "Training program not found"}
-        p.delete()
-        return {"deleted": True}
-
 
 @register_tool
-class ListTrainingEnrollments(AssistantTool):
+class ListTrainingEnrollments(_AsyncDelegatingTool):
     name = "list_training_enrollments"
     description = "List employee training enrollments with optional filters."
     module_id = "training"
@@ -165,13 +143,19 @@ class ListTrainingEnrollments(AssistantTool):
         "additionalProperties": False,
     }
 
-    def execute(self, args, request):
-        from training.models import EmployeeTraining
-        qs = EmployeeTraining.objects.select_related('program').all()
-        if args.get('program_id'):
-            qs = qs.filter(program_id=args['program_id'])
-        if args.get('employee_id'):
-            qs = qs.filter(employee_id=args['employee_id'])
-        if args.get('status'):
-            qs = qs.filter(status=args['status'])
-        return {"enrollments": [{"id": str(e.id), "employee_name": e.employee_name, "program": e.program.name, "status": e.status, "start_date": str(e.start_date) if e.start_date else None, "completion_date": str(e.completion_date) if e.completion_date else None, "score": str(e.score) if e.score else None} for e in qs]}
+
+@register_tool
+class GetTrainingLeaderboard(_DelegatingTool):
+    name = "get_training_leaderboard"
+    description = "Top scorers or fastest completions for every training program in the hub."
+    module_id = "training"
+    required_permission = "training.view_rollup"
+    parameters = {
+        "type": "object",
+        "properties": {
+            "kind": {"type": "string", "enum": ["score", "speed"], "description": "score (default) or speed"},
+            "program_id": {"type": "string", "description": "Only this program"},
+        },
+        "required": [],
+        "additionalProperties": False,
+    }
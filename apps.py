@@ -9,4 +9,4 @@ class TrainingConfig(AppConfig):
     verbose_name = _('Training & Skills')
 
     def ready(self):
-        pass
+        from . import signals  # noqa: F401
@@ -0,0 +1,305 @@
+"""
+Training & Skills Module Async Views
+
+Native async variants of the dashboard and list views for ASGI deployments.
+Enable them with ``TRAINING_ASYNC_VIEWS = True``; ``urls.py`` then routes the
+same URL names here instead of to ``views.py``.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db.models import F, Func, IntegerField, Value
+from django.http import HttpResponse
+from django.shortcuts import render as django_render
+from django.utils.cache import cc_delim_re, patch_vary_headers
+
+from apps.accounts.decorators import login_required
+from apps.core.htmx import htmx_view
+from apps.modules_runtime.navigation import with_module_nav
+
+from .coalesce import coalesced
+from .conditional import conditional_on
+from .facets import EMPLOYEE_TRAINING_FACETS, SKILL_FACETS, TRAINING_PROGRAM_FACETS, filter_list
+from .hub_settings import request_settings
+from .models import TrainingProgram, Skill, EmployeeTraining
+from .pagination import CountingPaginator
+from .routers import replica_reads, routed_stream
+from .services.columnar import COLUMNAR_FORMATS, arrow_available, stream_columnar
+from .views import (
+    TRAINING_PROGRAM_SORT_FIELDS, SKILL_SORT_FIELDS, EMPLOYEE_TRAINING_SORT_FIELDS, EXPORT_FORMATS,
+    columnar_response, export_rows, filter_program_counters, list_per_page, search_filter,
+)
+
+
+# ======================================================================
+# Decorator adapter
+# ======================================================================
+
+class _Pass(HttpResponse):
+    """Stand-in response the checks return when they let a request through."""
+
+
+def _chain(decorators, view):
+    for decorator in reversed(decorators):
+        view = decorator(view)
+    return view
+
+
+def _carry_headers(source, response):
+    """Copy the headers the checks set on ``source`` (ETag, Vary...) to ``response``."""
+    for header, value in source.items():
+        if header.lower() == 'vary':
+            patch_vary_headers(response, cc_delim_re.split(value))
+        elif header.lower() != 'content-type' and not response.has_header(header):
+            response[header] = value
+    response.cookies.update(source.cookies)
+    return response
+
+
+def async_view(*checks, render=()):
+    """
+    Apply the synchronous ERPlora view decorators to a native async view.
+
+    ``checks`` (login, permissions, ``conditional_on``) run once in a worker
+    thread around a stand-in view; a request they turn away never reaches the
+    body, and the headers they add to the stand-in are carried over to the
+    final response. The body then runs on the event loop, so no thread is
+    held while it waits on queries. ``render`` (``with_module_nav``,
+    ``htmx_view``) runs last, once, in a worker thread over what the body
+    returned, exactly as it would around a sync view.
+    """
+    def wrap(func):
+        gate = sync_to_async(_chain(checks, lambda request, *args, **kwargs: _Pass()))
+
+        @functools.wraps(func)
+        async def view(request, *args, **kwargs):
+            passed = await gate(request, *args, **kwargs)
+            if not isinstance(passed, _Pass):
+                return passed
+            result = await func(request, *args, **kwargs)
+            finish = _chain(render, lambda request, *args, **kwargs: result)
+            response = await sync_to_async(finish)(request, *args, **kwargs)
+            return _carry_headers(passed, response)
+        return view
+    return wrap
+
+
+async def _apaginate(qs, per_page, page_number, hub_id, timeout=None):
+    """Resolve the count and fetch one page without blocking the event loop."""
+    if per_page <= 0:
+        per_page = max(await qs.acount(), 1)
+    paginator = CountingPaginator(qs, per_page, hub_id=hub_id, timeout=timeout)
+    await paginator.acount()
+    page_obj = paginator.get_page(page_number)
+    page_obj.object_list = [obj async for obj in page_obj.object_list]
+    return page_obj
+
+
+async def _list_params(request, default_sort):
+    # The settings may need a database read on a cold worker.
+    hub_settings = await sync_to_async(request_settings)(request)
+    return {
+        'settings': hub_settings,
+        'search_query': request.GET.get('q', '').strip(),
+        'sort_field': request.GET.get('sort', default_sort),
+        'sort_dir': request.GET.get('dir', 'asc'),
+        'page_number': request.GET.get('page', 1),
+        'current_view': request.GET.get('view', 'table'),
+        'per_page': list_per_page(request, hub_settings),
+    }
+
+
+async def _afilter(request, facet_set, qs, params, hub_id):
+    """Apply the list's facets; the grouped count query runs in a worker thread."""
+    with_counts = request.GET.get('export') not in EXPORT_FORMATS
+    return await sync_to_async(filter_list)(
+        facet_set, qs, request.GET, hub_id, with_counts=with_counts,
+        timeout=params['settings'].facet_cache_timeout,
+    )
+
+
+async def _astream(iterator):
+    """Pull a blocking byte iterator one chunk at a time from a worker thread."""
+    done = object()
+    while True:
+        chunk = await sync_to_async(next)(iterator, done)
+        if chunk is done:
+            return
+        yield chunk
+
+
+async def _alist_response(request, qs, params, hub_id, list_template, items_key, export, facet_context):
+    """Shared tail of the async list views: export, paginate, render."""
+    export_format = request.GET.get('export')
+    if export_format in ('csv', 'excel'):
+        # Loaded on first export: pulls in the spreadsheet writers.
+        from apps.core.services import export_to_csv, export_to_excel
+        fields, headers, basename = export
+        qs = export_rows(qs, params['settings'])
+        if export_format == 'csv':
+            return await sync_to_async(export_to_csv)(qs, fields=fields, headers=headers, filename=f'{basename}.csv')
+        return await sync_to_async(export_to_excel)(qs, fields=fields, headers=headers, filename=f'{basename}.xlsx')
+    if export_format in COLUMNAR_FORMATS:
+        _, _, basename = export
+        qs = export_rows(qs, params['settings'])
+        stream = routed_stream(stream_columnar(qs.model._meta.model_name, qs, export_format))
+        return columnar_response(_astream(stream), export_format, basename)
+
+    page_obj = await _apaginate(
+        qs, params['per_page'], params['page_number'], hub_id, timeout=params['settings'].count_cache_timeout,
+    )
+    context = {
+        items_key: page_obj, 'page_obj': page_obj,
+        'search_query': params['search_query'], 'sort_field': params['sort_field'],
+        'sort_dir': params['sort_dir'], 'current_view': params['current_view'],
+        'per_page': params['per_page'], 'columnar_available': arrow_available(), **facet_context,
+    }
+    if request.htmx and request.htmx.target == 'datatable-body':
+        return await sync_to_async(django_render)(request, list_template, context)
+    return context
+
+
+# ======================================================================
+# Dashboard
+# ======================================================================
+
+def _live_count(model, hub_id, key):
+    return model.objects.filter(hub_id=hub_id, is_deleted=False).order_by().values_list(
+        Value(key), Func(F('pk'), function='COUNT', output_field=IntegerField()),
+    )
+
+
+async def dashboard_counts(hub_id):
+    # The async ORM runs one request's queries one after another on a single
+    # thread, so the three counts go out as one UNION ALL round trip.
+    qs = _live_count(TrainingProgram, hub_id, 'total_training_programs').union(
+        _live_count(Skill, hub_id, 'total_skills'),
+        _live_count(EmployeeTraining, hub_id, 'total_employee_trainings'),
+        all=True,
+    )
+    return {key: count async for key, count in qs}
+
+
+@async_view(
+    login_required,
+    conditional_on('trainingprogram', 'skill', 'employeetraining'),
+    render=(
+        with_module_nav('training', 'dashboard'),
+        htmx_view('training/pages/index.html', 'training/partials/dashboard_content.html'),
+    ),
+)
+@replica_reads('trainingprogram', 'skill', 'employeetraining')
+async def dashboard(request):
+    hub_id = request.session.get('hub_id')
+    return await dashboard_counts(hub_id)
+
+
+# ======================================================================
+# Lists
+# ======================================================================
+
+@async_view(
+    login_required,
+    conditional_on('trainingprogram', 'trainingsettings'),
+    render=(
+        with_module_nav('training', 'programs'),
+        htmx_view('training/pages/training_programs.html', 'training/partials/training_programs_content.html'),
+    ),
+)
+@replica_reads('trainingprogram', 'trainingsettings')
+@coalesced('trainingprogram', 'trainingsettings')
+async def training_programs_list(request):
+    hub_id = request.session.get('hub_id')
+    params = await _list_params(request, 'name')
+
+    qs = TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False)
+    if params['search_query']:
+        q = params['search_query']
+        qs = qs.filter(search_filter(q, ['name', 'description'], params['settings']))
+    qs = filter_program_counters(qs, request.GET)
+
+    qs, facet_context = await _afilter(request, TRAINING_PROGRAM_FACETS, qs, params, hub_id)
+
+    order_by = TRAINING_PROGRAM_SORT_FIELDS.get(params['sort_field'], 'name')
+    if params['sort_dir'] == 'desc':
+        order_by = f'-{order_by}'
+    qs = qs.order_by(order_by)
+
+    return await _alist_response(
+        request, qs, params, hub_id, 'training/partials/training_programs_list.html', 'training_programs',
+        (['name', 'is_mandatory', 'is_active', 'duration_hours', 'description', 'enrollment_count', 'completed_count'],
+         ['Name', 'Is Mandatory', 'Is Active', 'Duration Hours', 'Description', 'Enrollments', 'Completed'],
+         'training_programs'),
+        facet_context,
+    )
+
+
+@async_view(
+    login_required,
+    conditional_on('skill', 'trainingsettings'),
+    render=(
+        with_module_nav('training', 'skills'),
+        htmx_view('training/pages/skills.html', 'training/partials/skills_content.html'),
+    ),
+)
+@replica_reads('skill', 'trainingsettings')
+@coalesced('skill', 'trainingsettings')
+async def skills_list(request):
+    hub_id = request.session.get('hub_id')
+    params = await _list_params(request, 'name')
+
+    qs = Skill.objects.filter(hub_id=hub_id, is_deleted=False)
+    if params['search_query']:
+        q = params['search_query']
+        qs = qs.filter(search_filter(q, ['name', 'category'], params['settings']))
+
+    qs, facet_context = await _afilter(request, SKILL_FACETS, qs, params, hub_id)
+
+    order_by = SKILL_SORT_FIELDS.get(params['sort_field'], 'name')
+    if params['sort_dir'] == 'desc':
+        order_by = f'-{order_by}'
+    qs = qs.order_by(order_by)
+
+    return await _alist_response(
+        request, qs, params, hub_id, 'training/partials/skills_list.html', 'skills',
+        (['name', 'is_active', 'category'], ['Name', 'Is Active', 'Category'], 'skills'),
+        facet_context,
+    )
+
+
+@async_view(
+    login_required,
+    conditional_on('employeetraining', 'trainingprogram', 'trainingsettings'),
+    render=(
+        with_module_nav('training', 'programs'),
+        htmx_view('training/pages/employee_trainings.html', 'training/partials/employee_trainings_content.html'),
+    ),
+)
+@replica_reads('employeetraining', 'trainingprogram', 'trainingsettings')
+@coalesced('employeetraining', 'trainingprogram', 'trainingsettings')
+async def employee_trainings_list(request):
+    hub_id = request.session.get('hub_id')
+    params = await _list_params(request, 'program')
+
+    qs = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False)
+    if params['search_query']:
+        q = params['search_query']
+        qs = qs.filter(search_filter(q, ['employee_name', 'program_name', 'status'], params['settings']))
+    program_name = request.GET.get('program_name', '').strip()
+    if program_name:
+        qs = qs.filter(program_name=program_name)
+
+    qs, facet_context = await _afilter(request, EMPLOYEE_TRAINING_FACETS, qs, params, hub_id)
+
+    order_by = EMPLOYEE_TRAINING_SORT_FIELDS.get(params['sort_field'], 'program_name')
+    if params['sort_dir'] == 'desc':
+        order_by = f'-{order_by}'
+    qs = qs.order_by(order_by)
+
+    return await _alist_response(
+        request, qs, params, hub_id, 'training/partials/employee_trainings_list.html', 'employee_trainings',
+        (['program_name', 'status', 'score', 'employee_id', 'employee_name', 'start_date'],
+         ['TrainingProgram', 'Status', 'Score', 'Employee Id', 'Employee Name', 'Start Date'],
+         'employee_trainings'),
+        facet_context,
+    )
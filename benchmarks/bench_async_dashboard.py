@@ -0,0 +1,132 @@
+"""
+Benchmark: dashboard throughput under concurrent requests, sync vs. async view.
+
+Seeds one hub, then sends ``--requests`` dashboard requests with
+``--concurrency`` in flight at a time through the full request stack: the
+sync view from a pool of ``--concurrency`` threads (a threaded WSGI worker)
+and the async view from one event loop (an ASGI worker). Prints requests
+per second and median and 95th percentile latency for each:
+
+    DJANGO_SETTINGS_MODULE=config.settings python -m training.benchmarks.bench_async_dashboard \\
+        [--requests 2000] [--concurrency 50] [--rows 100000]
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.test import AsyncClient, Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import include, path  # noqa: E402
+
+from apps.accounts.models import LocalUser  # noqa: E402
+from training import async_views, views  # noqa: E402
+from training.models import EmployeeTraining, Skill, TrainingProgram  # noqa: E402
+
+BATCH = 5000
+URLS = types.ModuleType('bench_async_dashboard_urls')
+URLS.urlpatterns = [
+    path('__bench__/sync/', views.dashboard),
+    path('__bench__/async/', async_views.dashboard),
+    path('', include(settings.ROOT_URLCONF)),
+]
+
+
+def _seed(rows):
+    hub_id = uuid.uuid4()
+    programs = [TrainingProgram.objects.create(hub_id=hub_id, name=f'Program {i}') for i in range(20)]
+    Skill.objects.bulk_create(Skill(hub_id=hub_id, name=f'Skill {i}') for i in range(50))
+    for offset in range(0, rows, BATCH):
+        EmployeeTraining.objects.bulk_create(
+            EmployeeTraining(
+                hub_id=hub_id, employee_id=uuid.uuid4(), employee_name=f'Employee {i}',
+                program=programs[i % len(programs)], program_name=programs[i % len(programs)].name,
+            )
+            for i in range(offset, min(offset + BATCH, rows))
+        )
+    user = LocalUser.objects.create(
+        hub_id=hub_id, name='Bench', email='bench@example.com', role='admin',
+        pin_hash=make_password('1234'), is_active=True,
+    )
+    return hub_id, user
+
+
+def _login(client, hub_id, user):
+    session = client.session
+    session['local_user_id'] = str(user.id)
+    session['user_name'] = user.name
+    session['user_role'] = user.role
+    session['hub_id'] = str(hub_id)
+    session['store_config_checked'] = True
+    session.save()
+    return session.session_key
+
+
+def _report(label, wall, timings):
+    timings.sort()
+    print(f'{label:<6} {len(timings) / wall:8.1f} req/s  '
+          f'p50 {statistics.median(timings) * 1000:7.2f} ms  '
+          f'p95 {timings[int(len(timings) * 0.95) - 1] * 1000:7.2f} ms')
+
+
+def _run_sync(cookie, requests, concurrency):
+    local = threading.local()
+
+    def one(_):
+        if not hasattr(local, 'client'):
+            local.client = Client()
+            local.client.cookies[settings.SESSION_COOKIE_NAME] = cookie
+        started = time.perf_counter()
+        response = local.client.get('/__bench__/sync/')
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = list(pool.map(one, range(requests)))
+    return time.perf_counter() - started, timings
+
+
+async def _run_async(cookie, requests, concurrency):
+    client = AsyncClient()
+    client.cookies[settings.SESSION_COOKIE_NAME] = cookie
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            started = time.perf_counter()
+            response = await client.get('/__bench__/async/')
+            assert response.status_code == 200, response.status_code
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started, list(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    hub_id, user = _seed(args.rows)
+    cookie = _login(Client(), hub_id, user)
+    with override_settings(ROOT_URLCONF=URLS):
+        _report('sync', *_run_sync(cookie, args.requests, args.concurrency))
+        _report('async', *asyncio.run(_run_async(cookie, args.requests, args.concurrency)))
+
+
+if __name__ == '__main__':
+    main()
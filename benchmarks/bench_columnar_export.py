@@ -0,0 +1,102 @@
+"""
+Benchmark: enrollment export size and load time, CSV vs. Parquet and Arrow.
+
+Builds synthetic enrollment rows in memory (no database needed), writes them
+as CSV and through ``training.services.columnar``, then times loading each
+file back into typed columns. Needs pyarrow:
+
+    DJANGO_SETTINGS_MODULE=config.settings python -m training.benchmarks.bench_columnar_export [--rows 1000000]
+"""
+import argparse
+import csv
+import datetime
+import io
+import random
+import time
+import uuid
+from decimal import Decimal
+
+import django
+
+django.setup()
+
+import pyarrow.csv as pa_csv  # noqa: E402
+import pyarrow.ipc as ipc  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from training.services.columnar import (  # noqa: E402
+    COLUMNAR_TABLES, columnar_schema, columnar_writer, get_batch_size, record_batch,
+)
+
+TABLE = 'employeetraining'
+STATUSES = ['enrolled', 'in_progress', 'completed', 'failed']
+REPEAT = 3
+
+
+def _rows(count):
+    hub_id = uuid.uuid4()
+    programs = [(uuid.uuid4(), f'Program {i}') for i in range(200)]
+    employees = [(uuid.uuid4(), f'Employee {i}') for i in range(count // 10 + 1)]
+    now = timezone.now()
+    rnd = random.Random(0)
+    for _ in range(count):
+        program_id, program_name = rnd.choice(programs)
+        employee_id, employee_name = rnd.choice(employees)
+        status = rnd.choice(STATUSES)
+        start = datetime.date(2024, 1, 1) + datetime.timedelta(days=rnd.randrange(700))
+        yield (
+            uuid.uuid4(), hub_id, employee_id, employee_name, program_id, program_name, status,
+            start, start + datetime.timedelta(days=30) if status == 'completed' else None,
+            Decimal(rnd.randrange(10000)) / 100 if status == 'completed' else None, now, now,
+        )
+
+
+def _csv(rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(COLUMNAR_TABLES[TABLE][1])
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+def _columnar(rows, fmt):
+    schema = columnar_schema(TABLE)
+    sink = io.BytesIO()
+    writer = columnar_writer(fmt, sink, schema)
+    for start in range(0, len(rows), get_batch_size()):
+        writer.write_batch(record_batch(schema, rows[start:start + get_batch_size()]))
+    writer.close()
+    return sink.getvalue()
+
+
+def _best(load):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    rows = list(_rows(args.rows))
+    files = {'csv': _csv(rows), 'parquet': _columnar(rows, 'parquet'), 'arrow': _columnar(rows, 'arrow')}
+    loaders = {
+        'csv': lambda: pa_csv.read_csv(io.BytesIO(files['csv'])),
+        'parquet': lambda: pq.read_table(io.BytesIO(files['parquet'])),
+        'arrow': lambda: ipc.open_stream(files['arrow']).read_all(),
+    }
+    base_size, base_time = len(files['csv']), _best(loaders['csv'])
+    for fmt, data in files.items():
+        seconds = base_time if fmt == 'csv' else _best(loaders[fmt])
+        print(f'{fmt:<8} {len(data) / 2 ** 20:8.1f} MiB ({base_size / len(data):4.1f}x smaller)  '
+              f'load {seconds * 1000:8.1f} ms ({base_time / seconds:4.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
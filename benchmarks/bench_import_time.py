@@ -0,0 +1,78 @@
+"""
+Benchmark: cold import time of the Training entry points.
+
+Each module is imported in a fresh interpreter after ``django.setup()``, so
+the figure is what a worker pays the first time it resolves the URLconf or
+registers the assistant tools. Run inside a configured hub environment:
+
+    DJANGO_SETTINGS_MODULE=config.settings python -m training.benchmarks.bench_import_time [--budget-ms 150]
+
+The exit status is 1 if a module exceeds the budget or pulls in one of
+``LAZY_MODULES``, which must only load on first use.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+MODULES = ('training.views', 'training.ai_tools', 'training.urls')
+
+# Loaded on first export / first tool call, never at import.
+LAZY_MODULES = ('openpyxl', 'xlsxwriter', 'apps.core.services', 'training.tool_handlers')
+
+REPEAT = 5
+
+_PROBE = '''
+import importlib, json, sys, time
+import django
+django.setup()
+before = set(sys.modules)
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "new_modules": sorted(set(sys.modules) - before)}))
+'''
+
+
+def measure(module):
+    """Import ``module`` in a fresh interpreter; return its time and new modules."""
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(path for path in sys.path if path)}
+    result = subprocess.run(
+        [sys.executable, '-c', _PROBE, module],
+        capture_output=True, text=True, check=True, env=env,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def eager_lazy_modules(new_modules):
+    """The ``LAZY_MODULES`` (or their submodules) found in ``new_modules``."""
+    return sorted(
+        name for name in new_modules
+        if any(name == lazy or name.startswith(f'{lazy}.') for lazy in LAZY_MODULES)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget-ms', type=float, default=None, help='Fail if a median import exceeds this.')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in MODULES:
+        runs = [measure(module) for _ in range(args.repeat)]
+        median = sorted(run['ms'] for run in runs)[len(runs) // 2]
+        eager = eager_lazy_modules(runs[0]['new_modules'])
+        print(f'{module:20s} median {median:7.1f}ms  {len(runs[0]["new_modules"]):4d} new modules')
+        if eager:
+            print(f'  eagerly imported: {", ".join(eager)}')
+            failed = True
+        if args.budget_ms is not None and median > args.budget_ms:
+            print(f'  over budget ({args.budget_ms:.0f}ms)')
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
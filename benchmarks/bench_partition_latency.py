@@ -0,0 +1,102 @@
+"""
+Benchmark: small-hub list latency before and after hub partitioning.
+
+Seeds one giant hub and many small ones into ``training_employeetraining``,
+times the enrollment list query (first page plus count) for the small hubs,
+converts the table with ``training.partitioning`` and times it again. Needs
+PostgreSQL 11+ and a scratch database, since the table is converted for good:
+
+    DJANGO_SETTINGS_MODULE=config.settings python -m training.benchmarks.bench_partition_latency \\
+        [--giant-rows 500000] [--small-hubs 200] [--small-rows 50] [--partitions 16]
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+
+import django
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from training.models import EmployeeTraining, TrainingProgram  # noqa: E402
+from training.partitioning import is_partitioned, partition_enrollments, supports_partitioning  # noqa: E402
+
+BATCH = 5000
+REPEAT = 5
+
+
+def _seed_hub(hub_id, rows):
+    program = TrainingProgram.objects.create(hub_id=hub_id, name='Forklift Basics')
+    for offset in range(0, rows, BATCH):
+        EmployeeTraining.objects.bulk_create(
+            EmployeeTraining(
+                hub_id=hub_id, employee_id=uuid.uuid4(), employee_name=f'Employee {i}',
+                program=program, program_name=program.name, status='completed',
+            )
+            for i in range(offset, min(offset + BATCH, rows))
+        )
+
+
+def _list_query(hub_id):
+    qs = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False).order_by('program_name')
+    list(qs[:12])
+    return qs.count()
+
+
+def _time_hubs(hub_ids):
+    """Median milliseconds of the list query over the small hubs, best of ``REPEAT``."""
+    runs = []
+    for _ in range(REPEAT):
+        timings = []
+        for hub_id in hub_ids:
+            start = time.perf_counter()
+            _list_query(hub_id)
+            timings.append((time.perf_counter() - start) * 1000)
+        runs.append(statistics.median(timings))
+    return min(runs)
+
+
+def _plan(hub_id):
+    qs = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False).order_by('program_name')[:12]
+    return qs.explain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--giant-rows', type=int, default=500_000)
+    parser.add_argument('--small-hubs', type=int, default=200)
+    parser.add_argument('--small-rows', type=int, default=50)
+    parser.add_argument('--partitions', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    if not supports_partitioning(connection):
+        print(f'{connection.vendor}: partitioning needs PostgreSQL 11+, nothing to measure.')
+        return 1
+    if is_partitioned(connection):
+        print('training_employeetraining is already partitioned; use a fresh database.')
+        return 1
+
+    _seed_hub(uuid.uuid4(), args.giant_rows)
+    small = [uuid.uuid4() for _ in range(args.small_hubs)]
+    for hub_id in small:
+        _seed_hub(hub_id, args.small_rows)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE training_employeetraining')
+
+    before = _time_hubs(small)
+    partition_enrollments(connection, args.partitions)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE training_employeetraining')
+    after = _time_hubs(small)
+
+    print(f'small-hub list query  single table {before:7.3f} ms  '
+          f'{args.partitions} partitions {after:7.3f} ms  {before / after:4.1f}x')
+    print(_plan(small[0]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
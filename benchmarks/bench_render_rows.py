@@ -0,0 +1,61 @@
+"""
+Benchmark: compiled datatable rows vs. the per-row template loop.
+
+Run inside a configured hub environment:
+
+    DJANGO_SETTINGS_MODULE=config.settings python -m training.benchmarks.bench_render_rows
+"""
+import datetime
+import timeit
+import uuid
+from decimal import Decimal
+
+import django
+
+django.setup()
+
+from django.template import Context, engines  # noqa: E402
+
+from training.models import TrainingProgram, Skill, EmployeeTraining  # noqa: E402
+from training.rows import ROW_TEMPLATE  # noqa: E402
+
+ROWS = 96
+NUMBER = 20
+REPEAT = 5
+
+
+def _items(name):
+    hub_id = uuid.uuid4()
+    if name == 'training_program':
+        return [TrainingProgram(hub_id=hub_id, name=f'Program {i}', description='Description',
+                                duration_hours=i, is_mandatory=i % 2 == 0, is_active=i % 3 == 0)
+                for i in range(ROWS)]
+    if name == 'skill':
+        return [Skill(hub_id=hub_id, name=f'Skill {i}', category='Safety', is_active=i % 2 == 0)
+                for i in range(ROWS)]
+    program = TrainingProgram(hub_id=hub_id, name='Forklift Basics')
+    return [EmployeeTraining(hub_id=hub_id, employee_id=uuid.uuid4(), employee_name=f'Employee {i}',
+                             program=program, status='enrolled', score=Decimal('85.50'),
+                             start_date=datetime.date(2025, 1, 1 + i % 28))
+            for i in range(ROWS)]
+
+
+def _best(template, context):
+    return min(timeit.repeat(lambda: template.render(Context(context)), number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+def main():
+    engine = engines['django'].engine
+    for name in ('employee_training', 'training_program', 'skill'):
+        context = {'items': _items(name)}
+        loop = engine.from_string(
+            '{% for item in items %}{% include "' + ROW_TEMPLATE.format(name) + '" %}{% endfor %}'
+        )
+        compiled = engine.from_string(f'{{% load training_rows %}}{{% training_rows "{name}" items %}}')
+        assert loop.render(Context(context)) == compiled.render(Context(context))
+        before, after = _best(loop, context), _best(compiled, context)
+        print(f'{name:<20} loop {before * 1000:7.2f} ms  compiled {after * 1000:7.2f} ms  {before / after:4.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Versioned cache helpers for the Training module.
+
+Each (hub, table) pair owns a version counter in the shared cache. Cached
+values embed that version in their key, so bumping the counter on a write
+invalidates every derived entry for the table at once.
+
+The counters must live in a cache shared by every worker (Redis, Memcached);
+with a per-process cache a write in one worker is invisible to the others.
+
+A write inside a transaction bumps the counter twice: at once, so the
+writer's own later reads miss the cache, and again on commit, so a value
+another worker cached from pre-commit data under the first bump is never
+served once the write is visible.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+def _version_key(hub_id, table):
+    return f'training:version:{hub_id}:{table}'
+
+
+def _modified_key(hub_id, table):
+    return f'training:modified:{hub_id}:{table}'
+
+
+def get_version(hub_id, table):
+    """Return the current write version for a hub's table."""
+    key = _version_key(hub_id, table)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses old keys.
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def _bump(hub_id, table):
+    key = _version_key(hub_id, table)
+    cache.set(_modified_key(hub_id, table), time.time(), None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(key, version, None)
+        return version
+
+
+def bump_version(hub_id, table, using=DEFAULT_DB_ALIAS):
+    """Invalidate every cached value derived from a hub's table."""
+    version = _bump(hub_id, table)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: _bump(hub_id, table), using=using)
+    return version
+
+
+def get_last_modified(hub_id, table):
+    """Return when a hub's table was last written through this module, if known."""
+    timestamp = cache.get(_modified_key(hub_id, table))
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _versioned_key(hub_id, table, version, kind, parts):
+    digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    return f'training:{kind}:{hub_id}:{table}:{version}:{digest}'
+
+
+def make_key(hub_id, table, kind, *parts):
+    """Build a cache key bound to the current version of a hub's table."""
+    return _versioned_key(hub_id, table, get_version(hub_id, table), kind, parts)
+
+
+def make_keys(hub_id, table, kind, parts_list):
+    """``make_key`` for many sets of parts, reading the table version once."""
+    version = get_version(hub_id, table)
+    return [_versioned_key(hub_id, table, version, kind, tuple(parts)) for parts in parts_list]
@@ -0,0 +1,228 @@
+"""
+Request coalescing for the Training read views.
+
+When many users of a hub open the same list or type the same search at
+once, ``coalesced`` lets the first request (the leader) run the view body
+while identical concurrent requests in the same process wait for it and
+reuse its result. The result is then kept for ``TRAINING_COALESCE_TTL``
+seconds (default 1; 0 turns the micro-cache off) to absorb the tail of a
+burst.
+
+Requests are identical when they share the hub, path, query string, HTMX
+target and language, and the write versions of the view's tables (see
+``training.cache``). A write therefore starts a new key at once, in every
+process, and a user always sees their own changes.
+
+The decorator sits directly on the view body, inside ``htmx_view`` and
+``with_module_nav``, so only the user-independent part is shared: the page
+of rows, counts and facets, or the rendered ``datatable-body`` partial.
+Navigation and the full page are still rendered per request. Exports and
+non-GET requests are never coalesced.
+"""
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.paginator import Page
+from django.http import HttpResponse, HttpResponseBase
+
+from .cache import get_version, make_key
+
+DEFAULT_COALESCE_TTL = 1.0
+DEFAULT_COALESCE_MAX_ENTRIES = 256
+
+_MISS = object()
+
+
+def get_coalesce_ttl():
+    return getattr(settings, 'TRAINING_COALESCE_TTL', DEFAULT_COALESCE_TTL)
+
+
+def get_coalesce_max_entries():
+    return getattr(settings, 'TRAINING_COALESCE_MAX_ENTRIES', DEFAULT_COALESCE_MAX_ENTRIES)
+
+
+class _Flight:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Share one in-flight call per key between threads or tasks, and keep its
+    result for a short while.
+
+    Threads wait on an event; tasks of one event loop await a shared future.
+    A leader's exception is raised in every waiter and is never cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._futures = {}
+        self._recent = OrderedDict()
+
+    def _cached(self, key):
+        entry = self._recent.get(key)
+        if entry is None:
+            return _MISS
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._recent[key]
+            return _MISS
+        return value
+
+    def _remember(self, key, value, ttl):
+        if ttl <= 0:
+            return
+        self._recent[key] = (time.monotonic() + ttl, value)
+        self._recent.move_to_end(key)
+        while len(self._recent) > get_coalesce_max_entries():
+            self._recent.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+
+    def do(self, key, fn, ttl=0):
+        """Return ``fn()``, or the result of an identical call already running."""
+        with self._lock:
+            value = self._cached(key)
+            if value is not _MISS:
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None:
+                    self._remember(key, flight.value, ttl)
+            flight.done.set()
+        return flight.value
+
+    async def ado(self, key, fn, ttl=0):
+        """Async ``do``: await ``fn()``, sharing it with tasks of the same loop."""
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            value = self._cached(key)
+            if value is not _MISS:
+                return value
+            future = self._futures.get(loop_key)
+            leader = future is None
+            if leader:
+                future = self._futures[loop_key] = loop.create_future()
+        if not leader:
+            return await asyncio.shield(future)
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved here, so an unawaited future does not log it
+            raise
+        else:
+            future.set_result(value)
+            with self._lock:
+                self._remember(key, value, ttl)
+            return value
+        finally:
+            with self._lock:
+                del self._futures[loop_key]
+
+
+flights = SingleFlight()
+
+
+def _flight_key(request, tables):
+    hub_id = request.session.get('hub_id')
+    htmx = getattr(request, 'htmx', None)
+    return make_key(
+        hub_id, tables[0], 'flight',
+        [get_version(hub_id, table) for table in tables[1:]],
+        request.path,
+        sorted(request.GET.lists()),
+        bool(htmx), htmx.target if htmx else None,
+        getattr(request, 'LANGUAGE_CODE', None),
+    )
+
+
+def _freeze(result):
+    """Make a view result safe to hand to several requests."""
+    if isinstance(result, HttpResponseBase):
+        return ('response', result.status_code, result.content, list(result.headers.items()))
+    if isinstance(result, dict):
+        for value in result.values():
+            if isinstance(value, Page):
+                # Resolve the count and the rows before the page is shared.
+                value.paginator.count
+                value.object_list = list(value.object_list)
+        return ('context', result)
+    return result
+
+
+def _thaw(frozen):
+    """A private copy of a shared result for one request."""
+    if isinstance(frozen, tuple) and frozen and frozen[0] == 'response':
+        _, status, content, headers = frozen
+        response = HttpResponse(content, status=status)
+        for header, value in headers:
+            response.headers[header] = value
+        return response
+    if isinstance(frozen, tuple) and frozen and frozen[0] == 'context':
+        return dict(frozen[1])
+    return frozen
+
+
+def _coalescable(request):
+    # Exports stream or build files; they are rare and never worth sharing.
+    return request.method == 'GET' and not request.GET.get('export')
+
+
+def coalesced(*tables):
+    """Coalesce identical concurrent GETs of a view that reads ``tables``."""
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                if not _coalescable(request):
+                    return await view(request, *args, **kwargs)
+
+                async def run():
+                    return _freeze(await view(request, *args, **kwargs))
+                return _thaw(await flights.ado(_flight_key(request, tables), run, get_coalesce_ttl()))
+        else:
+            @functools.wraps(view)
+            def wrapper(request, *args, **kwargs):
+                if not _coalescable(request):
+                    return view(request, *args, **kwargs)
+                frozen = flights.do(
+                    _flight_key(request, tables),
+                    lambda: _freeze(view(request, *args, **kwargs)),
+                    get_coalesce_ttl(),
+                )
+                return _thaw(frozen)
+        return wrapper
+    return decorator
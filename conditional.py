@@ -0,0 +1,74 @@
+"""
+Conditional GET support for the Training read views.
+
+Validators come from the per-(hub, table) write versions in ``training.cache``
+rather than from the database, so a matching ``If-None-Match`` (or
+``If-Modified-Since``) is answered with 304 before the page query runs or a
+template is rendered.
+"""
+import functools
+import hashlib
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from .cache import get_last_modified, get_version
+
+VARY_HEADERS = ('HX-Request', 'HX-Target', 'Cookie')
+
+
+def _etag(request, tables):
+    # Computed once per request, before the page query runs, so the tag
+    # describes the data as of *before* the query.
+    if not hasattr(request, '_training_etag'):
+        hub_id = request.session.get('hub_id')
+        parts = (
+            [get_version(hub_id, table) for table in tables],
+            request.path,
+            sorted(request.GET.lists()),
+            request.headers.get('HX-Request'),
+            request.headers.get('HX-Target'),
+            request.session.get('local_user_id'),
+            getattr(request, 'LANGUAGE_CODE', None),
+        )
+        request._training_etag = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    return request._training_etag
+
+
+def _last_modified(request, tables):
+    hub_id = request.session.get('hub_id')
+    stamps = [get_last_modified(hub_id, table) for table in tables]
+    if None in stamps:
+        return None
+    return max(stamps)
+
+
+def conditional_on(*tables):
+    """
+    Answer conditional GETs for a view whose output depends on ``tables``.
+
+    Responses are marked ``private, no-cache`` so browsers always revalidate
+    instead of reusing a heuristic-fresh copy.
+    """
+    def decorator(view):
+        view = condition(
+            etag_func=lambda request, *args, **kwargs: _etag(request, tables),
+            last_modified_func=lambda request, *args, **kwargs: _last_modified(request, tables),
+        )(view)
+
+        def finalize(response):
+            patch_vary_headers(response, VARY_HEADERS)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                return finalize(await view(request, *args, **kwargs))
+        else:
+            @functools.wraps(view)
+            def wrapper(request, *args, **kwargs):
+                return finalize(view(request, *args, **kwargs))
+        return wrapper
+    return decorator
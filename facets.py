@@ -0,0 +1,228 @@
+"""
+Faceted filters for the Training list views.
+
+A ``FacetSet`` declares which columns of a list can be filtered by value
+(status, program, flags, category) and which date column takes a range.
+Selected values arrive as repeated query parameters (``?status=enrolled&
+status=completed``), so they travel with the sort, page and search inputs
+through ``hx-include`` like every other datatable control.
+
+All facet counts come from one grouped aggregate over the list's base
+queryset (search and date range applied, facet selections not)::
+
+    SELECT status, program_id, program_name, is_mandatory, COUNT(*)
+    ... GROUP BY status, program_id, program_name, is_mandatory
+
+Each facet's counts are then summed in Python over the groups that match
+the *other* facets' selections, so choosing a status narrows the program
+counts but still shows how many rows every other status has. The grouped
+rows are cached per (hub, filter) against the write versions of the list's
+table and of any joined table (see ``training.cache``).
+"""
+import datetime
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count
+from django.utils.translation import gettext_lazy as _
+
+from .cache import get_version, make_key
+
+DEFAULT_FACET_TIMEOUT = 300
+
+
+def get_facet_timeout():
+    return getattr(settings, 'TRAINING_FACET_CACHE_TIMEOUT', DEFAULT_FACET_TIMEOUT)
+
+
+def _key(value):
+    """Query-string form of a grouped value."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return str(value)
+
+
+def _coerce_str(value):
+    return value
+
+
+def _coerce_bool(value):
+    return {'1': True, '0': False}[value]
+
+
+def _coerce_uuid(value):
+    return uuid.UUID(value)
+
+
+class Facet:
+    """Filter a list by the values of one column and count rows per value."""
+
+    coerce = staticmethod(_coerce_str)
+
+    def __init__(self, param, field, label, label_field=None, labels=None):
+        self.param = param
+        self.field = field
+        self.label = label
+        self.label_field = label_field
+        self.labels = labels or {}
+
+    def parse(self, values):
+        """Keep the well-formed query values, as their ``_key`` strings."""
+        selected = []
+        for value in values:
+            try:
+                value = _key(self.coerce(value))
+            except (KeyError, ValueError):
+                continue
+            if value not in selected:
+                selected.append(value)
+        return selected
+
+    def lookup(self, selected):
+        return {f'{self.field}__in': [self.coerce(value) for value in selected]}
+
+    def option_label(self, value, row_label):
+        return self.labels.get(value) or row_label or value
+
+
+class BooleanFacet(Facet):
+    coerce = staticmethod(_coerce_bool)
+
+    def __init__(self, param, field, label):
+        super().__init__(param, field, label, labels={'1': _('Yes'), '0': _('No')})
+
+
+class UUIDFacet(Facet):
+    coerce = staticmethod(_coerce_uuid)
+
+
+class FacetSet:
+    """The facets of one list view plus an optional date range column."""
+
+    def __init__(self, *facets, date_field=None, depends=()):
+        self.facets = facets
+        self.date_field = date_field
+        self.depends = depends
+
+    def parse(self, params):
+        """Read facet selections and the date range from ``request.GET``."""
+        selected = {facet.param: facet.parse(params.getlist(facet.param)) for facet in self.facets}
+        date_range = {}
+        for bound in ('date_from', 'date_to'):
+            try:
+                date_range[bound] = datetime.date.fromisoformat(params.get(bound, '').strip())
+            except ValueError:
+                date_range[bound] = None
+        return selected, date_range
+
+    def apply_range(self, qs, date_range):
+        if self.date_field and date_range.get('date_from'):
+            qs = qs.filter(**{f'{self.date_field}__gte': date_range['date_from']})
+        if self.date_field and date_range.get('date_to'):
+            qs = qs.filter(**{f'{self.date_field}__lte': date_range['date_to']})
+        return qs
+
+    def apply(self, qs, selected):
+        for facet in self.facets:
+            if selected.get(facet.param):
+                qs = qs.filter(**facet.lookup(selected[facet.param]))
+        return qs
+
+    def _fields(self):
+        fields = []
+        for facet in self.facets:
+            fields.append(facet.field)
+            if facet.label_field:
+                fields.append(facet.label_field)
+        return fields
+
+    def grouped(self, qs, hub_id=None, timeout=None):
+        """One row per distinct combination of facet values, with its count."""
+        qs = qs.order_by().values(*self._fields()).annotate(facet_count=Count('pk'))
+        try:
+            sql, params = qs.query.sql_with_params()
+        except EmptyResultSet:
+            return []
+        versions = [get_version(hub_id, table) for table in self.depends]
+        key = make_key(hub_id, qs.model._meta.model_name, 'facets', sql, params, versions)
+        rows = cache.get(key)
+        if rows is None:
+            rows = list(qs)
+            cache.set(key, rows, get_facet_timeout() if timeout is None else timeout)
+        return rows
+
+    def counts(self, qs, selected, hub_id=None, timeout=None):
+        """
+        Facet options with counts for the template.
+
+        ``qs`` is the list queryset before ``apply``; each facet counts the
+        rows that match every selection except its own.
+        """
+        rows = self.grouped(qs, hub_id, timeout)
+        keyed = [
+            ({facet.param: _key(row[facet.field]) for facet in self.facets}, row)
+            for row in rows
+        ]
+        result = []
+        for facet in self.facets:
+            others = [f for f in self.facets if f is not facet and selected.get(f.param)]
+            totals, labels = {}, {}
+            for values, row in keyed:
+                if all(values[f.param] in selected[f.param] for f in others):
+                    value = values[facet.param]
+                    totals[value] = totals.get(value, 0) + row['facet_count']
+                    if facet.label_field:
+                        labels[value] = row[facet.label_field]
+            chosen = selected.get(facet.param, [])
+            for value in chosen:
+                totals.setdefault(value, 0)
+            options = [
+                {
+                    'value': value, 'label': facet.option_label(value, labels.get(value)),
+                    'count': count, 'selected': value in chosen,
+                }
+                for value, count in totals.items()
+            ]
+            options.sort(key=lambda option: str(option['label']).lower())
+            result.append({'param': facet.param, 'label': facet.label, 'options': options})
+        return result
+
+
+EMPLOYEE_TRAINING_FACETS = FacetSet(
+    Facet('status', 'status', _('Status')),
+    UUIDFacet('program', 'program_id', _('Program'), label_field='program_name'),
+    BooleanFacet('mandatory', 'program__is_mandatory', _('Mandatory')),
+    date_field='start_date',
+    depends=('trainingprogram',),
+)
+
+TRAINING_PROGRAM_FACETS = FacetSet(
+    BooleanFacet('mandatory', 'is_mandatory', _('Mandatory')),
+    BooleanFacet('active', 'is_active', _('Active')),
+    date_field='created_at__date',
+)
+
+SKILL_FACETS = FacetSet(
+    Facet('category', 'category', _('Category'), labels={'': _('Uncategorized')}),
+    BooleanFacet('active', 'is_active', _('Active')),
+    date_field='created_at__date',
+)
+
+
+def filter_list(facet_set, qs, params, hub_id=None, with_counts=True, timeout=None):
+    """
+    Apply a list's facets to ``qs`` and count its options.
+
+    Returns the filtered queryset plus the template context: ``facets``
+    (options with counts, empty when ``with_counts`` is off, as for
+    exports), ``date_from`` and ``date_to``. ``timeout`` overrides
+    ``TRAINING_FACET_CACHE_TIMEOUT`` for the grouped counts.
+    """
+    selected, date_range = facet_set.parse(params)
+    qs = facet_set.apply_range(qs, date_range)
+    facets = facet_set.counts(qs, selected, hub_id, timeout) if with_counts else []
+    return facet_set.apply(qs, selected), {'facets': facets, **date_range}
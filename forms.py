@@ -1,7 +1,42 @@
 from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
-from .models import TrainingProgram, Skill, EmployeeTraining
+from .models import TrainingProgram, Skill, EmployeeTraining, TrainingSettings
+
+class SearchSelect(forms.Select):
+    """
+    A select that renders only its selected option and loads the rest from a
+    search endpoint as the user types, instead of materializing every choice.
+    """
+    template_name = 'training/widgets/search_select.html'
+
+    def __init__(self, search_url, attrs=None):
+        super().__init__(attrs)
+        self.search_url = search_url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['search_url'] = reverse(self.search_url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        value = [v for v in value if v not in ('', None)]
+        if not value:
+            return []
+        queryset = getattr(self.choices, 'queryset', None)
+        if queryset is not None:
+            try:
+                choices = [(obj.pk, str(obj)) for obj in queryset.filter(pk__in=value)]
+            except (ValueError, ValidationError):
+                choices = []
+        else:
+            choices = [(key, label) for key, label in self.choices if str(key) in value]
+        return [
+            (None, [self.create_option(name, key, label, True, index, attrs=attrs)], index)
+            for index, (key, label) in enumerate(choices)
+        ]
 
 class TrainingProgramForm(forms.ModelForm):
     class Meta:
@@ -30,12 +65,56 @@ class EmployeeTrainingForm(forms.ModelForm):
         model = EmployeeTraining
         fields = ['employee_id', 'employee_name', 'program', 'status', 'start_date', 'completion_date', 'score']
         widgets = {
-            'employee_id': forms.TextInput(attrs={'class': 'input input-sm w-full'}),
-            'employee_name': forms.TextInput(attrs={'class': 'input input-sm w-full'}),
-            'program': forms.Select(attrs={'class': 'select select-sm w-full'}),
+            'employee_id': SearchSelect('training:employee_search', attrs={
+                'class': 'select select-sm w-full',
+                'onchange': "this.form.elements['employee_name'].value = this.selectedOptions[0]?.text || ''",
+            }),
+            'employee_name': forms.HiddenInput(),
+            'program': SearchSelect('training:program_search', attrs={'class': 'select select-sm w-full'}),
             'status': forms.TextInput(attrs={'class': 'input input-sm w-full'}),
             'start_date': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'date'}),
             'completion_date': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'date'}),
             'score': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'number'}),
         }
 
+    def __init__(self, *args, hub_id=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        programs = TrainingProgram.objects.filter(is_deleted=False, is_active=True)
+        if hub_id is not None:
+            programs = programs.filter(hub_id=hub_id)
+        self.fields['program'].queryset = programs
+        if self.instance.employee_id:
+            self.fields['employee_id'].widget.choices = [(str(self.instance.employee_id), self.instance.employee_name)]
+
+class TrainingSettingsForm(forms.ModelForm):
+    default_per_page = forms.TypedChoiceField(
+        label=_('Rows Per Page'), coerce=int, choices=[(n, n) for n in (12, 24, 48, 96)],
+        widget=forms.Select(attrs={'class': 'select select-sm w-full'}),
+    )
+    search_mode = forms.ChoiceField(
+        label=_('Search Mode'),
+        choices=[('contains', _('Anywhere in the text')), ('prefix', _('Start of the text'))],
+        widget=forms.Select(attrs={'class': 'select select-sm w-full'}),
+    )
+    default_status = forms.ChoiceField(
+        label=_('Default Status'),
+        choices=[
+            ('enrolled', _('Enrolled')), ('in_progress', _('In Progress')),
+            ('completed', _('Completed')), ('dropped', _('Dropped')),
+        ],
+        widget=forms.Select(attrs={'class': 'select select-sm w-full'}),
+    )
+
+    class Meta:
+        model = TrainingSettings
+        fields = [
+            'default_per_page', 'search_mode', 'default_status', 'export_row_limit', 'archive_retention_days',
+            'count_cache_timeout', 'facet_cache_timeout', 'leaderboard_cache_timeout',
+        ]
+        widgets = {
+            'export_row_limit': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'number', 'min': 0}),
+            'archive_retention_days': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'number', 'min': 0}),
+            'count_cache_timeout': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'number', 'min': 0}),
+            'facet_cache_timeout': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'number', 'min': 0}),
+            'leaderboard_cache_timeout': forms.TextInput(attrs={'class': 'input input-sm w-full', 'type': 'number', 'min': 0}),
+        }
@@ -0,0 +1,84 @@
+"""
+Cached per-hub settings for the Training views.
+
+``get_hub_settings(hub_id)`` returns the hub's ``TrainingSettings`` row, or
+an unsaved instance with the defaults when the hub has none. Lookups go
+through two layers keyed on the ``trainingsettings`` write version (see
+``training.cache``):
+
+1. a process-local dict, so a warm worker pays only the version read;
+2. the shared cache, so a cold worker skips the database.
+
+Saving or deleting a settings row bumps the version, which every worker
+sees on its next lookup. ``request_settings(request)`` memoizes the result
+on the request, so a view reads the settings once however many tunables it
+uses.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import get_version, make_key
+from .facets import get_facet_timeout
+from .models import TrainingSettings
+from .pagination import get_count_timeout
+from .services.leaderboards import get_leaderboard_timeout
+
+TABLE = 'trainingsettings'
+DEFAULT_PER_PAGE = 12
+DEFAULT_SETTINGS_TIMEOUT = 3600
+
+_local = {}
+_lock = threading.Lock()
+
+
+def get_settings_timeout():
+    return getattr(settings, 'TRAINING_SETTINGS_CACHE_TIMEOUT', DEFAULT_SETTINGS_TIMEOUT)
+
+
+def default_settings(hub_id):
+    """An unsaved settings instance carrying the project-wide defaults."""
+    return TrainingSettings(
+        hub_id=hub_id,
+        default_per_page=getattr(settings, 'TRAINING_DEFAULT_PER_PAGE', DEFAULT_PER_PAGE),
+        count_cache_timeout=get_count_timeout(),
+        facet_cache_timeout=get_facet_timeout(),
+        leaderboard_cache_timeout=get_leaderboard_timeout(),
+    )
+
+
+def _load(hub_id):
+    if hub_id is None:
+        return default_settings(hub_id)
+    return TrainingSettings.objects.filter(hub_id=hub_id, is_deleted=False).first() or default_settings(hub_id)
+
+
+def get_hub_settings(hub_id):
+    """The hub's settings, from the process, the shared cache or the database."""
+    version = get_version(hub_id, TABLE)
+    entry = _local.get(hub_id)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    key = make_key(hub_id, TABLE, 'settings')
+    obj = cache.get(key)
+    if obj is None:
+        obj = _load(hub_id)
+        cache.set(key, obj, get_settings_timeout())
+    with _lock:
+        _local[hub_id] = (version, obj)
+    return obj
+
+
+def request_settings(request):
+    """``get_hub_settings`` for the request's hub, read once per request."""
+    obj = getattr(request, '_training_settings', None)
+    if obj is None:
+        obj = request._training_settings = get_hub_settings(request.session.get('hub_id'))
+    return obj
+
+
+def clear_local():
+    """Drop the process-local copies (tests, or after changing Django settings)."""
+    with _lock:
+        _local.clear()
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from training.models import EmployeeTraining
+from training.services.trends import DEFAULT_CHUNK_SIZE, backfill_trends
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the trend and cohort rollups from enrollments, one hub at a time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', action='append', dest='hubs', help='Limit to this hub id (repeatable).')
+        parser.add_argument('--after', help='Resume with the hubs ordered after this hub id.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, hubs=None, after=None, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+        if not hubs:
+            hubs = EmployeeTraining.objects.exclude(hub_id=None)
+            if after:
+                hubs = hubs.filter(hub_id__gt=after)
+            hubs = hubs.values_list('hub_id', flat=True).order_by('hub_id').distinct()
+        total = 0
+        for hub_id in hubs:
+            counted = backfill_trends(hub_id, chunk_size=chunk_size)
+            total += counted
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{hub_id}: {counted}')
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {total} enrollments.'))
@@ -0,0 +1,39 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from training.services.columnar import (
+    COLUMNAR_EXTENSIONS, COLUMNAR_FORMATS, COLUMNAR_TABLES, arrow_available, write_columnar,
+)
+
+
+class Command(BaseCommand):
+    help = 'Export enrollments, programs and skills as Parquet files or Arrow IPC streams.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Directory to write <table>.parquet or <table>.arrows files into.')
+        parser.add_argument('--hub', action='append', dest='hubs', help='Limit to this hub id (repeatable).')
+        parser.add_argument(
+            '--table', action='append', dest='tables', choices=list(COLUMNAR_TABLES),
+            help='Export only this table (repeatable).',
+        )
+        parser.add_argument('--format', dest='fmt', choices=COLUMNAR_FORMATS, default='parquet')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows per row group or record batch.')
+        parser.add_argument('--include-deleted', action='store_true', help='Also export soft-deleted rows.')
+
+    def handle(self, *args, output, hubs=None, tables=None, fmt='parquet', batch_size=None, **options):
+        if not arrow_available():
+            raise CommandError('Columnar exports require the pyarrow package.')
+        os.makedirs(output, exist_ok=True)
+        total = 0
+        for table in tables or COLUMNAR_TABLES:
+            model = COLUMNAR_TABLES[table][0]
+            qs = model.all_objects.all() if options['include_deleted'] else model.objects.all()
+            if hubs:
+                qs = qs.filter(hub_id__in=hubs)
+            path = os.path.join(output, f'{table}.{COLUMNAR_EXTENSIONS[fmt]}')
+            rows = write_columnar(table, qs.order_by('pk'), path, fmt, batch_size)
+            total += rows
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{table}: {rows} rows -> {path}')
+        self.stdout.write(self.style.SUCCESS(f'Exported {total} rows.'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from training.partitioning import (
+    DEFAULT_BATCH_SIZE, PartitioningError, get_partition_count, is_partitioned, partition_enrollments,
+    partition_names, supports_partitioning,
+)
+
+
+class Command(BaseCommand):
+    help = 'Convert training_employeetraining to hash partitions by hub (PostgreSQL only, resumable).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--partitions', type=int, default=None,
+                            help='Number of hash partitions (default: TRAINING_ENROLLMENT_PARTITIONS).')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--check', action='store_true', help='Only report the current layout.')
+
+    def handle(self, *args, partitions=None, batch_size=DEFAULT_BATCH_SIZE, database=DEFAULT_DB_ALIAS,
+               check=False, **options):
+        connection = connections[database]
+        if not supports_partitioning(connection):
+            self.stdout.write(f'{connection.vendor} does not support partitioning; the table is left as it is.')
+            return
+        if check or is_partitioned(connection):
+            names = partition_names(connection)
+            state = 'partitioned' if is_partitioned(connection) else 'not partitioned'
+            self.stdout.write(f'training_employeetraining is {state} ({len(names)} partitions).')
+            return
+        partitions = partitions or get_partition_count()
+        if not partitions:
+            raise CommandError('Pass --partitions or set TRAINING_ENROLLMENT_PARTITIONS.')
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        try:
+            partition_enrollments(connection, partitions, batch_size, log=log)
+        except PartitioningError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f'Partitioned training_employeetraining into {partitions} partitions.'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from training.models import TrainingProgram
+from training.services.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recount the enrollment counters of every training program and repair drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', action='append', dest='hubs', help='Limit to this hub id (repeatable).')
+
+    def handle(self, *args, hubs=None, **options):
+        if not hubs:
+            hubs = TrainingProgram.all_objects.exclude(hub_id=None).values_list('hub_id', flat=True).order_by('hub_id').distinct()
+        total = 0
+        for hub_id in hubs:
+            fixed = reconcile_counters(hub_id)
+            total += fixed
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{hub_id}: {fixed}')
+        self.stdout.write(self.style.SUCCESS(f'Repaired {total} program counters.'))
@@ -0,0 +1,36 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from training.models import TranscriptJob
+from training.services.transcripts import claim_jobs, expire_archives, run_job
+
+
+class Command(BaseCommand):
+    help = 'Render pending transcript jobs, resume interrupted ones and expire old archives.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', help='Run (or resume) only this job id.')
+        parser.add_argument('--workers', type=int, help='Worker processes (default: TRAINING_TRANSCRIPT_WORKERS or the CPU count).')
+
+    def handle(self, *args, job=None, workers=None, **options):
+        if job:
+            try:
+                jobs = [TranscriptJob.objects.get(pk=job)]
+            except (TranscriptJob.DoesNotExist, ValidationError, ValueError):
+                raise CommandError(f'Transcript job {job} not found.')
+        else:
+            jobs = claim_jobs()
+        count = 0
+        for transcript_job in jobs:
+            try:
+                run_job(transcript_job, workers=workers)
+            except Exception as exc:
+                self.stderr.write(f'{transcript_job.pk}: {exc}')
+                continue
+            count += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{transcript_job.pk}: {transcript_job.archive_path}')
+        expired = expire_archives()
+        if expired:
+            self.stdout.write(f'Expired {expired} transcript archives.')
+        self.stdout.write(self.style.SUCCESS(f'Finished {count} transcript jobs.'))
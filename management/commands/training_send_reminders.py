@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from training.services.reminders import hubs_with_mandatory_training, queue_reminders
+
+
+class Command(BaseCommand):
+    help = 'Queue reminder digests for overdue, not-started and expiring mandatory training.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hub', action='append', dest='hubs', help='Limit to this hub id (repeatable).')
+
+    def handle(self, *args, hubs=None, **options):
+        total = 0
+        for hub_id in hubs or hubs_with_mandatory_training():
+            queued = queue_reminders(hub_id)
+            total += queued
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{hub_id}: {queued}')
+        self.stdout.write(self.style.SUCCESS(f'Queued {total} reminder digests.'))
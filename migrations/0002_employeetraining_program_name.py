@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_program_name(apps, schema_editor):
+    EmployeeTraining = apps.get_model('training', 'EmployeeTraining')
+    TrainingProgram = apps.get_model('training', 'TrainingProgram')
+    EmployeeTraining.objects.update(
+        program_name=Subquery(TrainingProgram.objects.filter(pk=OuterRef('program_id')).values('name')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeetraining',
+            name='program_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Program Name'),
+        ),
+        migrations.RunPython(backfill_program_name, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='employeetraining',
+            index=models.Index(fields=['hub_id', 'program_name'], name='training_et_hub_prog_name_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+CLOSED_STATUSES = ('completed', 'failed', 'cancelled', 'dropped')
+CHUNK_SIZE = 500
+
+
+def collapse_duplicate_enrollments(apps, schema_editor):
+    """Soft-delete all but the oldest active enrollment per (hub, employee, program)."""
+    EmployeeTraining = apps.get_model('training', 'EmployeeTraining')
+    active = EmployeeTraining.objects.filter(is_deleted=False).exclude(status__in=CLOSED_STATUSES)
+    groups = (
+        active.values('hub_id', 'employee_id', 'program_id')
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .order_by()
+    )
+    # Materialize the (small) list of duplicate groups before updating rows.
+    groups = list(groups.values_list('hub_id', 'employee_id', 'program_id'))
+    now = timezone.now()
+    for start in range(0, len(groups), CHUNK_SIZE):
+        duplicate_ids = []
+        for hub_id, employee_id, program_id in groups[start:start + CHUNK_SIZE]:
+            ids = list(
+                active.filter(hub_id=hub_id, employee_id=employee_id, program_id=program_id)
+                .order_by('created_at', 'id')
+                .values_list('id', flat=True)
+            )
+            duplicate_ids.extend(ids[1:])
+        EmployeeTraining.objects.filter(id__in=duplicate_ids).update(is_deleted=True, deleted_at=now)
+
+
+class Migration(migrations.Migration):
+
+    # Each chunk commits on its own so large tables are not locked for the whole pass.
+    atomic = False
+
+    dependencies = [
+        ('training', '0002_employeetraining_program_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(collapse_duplicate_enrollments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='employeetraining',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('is_deleted', False), models.Q(('status__in', ('completed', 'failed', 'cancelled', 'dropped')), _negated=True)),
+                fields=('hub_id', 'employee_id', 'program'),
+                name='training_et_unique_active',
+            ),
+        ),
+    ]
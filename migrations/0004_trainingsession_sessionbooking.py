@@ -0,0 +1,61 @@
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0003_employeetraining_unique_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('starts_at', models.DateTimeField(verbose_name='Starts At')),
+                ('ends_at', models.DateTimeField(blank=True, null=True, verbose_name='Ends At')),
+                ('location', models.CharField(blank=True, max_length=255, verbose_name='Location')),
+                ('capacity', models.PositiveIntegerField(default=0, verbose_name='Capacity')),
+                ('seats_taken', models.PositiveIntegerField(default=0, editable=False, verbose_name='Seats Taken')),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='training.trainingprogram')),
+            ],
+            options={
+                'db_table': 'training_trainingsession',
+                'abstract': False,
+                'indexes': [models.Index(fields=['hub_id', 'program', 'starts_at'], name='training_ts_hub_prog_start_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('seats_taken__lte', models.F('capacity'))), name='training_ts_seats_within_capacity')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SessionBooking',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('employee_id', models.UUIDField(db_index=True, verbose_name='Employee Id')),
+                ('employee_name', models.CharField(max_length=255, verbose_name='Employee Name')),
+                ('status', models.CharField(default='confirmed', max_length=20, verbose_name='Status')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='training.trainingsession')),
+            ],
+            options={
+                'db_table': 'training_sessionbooking',
+                'abstract': False,
+                'indexes': [models.Index(fields=['session', 'status', 'created_at'], name='training_sb_session_status_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_deleted', False), ('status__in', ('confirmed', 'waitlisted', 'attended'))), fields=('session', 'employee_id'), name='training_sb_unique_active')],
+            },
+        ),
+    ]
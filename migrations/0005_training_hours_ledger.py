@@ -0,0 +1,160 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+CHUNK_SIZE = 1000
+
+
+def backfill_hours_ledger(apps, schema_editor):
+    """Record ledger entries for existing completed enrollments and attended bookings, then roll them up."""
+    EmployeeTraining = apps.get_model('training', 'EmployeeTraining')
+    SessionBooking = apps.get_model('training', 'SessionBooking')
+    TrainingHoursEntry = apps.get_model('training', 'TrainingHoursEntry')
+    EmployeeHoursRollup = apps.get_model('training', 'EmployeeHoursRollup')
+    HubHoursRollup = apps.get_model('training', 'HubHoursRollup')
+
+    enrollments = (
+        EmployeeTraining.objects.filter(is_deleted=False, status='completed')
+        .select_related('program').order_by('pk').iterator(chunk_size=CHUNK_SIZE)
+    )
+    entries = []
+    for enrollment in enrollments:
+        entries.append(TrainingHoursEntry(
+            hub_id=enrollment.hub_id, employee_id=enrollment.employee_id,
+            employee_name=enrollment.employee_name, program_id=enrollment.program_id,
+            enrollment_id=enrollment.pk, hours=Decimal(enrollment.program.duration_hours),
+            occurred_on=enrollment.completion_date or timezone.localdate(enrollment.created_at),
+        ))
+        if len(entries) >= CHUNK_SIZE:
+            TrainingHoursEntry.objects.bulk_create(entries)
+            entries = []
+
+    bookings = (
+        SessionBooking.objects.filter(is_deleted=False, status='attended')
+        .select_related('session__program').order_by('pk').iterator(chunk_size=CHUNK_SIZE)
+    )
+    for booking in bookings:
+        session = booking.session
+        if session.ends_at and session.ends_at > session.starts_at:
+            seconds = Decimal((session.ends_at - session.starts_at).total_seconds())
+            hours = (seconds / 3600).quantize(Decimal('0.01'))
+        else:
+            hours = Decimal(session.program.duration_hours)
+        entries.append(TrainingHoursEntry(
+            hub_id=booking.hub_id, employee_id=booking.employee_id,
+            employee_name=booking.employee_name, program_id=session.program_id,
+            booking_id=booking.pk, hours=hours, occurred_on=timezone.localdate(session.starts_at),
+        ))
+        if len(entries) >= CHUNK_SIZE:
+            TrainingHoursEntry.objects.bulk_create(entries)
+            entries = []
+    TrainingHoursEntry.objects.bulk_create(entries)
+
+    ledger = TrainingHoursEntry.objects.filter(is_deleted=False).annotate(month=TruncMonth('occurred_on'))
+    EmployeeHoursRollup.objects.bulk_create([
+        EmployeeHoursRollup(
+            hub_id=row['hub_id'], employee_id=row['employee_id'], employee_name=row['name'] or '',
+            period=_as_date(row['month']), hours=row['hours'], entries=row['entries'],
+        )
+        for row in ledger.values('hub_id', 'employee_id', 'month').annotate(
+            hours=Sum('hours'), entries=Count('id'), name=Max('employee_name'),
+        ).order_by()
+    ], batch_size=CHUNK_SIZE)
+    HubHoursRollup.objects.bulk_create([
+        HubHoursRollup(hub_id=row['hub_id'], period=_as_date(row['month']), hours=row['hours'], entries=row['entries'])
+        for row in ledger.values('hub_id', 'month').annotate(hours=Sum('hours'), entries=Count('id')).order_by()
+    ], batch_size=CHUNK_SIZE)
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0004_trainingsession_sessionbooking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingHoursEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('employee_id', models.UUIDField(db_index=True, verbose_name='Employee Id')),
+                ('employee_name', models.CharField(blank=True, max_length=255, verbose_name='Employee Name')),
+                ('hours', models.DecimalField(decimal_places=2, max_digits=8, verbose_name='Hours')),
+                ('occurred_on', models.DateField(verbose_name='Occurred On')),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hours_entries', to='training.trainingprogram')),
+                ('enrollment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='hours_entries', to='training.employeetraining')),
+                ('booking', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='hours_entries', to='training.sessionbooking')),
+            ],
+            options={
+                'db_table': 'training_traininghoursentry',
+                'abstract': False,
+                'indexes': [models.Index(fields=['hub_id', 'employee_id', 'occurred_on'], name='training_he_hub_emp_date_idx')],
+                'constraints': [
+                    models.UniqueConstraint(condition=models.Q(('is_deleted', False), ('enrollment__isnull', False)), fields=('enrollment',), name='training_he_unique_enrollment'),
+                    models.UniqueConstraint(condition=models.Q(('is_deleted', False), ('booking__isnull', False)), fields=('booking',), name='training_he_unique_booking'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='EmployeeHoursRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('employee_id', models.UUIDField(verbose_name='Employee Id')),
+                ('employee_name', models.CharField(blank=True, max_length=255, verbose_name='Employee Name')),
+                ('period', models.DateField(verbose_name='Period')),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Hours')),
+                ('entries', models.IntegerField(default=0, verbose_name='Entries')),
+            ],
+            options={
+                'db_table': 'training_employeehoursrollup',
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('hub_id', 'period', 'employee_id'), name='training_ehr_unique_period')],
+            },
+        ),
+        migrations.CreateModel(
+            name='HubHoursRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('period', models.DateField(verbose_name='Period')),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Hours')),
+                ('entries', models.IntegerField(default=0, verbose_name='Entries')),
+            ],
+            options={
+                'db_table': 'training_hubhoursrollup',
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('hub_id', 'period'), name='training_hhr_unique_period')],
+            },
+        ),
+        migrations.RunPython(backfill_hours_ledger, migrations.RunPython.noop),
+    ]
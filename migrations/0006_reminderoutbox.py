@@ -0,0 +1,41 @@
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0005_training_hours_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderOutbox',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('recipient_kind', models.CharField(max_length=20, verbose_name='Recipient Kind')),
+                ('recipient_id', models.UUIDField(blank=True, null=True, verbose_name='Recipient Id')),
+                ('recipient_name', models.CharField(blank=True, max_length=255, verbose_name='Recipient Name')),
+                ('digest_key', models.CharField(max_length=32, verbose_name='Digest Key')),
+                ('payload', models.JSONField(default=dict, verbose_name='Payload')),
+                ('status', models.CharField(default='pending', max_length=20, verbose_name='Status')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Sent At')),
+            ],
+            options={
+                'db_table': 'training_reminderoutbox',
+                'abstract': False,
+                'indexes': [
+                    models.Index(fields=['hub_id', 'created_at'], name='training_ro_hub_created_idx'),
+                    models.Index(fields=['status', 'created_at'], name='training_ro_status_idx'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# Prefix searches compare UPPER(column) with LIKE 'PREFIX%'. PostgreSQL can
+# only serve that from a b-tree built with text_pattern_ops, which model
+# Meta indexes cannot express portably, so the indexes are PostgreSQL-only.
+INDEXES = (
+    ('training_tp_name_prefix_idx', 'training_trainingprogram', 'name'),
+    ('training_et_emp_prefix_idx', 'training_employeetraining', 'employee_name'),
+)
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            f'(hub_id, UPPER({column}::text) text_pattern_ops) WHERE NOT is_deleted'
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0006_reminderoutbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
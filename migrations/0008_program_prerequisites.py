@@ -0,0 +1,58 @@
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0007_search_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgramPrerequisite',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prerequisite_links', to='training.trainingprogram')),
+                ('requires', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependent_links', to='training.trainingprogram')),
+            ],
+            options={
+                'db_table': 'training_programprerequisite',
+                'abstract': False,
+                'constraints': [
+                    models.UniqueConstraint(condition=models.Q(('is_deleted', False)), fields=('program', 'requires'), name='training_pp_unique_edge'),
+                    models.CheckConstraint(condition=models.Q(('program', models.F('requires')), _negated=True), name='training_pp_not_self'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProgramClosure',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('depth', models.PositiveIntegerField(default=1, verbose_name='Depth')),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_prerequisites', to='training.trainingprogram')),
+                ('prerequisite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_dependents', to='training.trainingprogram')),
+            ],
+            options={
+                'db_table': 'training_programclosure',
+                'abstract': False,
+                'indexes': [models.Index(fields=['prerequisite', 'program'], name='training_pc_prereq_prog_idx')],
+                'constraints': [models.UniqueConstraint(fields=('program', 'prerequisite'), name='training_pc_unique_pair')],
+            },
+        ),
+    ]
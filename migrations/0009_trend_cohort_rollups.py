@@ -0,0 +1,68 @@
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0008_program_prerequisites'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('grain', models.CharField(max_length=5, verbose_name='Grain')),
+                ('period', models.DateField(verbose_name='Period')),
+                ('enrolled', models.IntegerField(default=0, verbose_name='Enrolled')),
+                ('completed', models.IntegerField(default=0, verbose_name='Completed')),
+                ('failed', models.IntegerField(default=0, verbose_name='Failed')),
+                ('program', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='trend_rollups', to='training.trainingprogram')),
+            ],
+            options={
+                'db_table': 'training_trendrollup',
+                'abstract': False,
+                'constraints': [
+                    models.UniqueConstraint(condition=models.Q(('program__isnull', False)), fields=('hub_id', 'grain', 'period', 'program'), name='training_tr_unique_program'),
+                    models.UniqueConstraint(condition=models.Q(('program__isnull', True)), fields=('hub_id', 'grain', 'period'), name='training_tr_unique_hub'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='CohortRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('cohort', models.DateField(verbose_name='Cohort')),
+                ('enrolled', models.IntegerField(default=0, verbose_name='Enrolled')),
+                ('completed', models.IntegerField(default=0, verbose_name='Completed')),
+                ('completed_7d', models.IntegerField(default=0, verbose_name='Completed Within 7 Days')),
+                ('completed_30d', models.IntegerField(default=0, verbose_name='Completed Within 30 Days')),
+                ('completed_90d', models.IntegerField(default=0, verbose_name='Completed Within 90 Days')),
+                ('program', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='cohort_rollups', to='training.trainingprogram')),
+            ],
+            options={
+                'db_table': 'training_cohortrollup',
+                'abstract': False,
+                'constraints': [
+                    models.UniqueConstraint(condition=models.Q(('program__isnull', False)), fields=('hub_id', 'cohort', 'program'), name='training_cr_unique_program'),
+                    models.UniqueConstraint(condition=models.Q(('program__isnull', True)), fields=('hub_id', 'cohort'), name='training_cr_unique_hub'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0009_trend_cohort_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('format', models.CharField(default='html', max_length=4, verbose_name='Format')),
+                ('employee_ids', models.JSONField(default=list, verbose_name='Employee Ids')),
+                ('status', models.CharField(default='pending', max_length=10, verbose_name='Status')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+                ('rendered', models.PositiveIntegerField(default=0, verbose_name='Rendered')),
+                ('archive_path', models.CharField(blank=True, max_length=500, verbose_name='Archive Path')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+            ],
+            options={
+                'db_table': 'training_transcriptjob',
+                'abstract': False,
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='training_tj_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0010_transcriptjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trainingprogram',
+            index=models.Index(fields=['hub_id', 'is_active', 'is_mandatory'], name='training_tp_hub_flags_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['hub_id', 'category'], name='training_sk_hub_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeetraining',
+            index=models.Index(fields=['hub_id', 'status'], name='training_et_hub_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeetraining',
+            index=models.Index(fields=['hub_id', 'start_date'], name='training_et_hub_start_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+# Only acts on PostgreSQL with TRAINING_ENROLLMENT_PARTITIONS set; see
+# training.partitioning. Non-atomic so the copy commits batch by batch and an
+# interrupted run resumes. Turning partitioning on later is done with
+# `manage.py training_partition_enrollments`.
+
+
+def partition(apps, schema_editor):
+    from training.partitioning import partition_enrollments
+    partition_enrollments(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('training', '0011_list_facet_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, migrations.RunPython.noop, atomic=False),
+    ]
@@ -0,0 +1,39 @@
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0012_partition_enrollments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingSettings',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('default_per_page', models.PositiveSmallIntegerField(default=12, verbose_name='Rows Per Page')),
+                ('export_row_limit', models.PositiveIntegerField(default=0, verbose_name='Export Row Limit')),
+                ('search_mode', models.CharField(default='contains', max_length=10, verbose_name='Search Mode')),
+                ('default_status', models.CharField(default='enrolled', max_length=20, verbose_name='Default Status')),
+                ('archive_retention_days', models.PositiveIntegerField(default=0, verbose_name='Archive Retention Days')),
+                ('count_cache_timeout', models.PositiveIntegerField(default=300, verbose_name='Count Cache TTL')),
+                ('facet_cache_timeout', models.PositiveIntegerField(default=300, verbose_name='Facet Cache TTL')),
+                ('leaderboard_cache_timeout', models.PositiveIntegerField(default=900, verbose_name='Leaderboard Cache TTL')),
+            ],
+            options={
+                'db_table': 'training_trainingsettings',
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_deleted', False)), fields=('hub_id',), name='training_tset_unique_hub')],
+            },
+        ),
+    ]
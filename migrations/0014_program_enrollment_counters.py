@@ -0,0 +1,51 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    """Count the live enrollments of every existing program."""
+    EmployeeTraining = apps.get_model('training', 'EmployeeTraining')
+    TrainingProgram = apps.get_model('training', 'TrainingProgram')
+    rows = (
+        EmployeeTraining.objects.filter(is_deleted=False)
+        .values('program_id')
+        .annotate(
+            enrollment_count=Count('pk'),
+            in_progress_count=Count('pk', filter=Q(status='in_progress')),
+            completed_count=Count('pk', filter=Q(status='completed')),
+        )
+        .order_by()
+    )
+    for row in rows:
+        program_id = row.pop('program_id')
+        TrainingProgram.objects.filter(pk=program_id).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0013_trainingsettings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingprogram',
+            name='enrollment_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Enrollments'),
+        ),
+        migrations.AddField(
+            model_name='trainingprogram',
+            name='in_progress_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='In Progress'),
+        ),
+        migrations.AddField(
+            model_name='trainingprogram',
+            name='completed_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Completed'),
+        ),
+        migrations.AddIndex(
+            model_name='trainingprogram',
+            index=models.Index(fields=['hub_id', '-enrollment_count'], name='training_tp_hub_popular_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0014_program_enrollment_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeetraining',
+            index=models.Index(fields=['created_at', 'id'], name='training_et_created_idx'),
+        ),
+    ]
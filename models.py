@@ -3,19 +3,64 @@ from django.utils.translation import gettext_lazy as _
 
 from apps.core.models.base import HubBaseModel
 
+from .cache import bump_version
+
+CLOSED_STATUSES = ('completed', 'failed', 'cancelled', 'dropped')
+
+SEAT_HOLDING_STATUSES = ('confirmed', 'attended')
+ACTIVE_BOOKING_STATUSES = ('confirmed', 'waitlisted', 'attended')
+
+PROGRAM_COUNTER_FIELDS = ('enrollment_count', 'in_progress_count', 'completed_count')
+
 class TrainingProgram(HubBaseModel):
     name = models.CharField(max_length=255, verbose_name=_('Name'))
     description = models.TextField(blank=True, verbose_name=_('Description'))
     duration_hours = models.PositiveIntegerField(default=0, verbose_name=_('Duration Hours'))
     is_mandatory = models.BooleanField(default=False, verbose_name=_('Is Mandatory'))
     is_active = models.BooleanField(default=True, verbose_name=_('Is Active'))
+    # Live enrollments, kept by training.services.counters; signed so drift
+    # shows up instead of failing writes.
+    enrollment_count = models.IntegerField(default=0, editable=False, verbose_name=_('Enrollments'))
+    in_progress_count = models.IntegerField(default=0, editable=False, verbose_name=_('In Progress'))
+    completed_count = models.IntegerField(default=0, editable=False, verbose_name=_('Completed'))
 
     class Meta(HubBaseModel.Meta):
         db_table = 'training_trainingprogram'
+        indexes = [
+            # List facets filter on the flags within a hub.
+            models.Index(fields=['hub_id', 'is_active', 'is_mandatory'], name='training_tp_hub_flags_idx'),
+            models.Index(fields=['hub_id', '-enrollment_count'], name='training_tp_hub_popular_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def completion_rate(self):
+        """Completed share of live enrollments, in whole percent."""
+        return round(100 * self.completed_count / self.enrollment_count) if self.enrollment_count > 0 else 0
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_name = instance.__dict__.get('name')
+        return instance
+
+    def save(self, *args, **kwargs):
+        loaded_name = getattr(self, '_loaded_name', None)
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Counters only move through F() updates; never write back a stale copy.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in PROGRAM_COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        if loaded_name is not None and loaded_name != self.name:
+            # Keep the denormalized copy on enrollments in sync in one UPDATE.
+            EmployeeTraining.all_objects.filter(program_id=self.pk).update(program_name=self.name)
+            bump_version(self.hub_id, EmployeeTraining._meta.model_name)
+        self._loaded_name = self.name
+
 
 class Skill(HubBaseModel):
     name = models.CharField(max_length=100, verbose_name=_('Name'))
@@ -24,6 +69,9 @@ class Skill(HubBaseModel):
 
     class Meta(HubBaseModel.Meta):
         db_table = 'training_skill'
+        indexes = [
+            models.Index(fields=['hub_id', 'category'], name='training_sk_hub_category_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -33,6 +81,7 @@ class EmployeeTraining(HubBaseModel):
     employee_id = models.UUIDField(db_index=True, verbose_name=_('Employee Id'))
     employee_name = models.CharField(max_length=255, verbose_name=_('Employee Name'))
     program = models.ForeignKey('TrainingProgram', on_delete=models.CASCADE)
+    program_name = models.CharField(max_length=255, blank=True, default='', editable=False, verbose_name=_('Program Name'))
     status = models.CharField(max_length=20, default='enrolled', verbose_name=_('Status'))
     start_date = models.DateField(null=True, blank=True, verbose_name=_('Start Date'))
     completion_date = models.DateField(null=True, blank=True, verbose_name=_('Completion Date'))
@@ -40,7 +89,340 @@ class EmployeeTraining(HubBaseModel):
 
     class Meta(HubBaseModel.Meta):
         db_table = 'training_employeetraining'
+        indexes = [
+            models.Index(fields=['hub_id', 'program_name'], name='training_et_hub_prog_name_idx'),
+            models.Index(fields=['hub_id', 'status'], name='training_et_hub_status_idx'),
+            models.Index(fields=['hub_id', 'start_date'], name='training_et_hub_start_idx'),
+            # Admin changelist order (-created_at, -pk), read backwards.
+            models.Index(fields=['created_at', 'id'], name='training_et_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hub_id', 'employee_id', 'program'],
+                condition=models.Q(is_deleted=False) & ~models.Q(status__in=CLOSED_STATUSES),
+                name='training_et_unique_active',
+            ),
+        ]
 
     def __str__(self):
         return str(self.id)
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if self.program_id and (update_fields is None or 'program' in update_fields):
+            self.program_name = self.program.name
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'program_name'}
+        super().save(*args, **kwargs)
+
+
+
+class TrainingSession(HubBaseModel):
+    program = models.ForeignKey('TrainingProgram', on_delete=models.CASCADE, related_name='sessions')
+    starts_at = models.DateTimeField(verbose_name=_('Starts At'))
+    ends_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Ends At'))
+    location = models.CharField(max_length=255, blank=True, verbose_name=_('Location'))
+    capacity = models.PositiveIntegerField(default=0, verbose_name=_('Capacity'))
+    seats_taken = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Seats Taken'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_trainingsession'
+        indexes = [
+            models.Index(fields=['hub_id', 'program', 'starts_at'], name='training_ts_hub_prog_start_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(seats_taken__lte=models.F('capacity')),
+                name='training_ts_seats_within_capacity',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.program_id} @ {self.starts_at:%Y-%m-%d %H:%M}'
+
+    @property
+    def seats_available(self):
+        return max(self.capacity - self.seats_taken, 0)
+
+
+class SessionBooking(HubBaseModel):
+    session = models.ForeignKey('TrainingSession', on_delete=models.CASCADE, related_name='bookings')
+    employee_id = models.UUIDField(db_index=True, verbose_name=_('Employee Id'))
+    employee_name = models.CharField(max_length=255, verbose_name=_('Employee Name'))
+    status = models.CharField(max_length=20, default='confirmed', verbose_name=_('Status'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_sessionbooking'
+        indexes = [
+            # Waitlist promotion reads the oldest waitlisted booking of a session.
+            models.Index(fields=['session', 'status', 'created_at'], name='training_sb_session_status_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['session', 'employee_id'],
+                condition=models.Q(is_deleted=False) & models.Q(status__in=ACTIVE_BOOKING_STATUSES),
+                name='training_sb_unique_active',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.employee_name} ({self.status})'
+
+
+class TrainingHoursEntry(HubBaseModel):
+    """One ledger line: hours earned by a completed enrollment or an attended session."""
+    employee_id = models.UUIDField(db_index=True, verbose_name=_('Employee Id'))
+    employee_name = models.CharField(max_length=255, blank=True, verbose_name=_('Employee Name'))
+    program = models.ForeignKey('TrainingProgram', on_delete=models.CASCADE, related_name='hours_entries')
+    enrollment = models.ForeignKey(
+        'EmployeeTraining', on_delete=models.CASCADE, null=True, blank=True, related_name='hours_entries',
+    )
+    booking = models.ForeignKey(
+        'SessionBooking', on_delete=models.CASCADE, null=True, blank=True, related_name='hours_entries',
+    )
+    hours = models.DecimalField(max_digits=8, decimal_places=2, verbose_name=_('Hours'))
+    occurred_on = models.DateField(verbose_name=_('Occurred On'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_traininghoursentry'
+        indexes = [
+            models.Index(fields=['hub_id', 'employee_id', 'occurred_on'], name='training_he_hub_emp_date_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['enrollment'], condition=models.Q(is_deleted=False, enrollment__isnull=False),
+                name='training_he_unique_enrollment',
+            ),
+            models.UniqueConstraint(
+                fields=['booking'], condition=models.Q(is_deleted=False, booking__isnull=False),
+                name='training_he_unique_booking',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.employee_name} {self.hours}h ({self.occurred_on})'
+
+
+class EmployeeHoursRollup(HubBaseModel):
+    """Training hours per employee and month, maintained from the ledger."""
+    employee_id = models.UUIDField(verbose_name=_('Employee Id'))
+    employee_name = models.CharField(max_length=255, blank=True, verbose_name=_('Employee Name'))
+    period = models.DateField(verbose_name=_('Period'))
+    hours = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name=_('Hours'))
+    entries = models.IntegerField(default=0, verbose_name=_('Entries'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_employeehoursrollup'
+        constraints = [
+            models.UniqueConstraint(fields=['hub_id', 'period', 'employee_id'], name='training_ehr_unique_period'),
+        ]
+
+    def __str__(self):
+        return f'{self.employee_name} {self.period:%Y-%m}: {self.hours}h'
+
+
+class HubHoursRollup(HubBaseModel):
+    """Training hours per hub and month, maintained from the ledger."""
+    period = models.DateField(verbose_name=_('Period'))
+    hours = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name=_('Hours'))
+    entries = models.IntegerField(default=0, verbose_name=_('Entries'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_hubhoursrollup'
+        constraints = [
+            models.UniqueConstraint(fields=['hub_id', 'period'], name='training_hhr_unique_period'),
+        ]
+
+    def __str__(self):
+        return f'{self.hub_id} {self.period:%Y-%m}: {self.hours}h'
+
+
+class ReminderOutbox(HubBaseModel):
+    """A queued reminder digest, delivered by whichever notifier drains the outbox."""
+    recipient_kind = models.CharField(max_length=20, verbose_name=_('Recipient Kind'))
+    recipient_id = models.UUIDField(null=True, blank=True, verbose_name=_('Recipient Id'))
+    recipient_name = models.CharField(max_length=255, blank=True, verbose_name=_('Recipient Name'))
+    digest_key = models.CharField(max_length=32, verbose_name=_('Digest Key'))
+    payload = models.JSONField(default=dict, verbose_name=_('Payload'))
+    status = models.CharField(max_length=20, default='pending', verbose_name=_('Status'))
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Sent At'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_reminderoutbox'
+        indexes = [
+            # Deduplication looks up a hub's recent digests in one range scan.
+            models.Index(fields=['hub_id', 'created_at'], name='training_ro_hub_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='training_ro_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient_kind}:{self.recipient_name} ({self.status})'
+
+
+class ProgramPrerequisite(HubBaseModel):
+    """``program`` requires ``requires`` to be completed first."""
+    program = models.ForeignKey('TrainingProgram', on_delete=models.CASCADE, related_name='prerequisite_links')
+    requires = models.ForeignKey('TrainingProgram', on_delete=models.CASCADE, related_name='dependent_links')
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_programprerequisite'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['program', 'requires'], condition=models.Q(is_deleted=False),
+                name='training_pp_unique_edge',
+            ),
+            models.CheckConstraint(condition=~models.Q(program=models.F('requires')), name='training_pp_not_self'),
+        ]
+
+    def __str__(self):
+        return f'{self.program_id} -> {self.requires_id}'
+
+
+class ProgramClosure(HubBaseModel):
+    """
+    Transitive closure of ``ProgramPrerequisite``: one row per program and
+    each program it requires, directly (depth 1) or through a chain.
+    Maintained by ``services.prerequisites``.
+    """
+    program = models.ForeignKey('TrainingProgram', on_delete=models.CASCADE, related_name='closure_prerequisites')
+    prerequisite = models.ForeignKey('TrainingProgram', on_delete=models.CASCADE, related_name='closure_dependents')
+    depth = models.PositiveIntegerField(default=1, verbose_name=_('Depth'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_programclosure'
+        indexes = [
+            # "Which programs depend on X" for cycle checks and closure updates.
+            models.Index(fields=['prerequisite', 'program'], name='training_pc_prereq_prog_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['program', 'prerequisite'], name='training_pc_unique_pair'),
+        ]
+
+    def __str__(self):
+        return f'{self.program_id} =>{self.depth} {self.prerequisite_id}'
+
+
+TREND_GRAINS = ('week', 'month')
+
+
+class TrendRollup(HubBaseModel):
+    """
+    Enrollments, completions and failures per week or month, per program and
+    per hub (``program`` empty). Maintained by ``services.trends``.
+    """
+    program = models.ForeignKey(
+        'TrainingProgram', on_delete=models.CASCADE, null=True, blank=True, related_name='trend_rollups',
+    )
+    grain = models.CharField(max_length=5, verbose_name=_('Grain'))
+    period = models.DateField(verbose_name=_('Period'))
+    enrolled = models.IntegerField(default=0, verbose_name=_('Enrolled'))
+    completed = models.IntegerField(default=0, verbose_name=_('Completed'))
+    failed = models.IntegerField(default=0, verbose_name=_('Failed'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_trendrollup'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hub_id', 'grain', 'period', 'program'], condition=models.Q(program__isnull=False),
+                name='training_tr_unique_program',
+            ),
+            models.UniqueConstraint(
+                fields=['hub_id', 'grain', 'period'], condition=models.Q(program__isnull=True),
+                name='training_tr_unique_hub',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.hub_id} {self.grain} {self.period}: {self.enrolled}/{self.completed}/{self.failed}'
+
+
+class CohortRollup(HubBaseModel):
+    """
+    Enrollments grouped by the month they started, with how many completed
+    and how many completed within 7, 30 and 90 days of starting. Per program
+    and per hub (``program`` empty). Maintained by ``services.trends``.
+    """
+    program = models.ForeignKey(
+        'TrainingProgram', on_delete=models.CASCADE, null=True, blank=True, related_name='cohort_rollups',
+    )
+    cohort = models.DateField(verbose_name=_('Cohort'))
+    enrolled = models.IntegerField(default=0, verbose_name=_('Enrolled'))
+    completed = models.IntegerField(default=0, verbose_name=_('Completed'))
+    completed_7d = models.IntegerField(default=0, verbose_name=_('Completed Within 7 Days'))
+    completed_30d = models.IntegerField(default=0, verbose_name=_('Completed Within 30 Days'))
+    completed_90d = models.IntegerField(default=0, verbose_name=_('Completed Within 90 Days'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_cohortrollup'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hub_id', 'cohort', 'program'], condition=models.Q(program__isnull=False),
+                name='training_cr_unique_program',
+            ),
+            models.UniqueConstraint(
+                fields=['hub_id', 'cohort'], condition=models.Q(program__isnull=True),
+                name='training_cr_unique_hub',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.hub_id} {self.cohort:%Y-%m}: {self.completed}/{self.enrolled}'
+
+
+class TranscriptJob(HubBaseModel):
+    """
+    A batch of employee transcripts rendered into one ZIP archive. Run and
+    resumed by ``services.transcripts``.
+    """
+    format = models.CharField(max_length=4, default='html', verbose_name=_('Format'))  # html | pdf
+    employee_ids = models.JSONField(default=list, verbose_name=_('Employee Ids'))
+    # pending | running | done | failed
+    status = models.CharField(max_length=10, default='pending', verbose_name=_('Status'))
+    total = models.PositiveIntegerField(default=0, verbose_name=_('Total'))
+    rendered = models.PositiveIntegerField(default=0, verbose_name=_('Rendered'))
+    archive_path = models.CharField(max_length=500, blank=True, verbose_name=_('Archive Path'))
+    error = models.TextField(blank=True, verbose_name=_('Error'))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Finished At'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_transcriptjob'
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='training_tj_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.pk} {self.status} ({self.rendered}/{self.total})'
+
+    @property
+    def progress(self):
+        return round(self.rendered / self.total, 4) if self.total else None
+
+
+class TrainingSettings(HubBaseModel):
+    """
+    Per-hub tunables for the Training views. Read through
+    ``training.hub_settings``, which caches them; hubs without a row use the
+    defaults from the Django settings.
+    """
+    default_per_page = models.PositiveSmallIntegerField(default=12, verbose_name=_('Rows Per Page'))
+    # 0 exports every matching row
+    export_row_limit = models.PositiveIntegerField(default=0, verbose_name=_('Export Row Limit'))
+    # contains | prefix
+    search_mode = models.CharField(max_length=10, default='contains', verbose_name=_('Search Mode'))
+    default_status = models.CharField(max_length=20, default='enrolled', verbose_name=_('Default Status'))
+    # 0 keeps transcript archives forever
+    archive_retention_days = models.PositiveIntegerField(default=0, verbose_name=_('Archive Retention Days'))
+    count_cache_timeout = models.PositiveIntegerField(default=300, verbose_name=_('Count Cache TTL'))
+    facet_cache_timeout = models.PositiveIntegerField(default=300, verbose_name=_('Facet Cache TTL'))
+    leaderboard_cache_timeout = models.PositiveIntegerField(default=900, verbose_name=_('Leaderboard Cache TTL'))
+
+    class Meta(HubBaseModel.Meta):
+        db_table = 'training_trainingsettings'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hub_id'], condition=models.Q(is_deleted=False), name='training_tset_unique_hub',
+            ),
+        ]
+
+    def __str__(self):
+        return f'Training settings for {self.hub_id}'
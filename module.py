@@ -30,6 +30,7 @@ PERMISSIONS = [
 'training.change_trainingprogram',
 'training.delete_trainingprogram',
 'training.view_skill',
+'training.view_rollup',
 'training.manage_settings',
 ]
 
@@ -38,6 +39,7 @@ ROLE_PERMISSIONS = {
     "manager": [
         "add_trainingprogram",
         "change_trainingprogram",
+        "view_rollup",
         "view_skill",
         "view_trainingprogram",
     ],
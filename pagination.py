@@ -0,0 +1,128 @@
+"""
+Counting strategies for the Training list views.
+
+``Paginator`` runs an exact ``COUNT(*)`` on every request. ``CountingPaginator``
+instead:
+
+1. returns an exact count cached per (hub, filter) and invalidated through
+   the table's write version (see ``training.cache``);
+2. on PostgreSQL, asks the planner for a row estimate first and, above
+   ``TRAINING_COUNT_ESTIMATE_THRESHOLD``, uses the estimate instead of
+   counting. ``count_is_estimate`` tells the templates to render "about N".
+
+``EstimatingPaginator`` applies the estimate alone, for the admin.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .cache import make_key
+
+DEFAULT_ESTIMATE_THRESHOLD = 100_000
+DEFAULT_COUNT_TIMEOUT = 300
+
+
+def get_estimate_threshold():
+    return getattr(settings, 'TRAINING_COUNT_ESTIMATE_THRESHOLD', DEFAULT_ESTIMATE_THRESHOLD)
+
+
+def get_count_timeout():
+    return getattr(settings, 'TRAINING_COUNT_CACHE_TIMEOUT', DEFAULT_COUNT_TIMEOUT)
+
+
+def planner_estimate(queryset):
+    """Return the planner's row estimate for a queryset, or None if unsupported."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def round_estimate(value):
+    """Round an estimate to two significant digits (241873 -> 240000)."""
+    if value < 100:
+        return value
+    magnitude = 10 ** (len(str(value)) - 2)
+    return round(value / magnitude) * magnitude
+
+
+def count_cache_key(queryset, hub_id):
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    return make_key(hub_id, queryset.model._meta.model_name, 'count', sql, params)
+
+
+class CountingPaginator(Paginator):
+    """Paginator that caches exact counts and falls back to planner estimates."""
+
+    def __init__(self, object_list, per_page, hub_id=None, timeout=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.hub_id = hub_id
+        self.timeout = timeout
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+
+        key = count_cache_key(queryset, self.hub_id)
+        if key is None:
+            return 0
+        cached = cache.get(key)
+        if cached is not None:
+            self.count_is_estimate = cached['estimate']
+            return cached['count']
+
+        estimate = planner_estimate(queryset)
+        if estimate is not None and estimate >= get_estimate_threshold():
+            self.count_is_estimate = True
+            total = round_estimate(estimate)
+        else:
+            total = queryset.count()
+        cache.set(
+            key, {'count': total, 'estimate': self.count_is_estimate},
+            get_count_timeout() if self.timeout is None else self.timeout,
+        )
+        return total
+
+    async def acount(self):
+        """Resolve ``count`` from an async context; later reads are free."""
+        return await sync_to_async(getattr)(self, 'count')
+
+
+class EstimatingPaginator(Paginator):
+    """
+    Paginator for the Django admin: the planner estimate above
+    ``TRAINING_COUNT_ESTIMATE_THRESHOLD``, an exact count below it.
+
+    Nothing is cached, since admin querysets span hubs and the cache versions
+    are per hub.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, 'query'):
+            estimate = planner_estimate(queryset)
+            if estimate is not None and estimate >= get_estimate_threshold():
+                return round_estimate(estimate)
+        return super().count
@@ -0,0 +1,308 @@
+"""
+Optional hub partitioning of ``training_employeetraining`` on PostgreSQL.
+
+With ``TRAINING_ENROLLMENT_PARTITIONS = N`` (0, the default, keeps one
+plain table), migration 0012 or ``python manage.py
+training_partition_enrollments`` turns the enrollment table into a
+``PARTITION BY HASH (hub_id)`` table with N partitions. Every Training
+query filters on ``hub_id``, so the planner prunes to one partition and a
+small hub no longer walks the indexes of the giant ones; vacuum also works
+partition by partition.
+
+The conversion runs online, in steps that can be interrupted and resumed:
+
+1. create ``training_employeetraining_part`` and its partitions next to the
+   live table, plus a trigger that logs the id of every row written to the
+   live table from then on in ``training_employeetraining_changes``;
+2. copy rows over in primary-key order, ``batch_size`` rows per
+   transaction;
+3. build the live table's indexes and constraints on the copy;
+4. re-copy the logged rows, a batch per transaction, until the log is
+   nearly empty;
+5. lock the live table against writes (reads continue), re-copy the few
+   rows logged since, drop the live table and rename the copy into its
+   place.
+
+Only rows written during the conversion are revisited, so writes are
+blocked for the time it takes to apply the last handful of changes, not
+for a scan of the table. Writers pay for one extra index insert per row
+while the trigger is in place.
+
+PostgreSQL requires the partition key in every unique index, so the
+primary key becomes ``(id, hub_id)`` and ``hub_id`` must be set on every
+row. The database-level foreign keys that point at enrollments (from
+``TrainingHoursEntry.enrollment``) are dropped, with a warning, because a
+partitioned table cannot back them; Django still applies ``on_delete``
+itself. Future unique constraints on the table must include ``hub_id``.
+
+On other databases, or before PostgreSQL 11, nothing changes.
+"""
+import logging
+import re
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'training_employeetraining'
+STAGING = f'{TABLE}_part'
+CHANGES = f'{TABLE}_changes'
+CHANGE_TRIGGER = 'training_et_log_change'
+PARTITION = f'{TABLE}_p{{}}'
+STAGING_SUFFIX = '_p'
+DEFAULT_BATCH_SIZE = 5000
+
+_INDEX_DEF = re.compile(r'^CREATE (UNIQUE )?INDEX (\S+) ON (?:ONLY )?\S+ ')
+
+
+class PartitioningError(ValueError):
+    """The enrollment table cannot be partitioned in its current state."""
+
+
+def get_partition_count():
+    return getattr(settings, 'TRAINING_ENROLLMENT_PARTITIONS', 0)
+
+
+def supports_partitioning(connection):
+    return connection.vendor == 'postgresql' and connection.pg_version >= 110000
+
+
+def _relkind(cursor, table):
+    cursor.execute('SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)', [table])
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def is_partitioned(connection):
+    if not supports_partitioning(connection):
+        return False
+    with connection.cursor() as cursor:
+        return _relkind(cursor, TABLE) == 'p'
+
+
+def partition_names(connection):
+    """Partitions of the enrollment table (or of an unfinished copy)."""
+    if not supports_partitioning(connection):
+        return []
+    with connection.cursor() as cursor:
+        parent = TABLE if _relkind(cursor, TABLE) == 'p' else STAGING
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname',
+            [parent],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _columns(connection, cursor):
+    return [column.name for column in connection.introspection.get_table_description(cursor, TABLE)]
+
+
+def _install_change_log(cursor):
+    """Log the id of every row written to the live table from now on."""
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS {CHANGES} (id uuid PRIMARY KEY)')
+    cursor.execute(
+        f'CREATE OR REPLACE FUNCTION {CHANGE_TRIGGER}() RETURNS trigger AS $$ BEGIN '
+        f"IF TG_OP = 'DELETE' THEN INSERT INTO {CHANGES} (id) VALUES (OLD.id) ON CONFLICT DO NOTHING; "
+        f'ELSE INSERT INTO {CHANGES} (id) VALUES (NEW.id) ON CONFLICT DO NOTHING; END IF; '
+        f'RETURN NULL; END $$ LANGUAGE plpgsql'
+    )
+    cursor.execute(
+        'SELECT 1 FROM pg_trigger WHERE tgrelid = to_regclass(%s) AND tgname = %s', [TABLE, CHANGE_TRIGGER],
+    )
+    if not cursor.fetchone():
+        cursor.execute(
+            f'CREATE TRIGGER {CHANGE_TRIGGER} AFTER INSERT OR UPDATE OR DELETE ON {TABLE} '
+            f'FOR EACH ROW EXECUTE FUNCTION {CHANGE_TRIGGER}()'
+        )
+
+
+def _drop_change_log(cursor):
+    # The trigger went with the old table.
+    cursor.execute(f'DROP TABLE IF EXISTS {CHANGES}')
+    cursor.execute(f'DROP FUNCTION IF EXISTS {CHANGE_TRIGGER}()')
+
+
+def _create_staging(cursor, partitions, log):
+    if _relkind(cursor, STAGING) == 'p':
+        if _relkind(cursor, CHANGES) == 'r':
+            log(f'Resuming into the existing {STAGING}.')
+            return
+        # Writes made since this copy began were not logged; start it again.
+        cursor.execute(f'DROP TABLE {STAGING} CASCADE')
+        log(f'Discarded {STAGING}, which was started without a change log.')
+    # Log first, so every write after the copy reads a row is caught.
+    _install_change_log(cursor)
+    cursor.execute(
+        f'CREATE TABLE {STAGING} ('
+        f'LIKE {TABLE} INCLUDING DEFAULTS INCLUDING STORAGE, '
+        f'CONSTRAINT {STAGING}_pkey PRIMARY KEY (id, hub_id)'
+        f') PARTITION BY HASH (hub_id)'
+    )
+    for remainder in range(partitions):
+        cursor.execute(
+            f'CREATE TABLE {PARTITION.format(remainder)} PARTITION OF {STAGING} '
+            f'FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})'
+        )
+    log(f'Created {STAGING} with {partitions} hash partitions.')
+
+
+def _copy_batches(connection, columns, batch_size, log):
+    """Copy rows in id order, one transaction per batch; returns the rows copied."""
+    listed = ', '.join(columns)
+    copied = 0
+    with connection.cursor() as cursor:
+        # uuid has no max() aggregate; the primary key index answers this directly.
+        cursor.execute(f'SELECT id FROM {STAGING} ORDER BY id DESC LIMIT 1')
+        row = cursor.fetchone()
+        last_id = row[0] if row else None
+    while True:
+        after, params = ('', []) if last_id is None else ('WHERE id > %s ', [last_id])
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {STAGING} ({listed}) '
+                f'SELECT {listed} FROM {TABLE} {after}ORDER BY id LIMIT %s '
+                f'ON CONFLICT DO NOTHING RETURNING id',
+                [*params, batch_size],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return copied
+        copied += len(ids)
+        last_id = max(ids)
+        log(f'Copied {copied} rows.')
+
+
+def _copy_indexes(cursor):
+    """Recreate the live table's secondary indexes on the copy under ``<name>_p``."""
+    cursor.execute(
+        'SELECT i.relname, pg_get_indexdef(x.indexrelid) FROM pg_index x '
+        'JOIN pg_class i ON i.oid = x.indexrelid '
+        'WHERE x.indrelid = to_regclass(%s) AND NOT x.indisprimary',
+        [TABLE],
+    )
+    names = []
+    for name, definition in cursor.fetchall():
+        match = _INDEX_DEF.match(definition)
+        unique = match.group(1) or ''
+        staged = f'{name}{STAGING_SUFFIX}'
+        cursor.execute(
+            f'CREATE {unique}INDEX IF NOT EXISTS {staged} ON {STAGING} {definition[match.end():]}'
+        )
+        names.append(name)
+    return names
+
+
+def _copy_constraints(cursor):
+    """Recreate outgoing foreign keys and check constraints on the copy."""
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype IN ('f', 'c')",
+        [TABLE],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute('SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s)', [STAGING])
+    existing = {row[0] for row in cursor.fetchall()}
+    names = []
+    for name, definition in constraints:
+        staged = f'{name}{STAGING_SUFFIX}'
+        if staged not in existing:
+            cursor.execute(f'ALTER TABLE {STAGING} ADD CONSTRAINT {staged} {definition}')
+        names.append(name)
+    return names
+
+
+def _apply_changes(connection, columns, batch_size, drain=False):
+    """
+    Re-copy the rows logged as written since the copy began, one transaction
+    per batch. Stops at the first partial batch, or once the log is empty
+    when ``drain`` is set. Returns the rows applied.
+    """
+    listed = ', '.join(columns)
+    applied = 0
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {CHANGES} WHERE id IN (SELECT id FROM {CHANGES} LIMIT %s) RETURNING id',
+                [batch_size],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            if ids:
+                # A row rewritten meanwhile is logged again and revisited.
+                cursor.execute(f'DELETE FROM {STAGING} WHERE id = ANY(%s)', [ids])
+                cursor.execute(f'INSERT INTO {STAGING} ({listed}) SELECT {listed} FROM {TABLE} WHERE id = ANY(%s)', [ids])
+        applied += len(ids)
+        if not ids or (not drain and len(ids) < batch_size):
+            return applied
+
+
+def _drop_incoming_foreign_keys(cursor, log):
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+        "WHERE confrelid = to_regclass(%s) AND contype = 'f'",
+        [TABLE],
+    )
+    for table, name in cursor.fetchall():
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+        message = f'Dropped foreign key {name} on {table}; a partitioned {TABLE} cannot back it.'
+        logger.warning(message)
+        log(message)
+
+
+def _swap(cursor, indexes, constraints):
+    cursor.execute(f'DROP TABLE {TABLE}')
+    cursor.execute(f'ALTER TABLE {STAGING} RENAME TO {TABLE}')
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME CONSTRAINT {STAGING}_pkey TO {TABLE}_pkey')
+    for name in indexes:
+        cursor.execute(f'ALTER INDEX {name}{STAGING_SUFFIX} RENAME TO {name}')
+    for name in constraints:
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME CONSTRAINT {name}{STAGING_SUFFIX} TO {name}')
+
+
+def partition_enrollments(connection, partitions=None, batch_size=DEFAULT_BATCH_SIZE, log=None):
+    """
+    Convert the enrollment table to ``partitions`` hash partitions by hub.
+
+    Returns True when the table was converted, False when there was nothing
+    to do (not PostgreSQL, partitioning off, or already partitioned). Must
+    run outside a transaction so each batch commits on its own.
+    """
+    log = log or (lambda message: None)
+    partitions = partitions or get_partition_count()
+    if not partitions or not supports_partitioning(connection):
+        return False
+    with connection.cursor() as cursor:
+        if _relkind(cursor, TABLE) == 'p':
+            return False
+        cursor.execute(f'SELECT 1 FROM {TABLE} WHERE hub_id IS NULL LIMIT 1')
+        if cursor.fetchone():
+            raise PartitioningError(
+                f'{TABLE} has rows without a hub_id; assign or delete them before partitioning.'
+            )
+        columns = _columns(connection, cursor)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        _create_staging(cursor, partitions, log)
+
+    _copy_batches(connection, columns, batch_size, log)
+
+    with connection.cursor() as cursor:
+        indexes = _copy_indexes(cursor)
+        constraints = _copy_constraints(cursor)
+    log(f'Built {len(indexes)} indexes and {len(constraints)} constraints on the copy.')
+
+    applied = _apply_changes(connection, columns, batch_size)
+    log(f'Applied {applied} rows written during the copy.')
+
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            # EXCLUSIVE blocks writes but not reads while the last changes are applied.
+            cursor.execute(f'LOCK TABLE {TABLE} IN EXCLUSIVE MODE')
+        applied = _apply_changes(connection, columns, batch_size, drain=True)
+        with connection.cursor() as cursor:
+            _drop_incoming_foreign_keys(cursor, log)
+            _swap(cursor, indexes, constraints)
+            _drop_change_log(cursor)
+    log(f'Applied {applied} rows under the lock.')
+    log(f'{TABLE} is now partitioned by hub.')
+    return True
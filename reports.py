@@ -0,0 +1,138 @@
+"""
+Cross-hub rollup reporting for the Training module.
+
+Each hub's aggregates come from one indexed aggregate query and are cached
+per hub against the enrollment and program write versions, so a report over
+many hubs only recomputes the hubs that changed. Uncached hubs run
+concurrently in a bounded thread pool, and results are yielded as soon as
+each hub finishes so the view can stream them.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Q, Sum
+from django.utils.module_loading import import_string
+
+from .cache import get_version, make_key
+from .models import EmployeeTraining
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_ROLLUP_TIMEOUT = 900
+
+
+def get_max_workers():
+    return getattr(settings, 'TRAINING_ROLLUP_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+
+
+def get_rollup_timeout():
+    return getattr(settings, 'TRAINING_ROLLUP_CACHE_TIMEOUT', DEFAULT_ROLLUP_TIMEOUT)
+
+
+def allowed_hub_ids(request):
+    """
+    Return the hubs the current user may include in a rollup.
+
+    ``TRAINING_ROLLUP_HUBS_RESOLVER`` names a ``callable(request)`` returning
+    hub ids (e.g. a regional manager's hubs). Without it only the session hub
+    is allowed.
+    """
+    resolver = getattr(settings, 'TRAINING_ROLLUP_HUBS_RESOLVER', None)
+    if resolver:
+        return [str(hub_id) for hub_id in import_string(resolver)(request)]
+    hub_id = request.session.get('hub_id')
+    return [str(hub_id)] if hub_id else []
+
+
+def _rollup_key(hub_id):
+    return make_key(hub_id, 'employeetraining', 'rollup', get_version(hub_id, 'trainingprogram'))
+
+
+def compute_hub_aggregates(hub_id):
+    """Compute one hub's totals, completion, mandatory compliance and average score."""
+    mandatory = Q(program__is_mandatory=True)
+    completed = Q(status='completed')
+    row = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=completed),
+        mandatory_total=Count('id', filter=mandatory),
+        mandatory_completed=Count('id', filter=mandatory & completed),
+        scored=Count('score'),
+        score_total=Sum('score'),
+    )
+    row['hub_id'] = str(hub_id)
+    return _with_rates(row)
+
+
+def _with_rates(row):
+    row['completion_rate'] = _ratio(row['completed'], row['total'])
+    row['mandatory_compliance'] = _ratio(row['mandatory_completed'], row['mandatory_total'])
+    row['average_score'] = None
+    if row['scored']:
+        row['average_score'] = (Decimal(row['score_total']) / row['scored']).quantize(Decimal('0.01'))
+    return row
+
+
+def _ratio(part, whole):
+    if not whole:
+        return None
+    return round(part / whole, 4)
+
+
+def get_hub_aggregates(hub_id):
+    """Return one hub's aggregates, from the cache when nothing changed."""
+    key = _rollup_key(hub_id)
+    row = cache.get(key)
+    if row is None:
+        row = compute_hub_aggregates(hub_id)
+        cache.set(key, row, get_rollup_timeout())
+    return row
+
+
+def _compute_in_thread(hub_id):
+    try:
+        return get_hub_aggregates(hub_id)
+    finally:
+        # Worker threads open their own connections; don't leak them.
+        connections.close_all()
+
+
+def iter_hub_aggregates(hub_ids, max_workers=None):
+    """
+    Yield per-hub aggregates as they become available.
+
+    Cached hubs are yielded first without touching the pool; the rest run in
+    at most ``max_workers`` threads and are yielded in completion order.
+    """
+    max_workers = get_max_workers() if max_workers is None else max_workers
+    pending = []
+    for hub_id in hub_ids:
+        row = cache.get(_rollup_key(hub_id))
+        if row is None:
+            pending.append(hub_id)
+        else:
+            yield row
+
+    if max_workers <= 1:
+        for hub_id in pending:
+            yield get_hub_aggregates(hub_id)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending) or 1)) as pool:
+        futures = [pool.submit(_compute_in_thread, hub_id) for hub_id in pending]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def merge_aggregates(rows):
+    """Merge per-hub aggregates into one report row."""
+    fields = ('total', 'completed', 'mandatory_total', 'mandatory_completed', 'scored')
+    merged = {'hubs': 0, 'score_total': Decimal('0'), **{field: 0 for field in fields}}
+    for row in rows:
+        merged['hubs'] += 1
+        for field in fields:
+            merged[field] += row[field]
+        merged['score_total'] += row['score_total'] or 0
+    return _with_rates(merged)
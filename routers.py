@@ -0,0 +1,153 @@
+"""
+Read-replica routing for the Training module.
+
+Read-only paths (list views, the dashboard, exports, search pickers and the
+assistant read tools) run inside ``read_replica()``, which points this
+module's reads at ``TRAINING_READ_REPLICA`` for the duration of the call.
+Everything else, including all writes, stays on the primary.
+
+A path falls back to the primary when any table it reads was written
+through this module within ``TRAINING_REPLICA_LAG_SECONDS``, using the
+per-table write stamps in ``training.cache``. A request that follows a
+write, such as the list shown right after ``employee_training_edit``,
+therefore reads its own write even if the replica has not caught up.
+
+Enable it by adding ``'training.routers.TrainingReplicaRouter'`` to
+``DATABASE_ROUTERS`` and naming the replica alias in ``TRAINING_READ_REPLICA``.
+"""
+import datetime
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from .cache import get_last_modified
+
+APP_LABEL = 'training'
+DEFAULT_REPLICA_LAG_SECONDS = 5
+
+_read_alias = ContextVar('training_read_alias', default=None)
+
+
+def get_replica_alias():
+    alias = getattr(settings, 'TRAINING_READ_REPLICA', None)
+    return alias if alias in connections.settings else None
+
+
+def get_replica_lag():
+    return getattr(settings, 'TRAINING_REPLICA_LAG_SECONDS', DEFAULT_REPLICA_LAG_SECONDS)
+
+
+def _recently_written(hub_id, tables):
+    threshold = timezone.now() - datetime.timedelta(seconds=get_replica_lag())
+    for table in tables:
+        modified = get_last_modified(hub_id, table)
+        if modified is not None and modified >= threshold:
+            return True
+    return False
+
+
+def replica_alias_for(hub_id, tables):
+    """The alias reads of ``tables`` may use right now, or None for the primary."""
+    alias = get_replica_alias()
+    if alias is None or _recently_written(hub_id, tables):
+        return None
+    return alias
+
+
+@contextmanager
+def read_replica(hub_id, tables):
+    """Route this module's reads to the replica while the block runs, if safe."""
+    token = _read_alias.set(replica_alias_for(hub_id, tables))
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def primary():
+    """Pin this module's reads to the primary while the block runs."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def routed_stream(iterable):
+    """
+    Iterate ``iterable`` with this module's reads routed as they are now.
+
+    A streamed response is consumed after its view, and the view's
+    ``replica_reads``, has returned; wrapping the stream keeps its reads on
+    the alias the view was given. The alias is set around each pull rather
+    than once, since the async views pull every chunk in a fresh context.
+    """
+    alias = _read_alias.get()
+    iterator = iter(iterable)
+    done = object()
+
+    def pull():
+        while True:
+            token = _read_alias.set(alias)
+            try:
+                item = next(iterator, done)
+            finally:
+                _read_alias.reset(token)
+            if item is done:
+                return
+            yield item
+    return pull()
+
+
+def replica_reads(*tables):
+    """Run a GET view's reads of ``tables`` on the replica when it is safe to."""
+    def decorator(view):
+        def routed(request):
+            if request.method not in ('GET', 'HEAD'):
+                return primary()
+            return read_replica(request.session.get('hub_id'), tables)
+
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                with routed(request):
+                    return await view(request, *args, **kwargs)
+        else:
+            @functools.wraps(view)
+            def wrapper(request, *args, **kwargs):
+                with routed(request):
+                    return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TrainingReplicaRouter:
+    """Send Training reads to the alias chosen by ``read_replica()``."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == APP_LABEL:
+            return _read_alias.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Never let an instance that was read from the replica save back to it.
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == get_replica_alias():
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._meta.app_label == APP_LABEL and obj2._meta.app_label == APP_LABEL:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if app_label == APP_LABEL and db == getattr(settings, 'TRAINING_READ_REPLICA', None):
+            return False
+        return None
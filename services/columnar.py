@@ -0,0 +1,205 @@
+"""
+Columnar Parquet and Arrow exports for analytics pipelines.
+
+Enrollments, programs and skills are exported as Parquet files or Arrow IPC
+streams with typed columns: UUIDs, dates, UTC timestamps, decimals with the
+model's precision, booleans and integers. Low-cardinality text columns
+(enrollment status and program name, skill category) are dictionary-encoded.
+
+Rows are read with ``values_list(...).iterator()`` in batches of
+``TRAINING_COLUMNAR_BATCH_SIZE`` and every batch is written out as soon as
+it is full (one Parquet row group or one IPC record batch), so memory stays
+bounded whatever the table size. ``write_columnar`` writes to a path or
+file object (``training_export_columnar``), and ``stream_columnar`` yields
+the bytes of each batch for a ``StreamingHttpResponse`` (the list views'
+``?export=parquet|arrow``).
+
+Both formats are compressed with ``TRAINING_COLUMNAR_COMPRESSION`` (zstd).
+Arrow exports use the IPC *stream* format, so each batch can carry its own
+dictionaries. The ``pyarrow`` package is optional and imported on first use.
+"""
+import importlib.util
+import itertools
+
+from django.conf import settings
+
+from ..models import EmployeeTraining, Skill, TrainingProgram
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+COLUMNAR_EXTENSIONS = {'parquet': 'parquet', 'arrow': 'arrows'}
+COLUMNAR_CONTENT_TYPES = {
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_COMPRESSION = 'zstd'
+
+# table -> (model, exported fields, dictionary-encoded fields)
+COLUMNAR_TABLES = {
+    'employeetraining': (
+        EmployeeTraining,
+        ['id', 'hub_id', 'employee_id', 'employee_name', 'program_id', 'program_name', 'status',
+         'start_date', 'completion_date', 'score', 'created_at', 'updated_at'],
+        {'program_name', 'status'},
+    ),
+    'trainingprogram': (
+        TrainingProgram,
+        ['id', 'hub_id', 'name', 'description', 'duration_hours', 'is_mandatory', 'is_active',
+         'enrollment_count', 'in_progress_count', 'completed_count', 'created_at', 'updated_at'],
+        set(),
+    ),
+    'skill': (
+        Skill,
+        ['id', 'hub_id', 'name', 'category', 'is_active', 'created_at', 'updated_at'],
+        {'category'},
+    ),
+}
+
+
+def arrow_available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def get_batch_size():
+    return getattr(settings, 'TRAINING_COLUMNAR_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+
+def get_compression():
+    return getattr(settings, 'TRAINING_COLUMNAR_COMPRESSION', DEFAULT_COMPRESSION)
+
+
+def _pyarrow():
+    if not arrow_available():
+        raise ValueError('Columnar exports require the pyarrow package.')
+    import pyarrow
+    return pyarrow
+
+
+def _uuid_type(pa):
+    # pyarrow 18+ has a UUID extension type (the Parquet UUID logical type).
+    return pa.uuid() if hasattr(pa, 'uuid') else pa.binary(16)
+
+
+def _arrow_type(pa, model_field, dictionary):
+    if model_field.is_relation:
+        model_field = model_field.target_field
+    kind = model_field.get_internal_type()
+    if kind == 'UUIDField':
+        return _uuid_type(pa)
+    if kind in ('CharField', 'TextField'):
+        return pa.dictionary(pa.int32(), pa.string()) if dictionary else pa.string()
+    if kind == 'DateTimeField':
+        return pa.timestamp('us', tz='UTC')
+    if kind == 'DateField':
+        return pa.date32()
+    if kind == 'DecimalField':
+        return pa.decimal128(model_field.max_digits, model_field.decimal_places)
+    if kind == 'BooleanField':
+        return pa.bool_()
+    if kind.endswith('IntegerField'):
+        return pa.int64()
+    raise ValueError(f'No columnar type for {model_field.name} ({kind}).')
+
+
+def columnar_schema(table):
+    """The Arrow schema of ``table``'s export."""
+    pa = _pyarrow()
+    model, fields, dictionary = COLUMNAR_TABLES[table]
+    columns = []
+    for name in fields:
+        model_field = model._meta.get_field(name)
+        columns.append(pa.field(name, _arrow_type(pa, model_field, name in dictionary), nullable=model_field.null))
+    return pa.schema(columns)
+
+
+def _column(pa, values, field):
+    if field.type == _uuid_type(pa):
+        storage = pa.array([value.bytes if value is not None else None for value in values], pa.binary(16))
+        return storage if field.type == storage.type else pa.ExtensionArray.from_storage(field.type, storage)
+    if pa.types.is_dictionary(field.type):
+        return pa.array(values, field.type.value_type).dictionary_encode()
+    return pa.array(values, field.type)
+
+
+def record_batch(schema, rows):
+    """One ``RecordBatch`` from ``values_list`` tuples in schema order."""
+    pa = _pyarrow()
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.record_batch([_column(pa, values, field) for values, field in zip(columns, schema)], schema=schema)
+
+
+def iter_batches(table, queryset, batch_size=None):
+    """Yield ``queryset`` as record batches of at most ``batch_size`` rows."""
+    schema = columnar_schema(table)
+    batch_size = batch_size or get_batch_size()
+    rows = queryset.values_list(*schema.names).iterator(chunk_size=batch_size)
+    while True:
+        chunk = list(itertools.islice(rows, batch_size))
+        if not chunk:
+            return
+        yield record_batch(schema, chunk)
+
+
+def columnar_writer(fmt, sink, schema):
+    """A Parquet or Arrow stream writer for ``schema`` on ``sink``."""
+    _pyarrow()
+    if fmt == 'parquet':
+        from pyarrow import parquet
+        return parquet.ParquetWriter(sink, schema, compression=get_compression())
+    if fmt == 'arrow':
+        from pyarrow import ipc
+        return ipc.new_stream(sink, schema, options=ipc.IpcWriteOptions(compression=get_compression()))
+    raise ValueError(f'Unknown columnar format: {fmt}')
+
+
+def write_columnar(table, queryset, sink, fmt='parquet', batch_size=None):
+    """Write ``queryset`` to ``sink`` (a path or binary file); returns the row count."""
+    writer = columnar_writer(fmt, sink, columnar_schema(table))
+    total = 0
+    try:
+        for batch in iter_batches(table, queryset, batch_size):
+            writer.write_batch(batch)
+            total += batch.num_rows
+    finally:
+        writer.close()
+    return total
+
+
+class _Spool:
+    """Write-only file object whose contents are taken as they are written."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_columnar(table, queryset, fmt='parquet', batch_size=None):
+    """Yield the bytes of the export of ``queryset`` as each batch is written."""
+    spool = _Spool()
+    writer = columnar_writer(fmt, spool, columnar_schema(table))
+    for batch in iter_batches(table, queryset, batch_size):
+        writer.write_batch(batch)
+        yield spool.take()
+    writer.close()
+    yield spool.take()
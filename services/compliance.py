@@ -0,0 +1,175 @@
+"""
+Batch compliance lookups for other modules.
+
+Scheduling, POS and other modules ask "is this employee certified for
+program X" or "for every mandatory program" before assigning work::
+
+    from training.services.compliance import compliance
+
+    status = compliance(hub_id, employee_ids)              # all mandatory programs
+    status = compliance(hub_id, employee_ids, program_id)  # one program
+    status[employee_id]['compliant']
+
+An employee is certified for a program while their latest completed
+enrollment is less than ``TRAINING_CERTIFICATION_VALID_DAYS`` old (a
+completion without a date never expires).
+
+Each employee's latest completion per program is cached per hub, keyed on
+the enrollment and program write versions, so any enrollment or program
+write invalidates it. A batch is one ``cache.get_many`` covering the
+employees and the hub's mandatory programs; only the misses are read, in
+one query per table, and written back with ``set_many``. Expiry is worked
+out at read time, so cached entries never go stale with the calendar.
+"""
+import datetime
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..cache import get_version, make_key, make_keys
+from ..models import EmployeeTraining, TrainingProgram
+from .reminders import DEFAULT_VALID_DAYS
+
+DEFAULT_COMPLIANCE_TIMEOUT = 3600
+
+
+def get_valid_days():
+    return getattr(settings, 'TRAINING_CERTIFICATION_VALID_DAYS', DEFAULT_VALID_DAYS)
+
+
+def get_compliance_timeout():
+    return getattr(settings, 'TRAINING_COMPLIANCE_CACHE_TIMEOUT', DEFAULT_COMPLIANCE_TIMEOUT)
+
+
+def _normalize(employee_ids):
+    return list(dict.fromkeys(str(uuid.UUID(str(employee_id))) for employee_id in employee_ids))
+
+
+def _completion_keys(hub_id, employee_ids, program_version):
+    return make_keys(
+        hub_id, 'employeetraining', 'compliance',
+        [(employee_id, program_version) for employee_id in employee_ids],
+    )
+
+
+def _mandatory_key(hub_id):
+    return make_key(hub_id, 'trainingprogram', 'mandatory')
+
+
+def _load_completions(hub_id, employee_ids):
+    """Latest completion date per (employee, program), as ISO strings, for ``employee_ids``."""
+    rows = (
+        EmployeeTraining.objects.filter(
+            hub_id=hub_id, employee_id__in=employee_ids, is_deleted=False,
+            status='completed', program__is_deleted=False,
+        )
+        .values_list('employee_id', 'program_id', 'completion_date')
+        .order_by()
+    )
+    completions = {employee_id: {} for employee_id in employee_ids}
+    for employee_id, program_id, completed_on in rows:
+        programs = completions[str(employee_id)]
+        program_id = str(program_id)
+        completed_on = completed_on.isoformat() if completed_on else ''
+        current = programs.get(program_id)
+        # A completion without a date never expires, so it beats any dated one.
+        if current is None or completed_on == '' or (current != '' and completed_on > current):
+            programs[program_id] = completed_on
+    return completions
+
+
+def _load_mandatory(hub_id):
+    return [
+        str(program_id) for program_id in TrainingProgram.objects.filter(
+            hub_id=hub_id, is_deleted=False, is_active=True, is_mandatory=True,
+        ).values_list('id', flat=True).order_by('name')
+    ]
+
+
+def completions(hub_id, employee_ids, with_mandatory=False):
+    """
+    Latest completion per program for each employee, from the cache.
+
+    Returns ``{employee_id: {program_id: 'YYYY-MM-DD' or ''}}``, plus the
+    hub's mandatory program ids when ``with_mandatory`` is set.
+    """
+    employee_ids = _normalize(employee_ids)
+    program_version = get_version(hub_id, 'trainingprogram')
+    keys = dict(zip(_completion_keys(hub_id, employee_ids, program_version), employee_ids))
+    mandatory_key = _mandatory_key(hub_id)
+    cached = cache.get_many([*keys, mandatory_key] if with_mandatory else list(keys))
+
+    result = {keys[key]: value for key, value in cached.items() if key in keys}
+    missing = [employee_id for employee_id in employee_ids if employee_id not in result]
+    if missing:
+        loaded = _load_completions(hub_id, missing)
+        result.update(loaded)
+        cache.set_many(
+            {key: loaded[employee_id] for key, employee_id in keys.items() if employee_id in loaded},
+            get_compliance_timeout(),
+        )
+    if not with_mandatory:
+        return result
+    mandatory = cached.get(mandatory_key)
+    if mandatory is None:
+        mandatory = _load_mandatory(hub_id)
+        cache.set(mandatory_key, mandatory, get_compliance_timeout())
+    return result, mandatory
+
+
+def _expires_on(completed_on, valid_days):
+    if completed_on == '':
+        return None
+    return datetime.date.fromisoformat(completed_on) + datetime.timedelta(days=valid_days)
+
+
+def compliance(hub_id, employee_ids, program_id=None, today=None):
+    """
+    Certification status for a batch of employees.
+
+    Checks ``program_id`` if given, otherwise every active mandatory program
+    of the hub. Returns, per employee id (as a string)::
+
+        {'compliant': bool, 'missing': [program_id, ...], 'expires_on': date or None}
+
+    ``expires_on`` is the earliest expiry among the required programs.
+    """
+    today = today or timezone.localdate()
+    valid_days = get_valid_days()
+    if program_id is None:
+        completed, required = completions(hub_id, employee_ids, with_mandatory=True)
+    else:
+        completed, required = completions(hub_id, employee_ids), [str(program_id)]
+
+    status = {}
+    for employee_id, programs in completed.items():
+        missing, expiries = [], []
+        for required_id in required:
+            if required_id not in programs:
+                missing.append(required_id)
+                continue
+            expires_on = _expires_on(programs[required_id], valid_days)
+            if expires_on is None:
+                continue
+            if expires_on <= today:
+                missing.append(required_id)
+            else:
+                expiries.append(expires_on)
+        status[employee_id] = {
+            'compliant': not missing,
+            'missing': missing,
+            'expires_on': min(expiries) if expiries and not missing else None,
+        }
+    return status
+
+
+def is_certified(hub_id, employee_id, program_id, today=None):
+    """Whether one employee currently holds a certification for ``program_id``."""
+    return compliance(hub_id, [employee_id], program_id, today)[str(uuid.UUID(str(employee_id)))]['compliant']
+
+
+def is_compliant(hub_id, employee_id, today=None):
+    """Whether one employee is certified for every mandatory program."""
+    return compliance(hub_id, [employee_id], today=today)[str(uuid.UUID(str(employee_id)))]['compliant']
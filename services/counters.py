@@ -0,0 +1,134 @@
+"""
+Denormalized enrollment counters on ``TrainingProgram``.
+
+Every live enrollment adds 1 to its program's ``enrollment_count`` and, while
+its status is ``in_progress`` or ``completed``, 1 to the matching counter.
+When an enrollment is saved or deleted, the counts of its previous state are
+subtracted and those of its new state added with ``F()`` increments, so the
+programs list can show, sort and filter by popularity and completion rate
+without joining ``EmployeeTraining``.
+
+Queryset ``update()`` calls bypass signals; callers subtract the affected
+rows first with ``remove_enrollment_counters``. ``reconcile_counters``
+recounts from the enrollments and repairs any drift; it is what
+``training_reconcile_counters`` runs.
+"""
+import uuid
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast
+
+from ..cache import bump_version
+from ..models import PROGRAM_COUNTER_FIELDS, EmployeeTraining, TrainingProgram
+
+STATUS_COUNTERS = {'in_progress': 'in_progress_count', 'completed': 'completed_count'}
+
+
+def _program_id(value):
+    # Views assign raw POST strings; compare ids in one form.
+    return uuid.UUID(str(value)) if value is not None else None
+
+
+def counts(state):
+    """``(program_id, Counter)`` for the counters a stored enrollment adds to."""
+    if state is None or state['is_deleted'] or state['program_id'] is None:
+        return None, Counter()
+    added = Counter(enrollment_count=1)
+    if state['status'] in STATUS_COUNTERS:
+        added[STATUS_COUNTERS[state['status']]] += 1
+    return _program_id(state['program_id']), added
+
+
+def _update(program_id, deltas):
+    TrainingProgram.all_objects.filter(pk=program_id).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def apply_counters(before, after):
+    """Move an enrollment's counts from state ``before`` to state ``after``."""
+    changes = defaultdict(Counter)
+    for state, sign in ((before, -1), (after, 1)):
+        program_id, added = counts(state)
+        if program_id is not None:
+            changes[program_id].update({field: sign * value for field, value in added.items()})
+    updates = []
+    for program_id, deltas in changes.items():
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            updates.append((program_id, deltas))
+    if not updates:
+        return
+    # A stable order keeps concurrent writers from locking rows in opposite orders.
+    updates.sort(key=lambda update: str(update[0]))
+    with transaction.atomic():
+        for program_id, deltas in updates:
+            _update(program_id, deltas)
+    hub_id = (after or before)['hub_id']
+    bump_version(hub_id, TrainingProgram._meta.model_name)
+
+
+def _grouped(queryset, *extra):
+    """Counter values per program for the live enrollments of ``queryset``."""
+    return (
+        queryset.filter(is_deleted=False).exclude(program_id=None)
+        .values('program_id', *extra)
+        .annotate(
+            enrollment_count=Count('pk'),
+            **{field: Count('pk', filter=Q(status=status)) for status, field in STATUS_COUNTERS.items()},
+        )
+        .order_by('program_id')
+    )
+
+
+def remove_enrollment_counters(queryset):
+    """Subtract enrollments that are about to be removed by a queryset ``update()``."""
+    hub_ids = set()
+    with transaction.atomic():
+        for row in _grouped(queryset, 'hub_id'):
+            _update(row['program_id'], {field: -row[field] for field in PROGRAM_COUNTER_FIELDS if row[field]})
+            hub_ids.add(row['hub_id'])
+    for hub_id in hub_ids:
+        bump_version(hub_id, TrainingProgram._meta.model_name)
+
+
+def reconcile_counters(hub_id=None):
+    """
+    Recount the counters of every program (of ``hub_id``, if given) and fix
+    those that drifted. Returns the number of programs corrected.
+    """
+    enrollments = EmployeeTraining.objects.all()
+    programs = TrainingProgram.all_objects.all()
+    if hub_id is not None:
+        enrollments = enrollments.filter(hub_id=hub_id)
+        programs = programs.filter(hub_id=hub_id)
+    actual = {row['program_id']: row for row in _grouped(enrollments)}
+
+    fixed = 0
+    for program_id, program_hub, *stored in list(programs.values_list('pk', 'hub_id', *PROGRAM_COUNTER_FIELDS)):
+        expected = [actual.get(program_id, {}).get(field, 0) for field in PROGRAM_COUNTER_FIELDS]
+        if stored == expected:
+            continue
+        with transaction.atomic():
+            # Recount under the row lock so increments racing the scan are not lost.
+            TrainingProgram.all_objects.select_for_update().filter(pk=program_id).first()
+            row = _grouped(EmployeeTraining.objects.filter(program_id=program_id)).first() or {}
+            TrainingProgram.all_objects.filter(pk=program_id).update(
+                **{field: row.get(field, 0) for field in PROGRAM_COUNTER_FIELDS}
+            )
+        bump_version(program_hub, TrainingProgram._meta.model_name)
+        fixed += 1
+    return fixed
+
+
+def with_completion_ratio(queryset):
+    """Annotate ``completion_ratio`` (0 to 1) for sorting and filtering programs."""
+    return queryset.annotate(
+        completion_ratio=Case(
+            When(enrollment_count__gt=0, then=Cast('completed_count', FloatField()) / F('enrollment_count')),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    )
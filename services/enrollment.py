@@ -0,0 +1,122 @@
+"""
+Idempotent enrollment.
+
+A partial unique constraint allows at most one *active* enrollment per
+(hub, employee, program): not soft-deleted and not in a closed status.
+``enroll_employee`` inserts inside a savepoint and, if a concurrent request
+won the race, returns the row that request created. Double-clicks and
+retried assistant calls therefore never produce duplicates, and no table
+lock is taken.
+
+``soft_delete_enrollments`` and ``complete_enrollments`` change a queryset
+of enrollments in primary-key chunks of ``TRAINING_BULK_CHUNK_SIZE`` rows,
+one transaction per chunk, so bulk actions over a whole hub neither load
+every row nor hold their locks for the whole run.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ..cache import bump_version
+from ..models import CLOSED_STATUSES, EmployeeTraining
+from .counters import remove_enrollment_counters
+from .hours import remove_enrollment_hours
+from .trends import remove_enrollment_trends
+
+MAX_ATTEMPTS = 3
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+
+def get_bulk_chunk_size():
+    return getattr(settings, 'TRAINING_BULK_CHUNK_SIZE', DEFAULT_BULK_CHUNK_SIZE)
+
+
+def active_enrollments(hub_id, employee_id, program_id):
+    """Enrollments counted by the unique active-enrollment constraint."""
+    return EmployeeTraining.objects.filter(
+        hub_id=hub_id, employee_id=employee_id, program_id=program_id, is_deleted=False,
+    ).exclude(status__in=CLOSED_STATUSES)
+
+
+def enroll_employee(program, employee_id, employee_name, status='enrolled', **fields):
+    """
+    Return ``(enrollment, created)`` for an employee in ``program``.
+
+    The enrollment belongs to the program's hub. Closed statuses (e.g. an
+    already completed training being recorded) are always inserted, since
+    the constraint only covers active rows.
+    """
+    def create():
+        return EmployeeTraining.objects.create(
+            hub_id=program.hub_id, employee_id=employee_id, employee_name=employee_name,
+            program=program, status=status, **fields,
+        )
+
+    if status in CLOSED_STATUSES:
+        return create(), True
+
+    for _ in range(MAX_ATTEMPTS):
+        existing = active_enrollments(program.hub_id, employee_id, program.pk).first()
+        if existing is not None:
+            return existing, False
+        try:
+            with transaction.atomic():
+                return create(), True
+        except IntegrityError:
+            # Another request inserted the same active enrollment; re-read it.
+            continue
+    return active_enrollments(program.hub_id, employee_id, program.pk).get(), False
+
+
+def _chunks(queryset, chunk_size):
+    """Yield ``[(pk, hub_id), ...]`` of the live rows of ``queryset`` in key order."""
+    rows = queryset.filter(is_deleted=False).order_by('pk').values_list('pk', 'hub_id')
+    last = None
+    while True:
+        chunk = list((rows if last is None else rows.filter(pk__gt=last))[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1][0]
+
+
+def soft_delete_enrollments(queryset, chunk_size=None):
+    """Soft-delete the live enrollments of ``queryset``; returns the rows removed."""
+    removed = 0
+    for chunk in _chunks(queryset, chunk_size or get_bulk_chunk_size()):
+        by_hub = defaultdict(list)
+        for pk, hub_id in chunk:
+            by_hub[hub_id].append(pk)
+        now = timezone.now()
+        with transaction.atomic():
+            rows = EmployeeTraining.objects.filter(pk__in=[pk for pk, _ in chunk], is_deleted=False)
+            # Queryset updates skip the signals; take the rows out of the rollups first.
+            remove_enrollment_trends(rows)
+            remove_enrollment_counters(rows)
+            removed += rows.update(is_deleted=True, deleted_at=now, updated_at=now)
+            for hub_id, ids in by_hub.items():
+                remove_enrollment_hours(hub_id, ids)
+        for hub_id in by_hub:
+            bump_version(hub_id, EmployeeTraining._meta.model_name)
+    return removed
+
+
+def complete_enrollments(queryset, completed_on=None, chunk_size=None):
+    """
+    Mark the live, not yet closed enrollments of ``queryset`` completed;
+    returns the rows changed. Each row is saved, so the hours ledger,
+    rollups and counters follow through the usual signals.
+    """
+    completed_on = completed_on or timezone.localdate()
+    changed = 0
+    open_rows = queryset.exclude(status__in=CLOSED_STATUSES)
+    for chunk in _chunks(open_rows, chunk_size or get_bulk_chunk_size()):
+        with transaction.atomic():
+            for enrollment in EmployeeTraining.objects.filter(pk__in=[pk for pk, _ in chunk]).select_for_update():
+                enrollment.status = 'completed'
+                enrollment.completion_date = enrollment.completion_date or completed_on
+                enrollment.save(update_fields=['status', 'completion_date', 'updated_at'])
+                changed += 1
+    return changed
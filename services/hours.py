@@ -0,0 +1,165 @@
+"""
+Training hours ledger.
+
+Every completed enrollment and every attended session booking owns one
+``TrainingHoursEntry``. Recording, changing or reversing an entry applies
+the difference to the monthly rollups (employee × month and hub × month) in
+the same transaction, so period reports read a handful of rollup rows
+instead of re-joining the enrollment history.
+
+Rollup rows are adjusted with ``F()`` increments; a missing row is inserted
+in a savepoint and, if a concurrent writer inserted it first, the increment
+is retried as an UPDATE.
+"""
+import datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from ..models import EmployeeHoursRollup, HubHoursRollup, TrainingHoursEntry
+
+MAX_ATTEMPTS = 3
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def quarter_bounds(year, quarter):
+    """Return the first month of ``quarter`` and the first month after it."""
+    start = datetime.date(year, 3 * (quarter - 1) + 1, 1)
+    end = datetime.date(year + (quarter == 4), (3 * quarter) % 12 + 1, 1)
+    return start, end
+
+
+def _bump(model, lookup, hours, entries, defaults=None):
+    updates = {'hours': F('hours') + hours, 'entries': F('entries') + entries}
+    updates.update(defaults or {})
+    for _ in range(MAX_ATTEMPTS):
+        if model.objects.filter(**lookup).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup, **(defaults or {}), hours=hours, entries=entries)
+                return
+        except IntegrityError:
+            # A concurrent writer created the row; apply the increment to it.
+            continue
+    raise IntegrityError(f'Could not update {model.__name__} for {lookup}')
+
+
+def _apply(entry, sign):
+    hours = entry.hours * sign
+    period = month_start(entry.occurred_on)
+    _bump(
+        EmployeeHoursRollup,
+        {'hub_id': entry.hub_id, 'period': period, 'employee_id': entry.employee_id},
+        hours, sign, defaults={'employee_name': entry.employee_name},
+    )
+    _bump(HubHoursRollup, {'hub_id': entry.hub_id, 'period': period}, hours, sign)
+
+
+def _reverse(entry):
+    entry.is_deleted = True
+    entry.deleted_at = timezone.now()
+    entry.save(update_fields=['is_deleted', 'deleted_at', 'updated_at'])
+    _apply(entry, -1)
+
+
+def _same(stored, value):
+    # Ids set from the session arrive as strings; stored ones load as UUIDs.
+    return stored == value or str(stored) == str(value)
+
+
+def _sync(source, values):
+    """
+    Make the ledger entry for ``source`` (a ``{'enrollment': obj}`` or
+    ``{'booking': obj}`` lookup) match ``values``; ``None`` removes it.
+    """
+    with transaction.atomic():
+        existing = TrainingHoursEntry.objects.select_for_update().filter(**source).first()
+        if existing is not None:
+            if values is not None and all(_same(getattr(existing, k), v) for k, v in values.items()):
+                return existing
+            _reverse(existing)
+        if values is None:
+            return None
+        entry = TrainingHoursEntry.objects.create(**source, **values)
+        _apply(entry, 1)
+        return entry
+
+
+def record_enrollment_hours(enrollment):
+    """Keep the ledger entry of an enrollment in line with its status."""
+    if enrollment.is_deleted or enrollment.status != 'completed' or enrollment.program_id is None:
+        if not TrainingHoursEntry.objects.filter(enrollment=enrollment).exists():
+            return None
+        return _sync({'enrollment': enrollment}, None)
+    program = enrollment.program
+    # Views assign the raw POST value; parse it like the database would.
+    completed_on = TrainingHoursEntry._meta.get_field('occurred_on').to_python(enrollment.completion_date)
+    return _sync({'enrollment': enrollment}, {
+        'hub_id': enrollment.hub_id,
+        'employee_id': enrollment.employee_id,
+        'employee_name': enrollment.employee_name,
+        'program_id': program.pk,
+        'hours': Decimal(program.duration_hours),
+        # Without a completion date, fall back to a day that never changes on
+        # later saves: the local creation day, as the 0005 backfill used.
+        'occurred_on': completed_on or timezone.localdate(enrollment.created_at),
+    })
+
+
+def session_hours(session):
+    """Scheduled length of a session, or the program's nominal duration."""
+    if session.ends_at and session.ends_at > session.starts_at:
+        seconds = Decimal((session.ends_at - session.starts_at).total_seconds())
+        return (seconds / 3600).quantize(Decimal('0.01'))
+    return Decimal(session.program.duration_hours)
+
+
+def record_booking_hours(booking):
+    """Keep the ledger entry of a session booking in line with attendance."""
+    if booking.is_deleted or booking.status != 'attended':
+        if not TrainingHoursEntry.objects.filter(booking=booking).exists():
+            return None
+        return _sync({'booking': booking}, None)
+    session = booking.session
+    return _sync({'booking': booking}, {
+        'hub_id': booking.hub_id,
+        'employee_id': booking.employee_id,
+        'employee_name': booking.employee_name,
+        'program_id': session.program_id,
+        'hours': session_hours(session),
+        'occurred_on': timezone.localdate(session.starts_at),
+    })
+
+
+def remove_enrollment_hours(hub_id, enrollment_ids):
+    """Reverse the entries of enrollments removed by a queryset ``update()``."""
+    with transaction.atomic():
+        entries = TrainingHoursEntry.objects.select_for_update().filter(
+            hub_id=hub_id, enrollment_id__in=enrollment_ids,
+        )
+        for entry in entries:
+            _reverse(entry)
+
+
+def employee_hours(hub_id, start, end):
+    """Hours per employee for months in ``[start, end)``, most hours first."""
+    return (
+        EmployeeHoursRollup.objects.filter(hub_id=hub_id, period__gte=start, period__lt=end)
+        .values('employee_id')
+        .annotate(total_hours=Sum('hours'), total_entries=Sum('entries'), name=Max('employee_name'))
+        .filter(total_entries__gt=0)
+        .order_by('-total_hours', 'employee_id')
+    )
+
+
+def hub_hours(hub_id, start, end):
+    """Monthly hub totals for months in ``[start, end)``."""
+    return HubHoursRollup.objects.filter(
+        hub_id=hub_id, period__gte=start, period__lt=end,
+    ).order_by('period')
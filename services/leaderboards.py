@@ -0,0 +1,104 @@
+"""
+Per-program leaderboards.
+
+``top_scorers`` and ``fastest_completions`` rank a hub's completed
+enrollments inside each program with ``ROW_NUMBER()`` / ``RANK()`` window
+functions and keep the first ``TRAINING_LEADERBOARD_SIZE`` of every program,
+so the whole hub is one query however many programs it has. Ties share a
+``rank``; ``ROW_NUMBER()`` only decides which tied rows make the cut.
+
+Results are cached per hub against the enrollment and program write
+versions, so any score, status or rename invalidates them.
+"""
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import DurationField, ExpressionWrapper, F, Window
+from django.db.models.functions import Rank, RowNumber
+
+from ..cache import get_version, make_key
+from ..models import EmployeeTraining
+
+DEFAULT_LEADERBOARD_SIZE = 10
+DEFAULT_LEADERBOARD_TIMEOUT = 900
+LEADERBOARDS = ('score', 'speed')
+
+
+def get_leaderboard_size():
+    return getattr(settings, 'TRAINING_LEADERBOARD_SIZE', DEFAULT_LEADERBOARD_SIZE)
+
+
+def get_leaderboard_timeout():
+    return getattr(settings, 'TRAINING_LEADERBOARD_CACHE_TIMEOUT', DEFAULT_LEADERBOARD_TIMEOUT)
+
+
+def _completed(hub_id):
+    return EmployeeTraining.objects.filter(
+        hub_id=hub_id, is_deleted=False, status='completed', program__is_deleted=False,
+    )
+
+
+def _ranked(qs, order_by, rank_by, limit):
+    partition = [F('program_id')]
+    return (
+        qs.annotate(
+            position=Window(RowNumber(), partition_by=partition, order_by=[*order_by, F('pk').asc()]),
+            rank=Window(Rank(), partition_by=partition, order_by=rank_by),
+        )
+        .filter(position__lte=limit)
+        .order_by('program_name', 'program_id', 'position')
+    )
+
+
+def _grouped(rows, entry):
+    """Group ranked rows by program, turning each row into ``entry(row)``."""
+    return [
+        {'program_id': str(program_id), 'program_name': program_name, 'entries': [entry(row) for row in program_rows]}
+        for (program_id, program_name), program_rows in groupby(rows, key=itemgetter('program_id', 'program_name'))
+    ]
+
+
+def _entry(row, **extra):
+    return {
+        'rank': row['rank'], 'employee_id': str(row['employee_id']),
+        'employee_name': row['employee_name'], **extra,
+    }
+
+
+def compute_top_scorers(hub_id, limit):
+    qs = _ranked(
+        _completed(hub_id).filter(score__isnull=False),
+        order_by=[F('score').desc(), F('completion_date').asc(nulls_last=True)],
+        rank_by=F('score').desc(), limit=limit,
+    )
+    rows = qs.values('program_id', 'program_name', 'rank', 'employee_id', 'employee_name', 'score')
+    return _grouped(rows, lambda row: _entry(row, score=row['score']))
+
+
+def compute_fastest_completions(hub_id, limit):
+    took = ExpressionWrapper(F('completion_date') - F('start_date'), output_field=DurationField())
+    qs = _ranked(
+        _completed(hub_id).filter(start_date__isnull=False, completion_date__isnull=False).alias(took=took),
+        order_by=[F('took').asc(), F('completion_date').asc()],
+        rank_by=F('took').asc(), limit=limit,
+    )
+    rows = qs.values(
+        'program_id', 'program_name', 'rank', 'employee_id', 'employee_name', 'start_date', 'completion_date',
+    )
+    return _grouped(rows, lambda row: _entry(row, days=(row['completion_date'] - row['start_date']).days))
+
+
+COMPUTE = {'score': compute_top_scorers, 'speed': compute_fastest_completions}
+
+
+def get_leaderboard(hub_id, kind='score', limit=None, timeout=None):
+    """Top ``limit`` entries per program of the ``score`` or ``speed`` board, cached."""
+    limit = limit or get_leaderboard_size()
+    key = make_key(hub_id, 'employeetraining', 'leaderboard', kind, limit, get_version(hub_id, 'trainingprogram'))
+    board = cache.get(key)
+    if board is None:
+        board = COMPUTE[kind](hub_id, limit)
+        cache.set(key, board, get_leaderboard_timeout() if timeout is None else timeout)
+    return board
@@ -0,0 +1,151 @@
+"""
+Program prerequisites and their transitive closure.
+
+``ProgramPrerequisite`` holds the direct edges ("program requires
+requires"). ``ProgramClosure`` holds every (program, prerequisite) pair
+reachable through them, with the shortest chain length as ``depth``.
+
+Edge changes rebuild the closure rows of the edited program and every
+program that depends on it, computed from the hub's edge list in memory.
+The hub's edges are read in one query and written back with one
+``bulk_create``. Reads never walk the graph. A cycle check is a single
+closure lookup. Eligibility and "what can I take next" are one query each,
+joining the closure against the employee's completions.
+
+Edits lock the hub's program rows, so two concurrent edits cannot combine
+into a cycle that neither one would detect alone.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from ..models import EmployeeTraining, ProgramClosure, ProgramPrerequisite, TrainingProgram
+
+
+class PrerequisiteCycleError(ValueError):
+    """Adding the prerequisite would make a program (indirectly) require itself."""
+
+
+def _lock_hub(hub_id):
+    list(TrainingProgram.all_objects.select_for_update().filter(hub_id=hub_id).values_list('pk', flat=True))
+
+
+def _edges(hub_id):
+    graph = defaultdict(set)
+    rows = ProgramPrerequisite.objects.filter(hub_id=hub_id, is_deleted=False).values_list('program_id', 'requires_id')
+    for program_id, requires_id in rows:
+        graph[program_id].add(requires_id)
+    return graph
+
+
+def _closure_of(program_id, graph, memo):
+    """Shortest depth to every transitive prerequisite, without recursion."""
+    stack = [(program_id, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node in memo:
+            continue
+        if expanded:
+            depths = {}
+            for requires in graph.get(node, ()):
+                depths[requires] = 1
+                for ancestor, depth in memo[requires].items():
+                    if depths.get(ancestor, depth + 2) > depth + 1:
+                        depths[ancestor] = depth + 1
+            memo[node] = depths
+        else:
+            stack.append((node, True))
+            stack.extend((requires, False) for requires in graph.get(node, ()) if requires not in memo)
+    return memo[program_id]
+
+
+def _rebuild(hub_id, program_id):
+    affected = {program_id, *ProgramClosure.objects.filter(prerequisite_id=program_id).values_list('program_id', flat=True)}
+    graph = _edges(hub_id)
+    memo = {}
+    rows = [
+        ProgramClosure(hub_id=hub_id, program_id=node, prerequisite_id=ancestor, depth=depth)
+        for node in affected
+        for ancestor, depth in _closure_of(node, graph, memo).items()
+    ]
+    ProgramClosure.objects.filter(program_id__in=affected).delete()
+    ProgramClosure.objects.bulk_create(rows, batch_size=1000)
+
+
+def would_create_cycle(program, requires):
+    return program.pk == requires.pk or ProgramClosure.objects.filter(
+        program_id=requires.pk, prerequisite_id=program.pk,
+    ).exists()
+
+
+def add_prerequisite(program, requires):
+    """Make ``program`` require ``requires``; return ``(edge, created)``."""
+    with transaction.atomic():
+        _lock_hub(program.hub_id)
+        if would_create_cycle(program, requires):
+            raise PrerequisiteCycleError(f'{requires} already requires {program}')
+        edge, created = ProgramPrerequisite.objects.get_or_create(
+            hub_id=program.hub_id, program=program, requires=requires, is_deleted=False,
+        )
+        if created:
+            _rebuild(program.hub_id, program.pk)
+        return edge, created
+
+
+def remove_prerequisite(edge):
+    with transaction.atomic():
+        _lock_hub(edge.hub_id)
+        ProgramPrerequisite.objects.filter(pk=edge.pk).update(is_deleted=True, deleted_at=timezone.now())
+        _rebuild(edge.hub_id, edge.program_id)
+
+
+def rebuild_hub_closure(hub_id):
+    """Recompute every closure row of a hub, e.g. after importing edges."""
+    with transaction.atomic():
+        _lock_hub(hub_id)
+        graph = _edges(hub_id)
+        memo = {}
+        rows = [
+            ProgramClosure(hub_id=hub_id, program_id=node, prerequisite_id=ancestor, depth=depth)
+            for node in list(graph)
+            for ancestor, depth in _closure_of(node, graph, memo).items()
+        ]
+        ProgramClosure.objects.filter(hub_id=hub_id).delete()
+        ProgramClosure.objects.bulk_create(rows, batch_size=1000)
+
+
+def _completed_program_ids(hub_id, employee_id):
+    return EmployeeTraining.objects.filter(
+        hub_id=hub_id, employee_id=employee_id, status='completed', is_deleted=False,
+    ).values('program_id')
+
+
+def missing_prerequisites(program, employee_id):
+    """Programs ``employee_id`` still has to complete before ``program``, nearest first."""
+    return (
+        TrainingProgram.objects.filter(
+            closure_dependents__program=program, is_deleted=False,
+        )
+        .exclude(pk__in=_completed_program_ids(program.hub_id, employee_id))
+        .order_by('closure_dependents__depth', 'name')
+    )
+
+
+def is_eligible(program, employee_id):
+    return not missing_prerequisites(program, employee_id).exists()
+
+
+def next_programs(hub_id, employee_id):
+    """Active programs the employee has not completed and whose prerequisites are all met."""
+    completed = _completed_program_ids(hub_id, employee_id)
+    blocked = ProgramClosure.objects.filter(
+        program_id=OuterRef('pk'), prerequisite__is_deleted=False,
+    ).exclude(prerequisite_id__in=completed)
+    return (
+        TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False, is_active=True)
+        .exclude(pk__in=completed)
+        .exclude(Exists(blocked))
+        .order_by('name')
+    )
@@ -0,0 +1,151 @@
+"""
+Reminder digests for outstanding mandatory training.
+
+``queue_reminders`` builds every digest for a hub from two set-based
+queries. The first returns active mandatory enrollments that are overdue or
+not started, classified in SQL. The second returns completions whose
+certification is about to expire and has not been renewed. Rows are grouped
+per employee in memory, plus one summary digest for the hub's managers.
+The new digests are written to ``ReminderOutbox`` with ``bulk_create``.
+
+A digest identical to one queued for the same recipient within
+``TRAINING_REMINDER_DEDUP_HOURS`` is skipped; the check is a single range
+read of the hub's recent outbox rows.
+"""
+import datetime
+import hashlib
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Case, Exists, F, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from ..models import CLOSED_STATUSES, EmployeeTraining, ReminderOutbox
+
+DEFAULT_DUE_DAYS = 30
+DEFAULT_VALID_DAYS = 365
+DEFAULT_NOTICE_DAYS = 30
+DEFAULT_DEDUP_HOURS = 24
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _setting(name, default):
+    return getattr(settings, f'TRAINING_{name}', default)
+
+
+def _mandatory(queryset):
+    return queryset.filter(is_deleted=False, program__is_mandatory=True, program__is_deleted=False)
+
+
+def outstanding_items(hub_id, today):
+    """Overdue and not-started mandatory enrollments, one dict per row."""
+    due_cutoff = today - datetime.timedelta(days=_setting('REMINDER_DUE_DAYS', DEFAULT_DUE_DAYS))
+    started_before = Q(start_date__lt=due_cutoff) | Q(start_date__isnull=True, created_at__date__lt=due_cutoff)
+    return (
+        _mandatory(EmployeeTraining.objects.filter(hub_id=hub_id))
+        .exclude(status__in=CLOSED_STATUSES)
+        .annotate(kind=Case(
+            When(started_before, then=Value('overdue')),
+            When(status='enrolled', then=Value('not_started')),
+        ))
+        .filter(kind__isnull=False)
+        .values('employee_id', 'employee_name', 'program_id', 'program_name', 'kind', 'start_date')
+        .order_by()
+    )
+
+
+def expiring_items(hub_id, today):
+    """Mandatory completions expiring within the notice window and not yet renewed."""
+    valid_days = _setting('CERTIFICATION_VALID_DAYS', DEFAULT_VALID_DAYS)
+    notice_days = _setting('REMINDER_NOTICE_DAYS', DEFAULT_NOTICE_DAYS)
+    # Only a later enrollment still under way or completed counts as a renewal.
+    renewed = EmployeeTraining.objects.filter(
+        Q(status='completed') | ~Q(status__in=CLOSED_STATUSES),
+        hub_id=hub_id, is_deleted=False, employee_id=OuterRef('employee_id'),
+        program_id=OuterRef('program_id'), created_at__gt=OuterRef('created_at'),
+    )
+    return (
+        _mandatory(EmployeeTraining.objects.filter(hub_id=hub_id))
+        .filter(
+            status='completed',
+            # Expiring from today to the end of the notice window; older ones already lapsed.
+            completion_date__gte=today - datetime.timedelta(days=valid_days),
+            completion_date__lte=today - datetime.timedelta(days=valid_days - notice_days),
+        )
+        .exclude(Exists(renewed))
+        .annotate(kind=Value('expiring'), completed_on=F('completion_date'))
+        .values('employee_id', 'employee_name', 'program_id', 'program_name', 'kind', 'completed_on')
+        .order_by()
+    )
+
+
+def _item(row, valid_days):
+    item = {'kind': row['kind'], 'program_id': str(row['program_id']), 'program_name': row['program_name']}
+    if row.get('start_date'):
+        item['start_date'] = row['start_date'].isoformat()
+    if row.get('completed_on'):
+        item['expires_on'] = (row['completed_on'] + datetime.timedelta(days=valid_days)).isoformat()
+    return item
+
+
+def _digest_key(items):
+    parts = sorted((item['kind'], item['program_id'], item.get('employee_id', '')) for item in items)
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+
+def build_digests(hub_id, today=None):
+    """Return ``{(kind, recipient_id): (recipient_name, items)}`` for a hub."""
+    today = today or timezone.localdate()
+    valid_days = _setting('CERTIFICATION_VALID_DAYS', DEFAULT_VALID_DAYS)
+    digests = defaultdict(lambda: ['', []])
+    manager = digests[('manager', None)]
+    for queryset in (outstanding_items(hub_id, today), expiring_items(hub_id, today)):
+        for row in queryset.iterator(chunk_size=_setting('REMINDER_BATCH_SIZE', DEFAULT_BATCH_SIZE)):
+            item = _item(row, valid_days)
+            employee = digests[('employee', row['employee_id'])]
+            employee[0] = row['employee_name']
+            employee[1].append(item)
+            manager[1].append({**item, 'employee_id': str(row['employee_id']), 'employee_name': row['employee_name']})
+    if not manager[1]:
+        del digests[('manager', None)]
+    return {key: tuple(value) for key, value in digests.items()}
+
+
+def _payload(kind, items):
+    counts = defaultdict(int)
+    for item in items:
+        counts[item['kind']] += 1
+    if kind == 'manager':
+        # Keep the manager digest small; the full list is one query away.
+        return {'counts': dict(counts), 'employees': len({item['employee_id'] for item in items})}
+    return {'counts': dict(counts), 'items': items}
+
+
+def queue_reminders(hub_id, today=None):
+    """Write new reminder digests for a hub to the outbox; return how many were queued."""
+    window = datetime.timedelta(hours=_setting('REMINDER_DEDUP_HOURS', DEFAULT_DEDUP_HOURS))
+    recent = set(
+        ReminderOutbox.objects.filter(hub_id=hub_id, created_at__gte=timezone.now() - window)
+        .values_list('recipient_kind', 'recipient_id', 'digest_key')
+    )
+    rows = []
+    for (kind, recipient_id), (name, items) in build_digests(hub_id, today).items():
+        key = _digest_key(items)
+        if (kind, recipient_id, key) in recent:
+            continue
+        rows.append(ReminderOutbox(
+            hub_id=hub_id, recipient_kind=kind, recipient_id=recipient_id,
+            recipient_name=name, digest_key=key, payload=_payload(kind, items),
+        ))
+    ReminderOutbox.objects.bulk_create(rows, batch_size=_setting('REMINDER_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+    return len(rows)
+
+
+def hubs_with_mandatory_training():
+    """Hubs that have at least one active mandatory enrollment or completion."""
+    return (
+        _mandatory(EmployeeTraining.objects.all())
+        .values_list('hub_id', flat=True)
+        .order_by('hub_id')
+        .distinct()
+    )
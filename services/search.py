@@ -0,0 +1,45 @@
+"""
+Prefix search for the program and employee pickers.
+
+Both searches compare ``UPPER(column)`` against an upper-cased constant
+prefix and return at most ``TRAINING_SEARCH_LIMIT`` rows in index order. On
+PostgreSQL, migration 0007 adds matching partial ``text_pattern_ops``
+indexes on ``(hub_id, UPPER(name))`` and ``(hub_id, UPPER(employee_name))``,
+so each keystroke is a short index range scan.
+"""
+from django.conf import settings
+from django.db.models.functions import Upper
+
+from ..models import EmployeeTraining, TrainingProgram
+
+DEFAULT_SEARCH_LIMIT = 20
+
+
+def get_search_limit():
+    return getattr(settings, 'TRAINING_SEARCH_LIMIT', DEFAULT_SEARCH_LIMIT)
+
+
+def search_programs(hub_id, prefix='', limit=None):
+    """Active programs whose name starts with ``prefix``, by name."""
+    qs = (
+        TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False, is_active=True)
+        .alias(upper_name=Upper('name'))
+    )
+    if prefix:
+        qs = qs.filter(upper_name__startswith=prefix.upper())
+    return list(qs.order_by('upper_name', 'id').values('id', 'name')[:limit or get_search_limit()])
+
+
+def search_employees(hub_id, prefix='', limit=None):
+    """Employees with training records whose name starts with ``prefix``."""
+    qs = (
+        EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False)
+        .alias(upper_name=Upper('employee_name'))
+    )
+    if prefix:
+        qs = qs.filter(upper_name__startswith=prefix.upper())
+    return list(
+        qs.order_by('upper_name', 'employee_id')
+        .values('employee_id', 'employee_name')
+        .distinct()[:limit or get_search_limit()]
+    )
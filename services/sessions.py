@@ -0,0 +1,105 @@
+"""
+Seat allocation for scheduled training sessions.
+
+Seats are claimed with a single conditional UPDATE
+(``seats_taken = seats_taken + 1 WHERE seats_taken < capacity``). The row
+lock the UPDATE takes serializes concurrent sign-ups on the session for the
+length of one short transaction, and the database re-checks the condition
+after the lock is granted, so a session can never be overbooked. The
+``training_ts_seats_within_capacity`` check constraint is a second line of
+defence.
+
+``set_attendance`` moves a confirmed booking to ``attended`` (or back); the
+booking's save records or reverses its training hours (see
+``services.hours``).
+
+When a seat frees up, ``fill_from_waitlist`` promotes the oldest waitlisted
+bookings. It locks candidates with ``SKIP LOCKED`` so concurrent
+cancellations promote different people instead of queueing on the same row.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from ..models import ACTIVE_BOOKING_STATUSES, SEAT_HOLDING_STATUSES, SessionBooking, TrainingSession
+
+MAX_ATTEMPTS = 3
+
+
+def _claim_seat(session_id):
+    return TrainingSession.objects.filter(
+        pk=session_id, seats_taken__lt=F('capacity'),
+    ).update(seats_taken=F('seats_taken') + 1) == 1
+
+
+def _active_booking(session_id, employee_id):
+    return SessionBooking.objects.filter(
+        session_id=session_id, employee_id=employee_id, is_deleted=False, status__in=ACTIVE_BOOKING_STATUSES,
+    ).first()
+
+
+def book_seat(session, employee_id, employee_name):
+    """
+    Return ``(booking, created)``: a confirmed seat if one is free, otherwise
+    a waitlist entry. Booking the same employee twice returns the first booking.
+    """
+    for _ in range(MAX_ATTEMPTS):
+        existing = _active_booking(session.pk, employee_id)
+        if existing is not None:
+            return existing, False
+        try:
+            with transaction.atomic():
+                status = 'confirmed' if _claim_seat(session.pk) else 'waitlisted'
+                booking = SessionBooking.objects.create(
+                    hub_id=session.hub_id, session_id=session.pk,
+                    employee_id=employee_id, employee_name=employee_name, status=status,
+                )
+                return booking, True
+        except IntegrityError:
+            # A concurrent request booked this employee; the seat claim rolled back with it.
+            continue
+    return _active_booking(session.pk, employee_id), False
+
+
+def cancel_booking(booking):
+    """Cancel a booking and hand its seat to the waitlist; return promoted bookings."""
+    with transaction.atomic():
+        booking = SessionBooking.objects.select_for_update().get(pk=booking.pk)
+        if booking.status not in ACTIVE_BOOKING_STATUSES:
+            return []
+        held_seat = booking.status != 'waitlisted'
+        booking.status = 'cancelled'
+        booking.save(update_fields=['status', 'updated_at'])
+        if held_seat:
+            TrainingSession.objects.filter(pk=booking.session_id).update(seats_taken=F('seats_taken') - 1)
+    if not held_seat:
+        return []
+    return fill_from_waitlist(booking.session_id)
+
+
+def set_attendance(booking, attended=True):
+    """Mark a seat-holding booking attended or back to confirmed; return it."""
+    with transaction.atomic():
+        booking = SessionBooking.objects.select_for_update().get(pk=booking.pk)
+        status = 'attended' if attended else 'confirmed'
+        if booking.status in SEAT_HOLDING_STATUSES and booking.status != status:
+            booking.status = status
+            booking.save(update_fields=['status', 'updated_at'])
+    return booking
+
+
+def fill_from_waitlist(session_id):
+    """Promote waitlisted bookings, oldest first, while the session has free seats."""
+    promoted = []
+    while True:
+        with transaction.atomic():
+            candidate = (
+                SessionBooking.objects.select_for_update(skip_locked=True)
+                .filter(session_id=session_id, status='waitlisted', is_deleted=False)
+                .order_by('created_at', 'id')
+                .first()
+            )
+            if candidate is None or not _claim_seat(session_id):
+                return promoted
+            candidate.status = 'confirmed'
+            candidate.save(update_fields=['status', 'updated_at'])
+            promoted.append(candidate)
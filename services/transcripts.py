@@ -0,0 +1,266 @@
+"""
+Batch employee transcripts.
+
+A ``TranscriptJob`` names the employees to include and the output format.
+``run_job`` fetches their enrollments ``TRAINING_TRANSCRIPT_FETCH_BATCH``
+employees at a time (one enrollment query and one hours query per batch)
+and hands plain-data payloads to a process pool of
+``TRAINING_TRANSCRIPT_WORKERS`` processes (default: the CPU count). Each
+worker renders one document and writes it straight into the job's staging
+directory, so only a bounded number of payloads are ever in flight and no
+document passes back through the parent.
+
+Documents are written under a temporary name and renamed when complete.
+A job that is interrupted can therefore be run again: employees whose
+document already exists are skipped. Once every document exists they are
+streamed into ``<job id>.zip`` and the staging directory is removed.
+
+``rendered`` and ``updated_at`` are written as documents complete, and
+``updated_at`` again as they are added to the archive. The status endpoint
+reads them, and ``claim_jobs`` uses ``updated_at`` to tell an interrupted
+job from one that is still running.
+
+``expire_archives`` deletes finished archives older than a hub's
+``archive_retention_days`` (see ``TrainingSettings``) and soft-deletes
+their jobs.
+"""
+import datetime
+import importlib.util
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.db.models import Sum
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.text import slugify
+
+from ..models import EmployeeTraining, TrainingHoursEntry, TrainingSettings, TranscriptJob
+
+TRANSCRIPT_FORMATS = ('html', 'pdf')
+TRANSCRIPT_TEMPLATE = 'training/transcripts/transcript.html'
+DEFAULT_FETCH_BATCH = 500
+DEFAULT_STALE_SECONDS = 300
+IN_FLIGHT_PER_WORKER = 4
+PROGRESS_EVERY = 25
+
+
+def _setting(name, default):
+    return getattr(settings, f'TRAINING_{name}', default)
+
+
+def get_transcript_dir():
+    return _setting('TRANSCRIPT_DIR', None) or os.path.join(tempfile.gettempdir(), 'training-transcripts')
+
+
+def get_worker_count():
+    return _setting('TRANSCRIPT_WORKERS', None) or os.cpu_count() or 1
+
+
+def pdf_available():
+    return importlib.util.find_spec('weasyprint') is not None
+
+
+def create_job(hub_id, employee_ids=None, fmt='html', user_id=None):
+    """Queue a transcript job for ``employee_ids``, or every employee of the hub."""
+    if fmt not in TRANSCRIPT_FORMATS:
+        raise ValueError(f'Unknown transcript format: {fmt}')
+    if fmt == 'pdf' and not pdf_available():
+        raise ValueError('PDF transcripts require the weasyprint package.')
+    if not employee_ids:
+        employee_ids = (
+            EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False)
+            .values_list('employee_id', flat=True).order_by().distinct()
+        )
+    ids = sorted({str(employee_id) for employee_id in employee_ids})
+    return TranscriptJob.objects.create(
+        hub_id=hub_id, format=fmt, employee_ids=ids, total=len(ids), created_by=user_id,
+    )
+
+
+def staging_dir(job):
+    return os.path.join(get_transcript_dir(), str(job.pk))
+
+
+def archive_path(job):
+    return os.path.join(get_transcript_dir(), f'{job.pk}.zip')
+
+
+def _document_name(payload, fmt):
+    return f'{slugify(payload["employee_name"]) or "employee"}_{payload["employee_id"]}.{fmt}'
+
+
+def _rendered_ids(directory):
+    """Employee ids whose document is complete in ``directory``."""
+    if not os.path.isdir(directory):
+        return set()
+    return {
+        os.path.splitext(name)[0].rpartition('_')[2]
+        for name in os.listdir(directory) if not name.startswith('.')
+    }
+
+
+def iter_payloads(hub_id, employee_ids, batch_size=None):
+    """Yield one plain-data transcript payload per employee, in ``employee_ids`` order."""
+    batch_size = batch_size or _setting('TRANSCRIPT_FETCH_BATCH', DEFAULT_FETCH_BATCH)
+    for offset in range(0, len(employee_ids), batch_size):
+        batch = employee_ids[offset:offset + batch_size]
+        hours = {
+            str(employee_id): total
+            for employee_id, total in TrainingHoursEntry.objects.filter(
+                hub_id=hub_id, employee_id__in=batch, is_deleted=False,
+            ).values('employee_id').annotate(total=Sum('hours')).values_list('employee_id', 'total').order_by()
+        }
+        rows = (
+            EmployeeTraining.objects.filter(hub_id=hub_id, employee_id__in=batch, is_deleted=False)
+            .order_by('employee_id', 'start_date', 'program_name')
+            .values('employee_id', 'employee_name', 'program_name', 'status', 'start_date', 'completion_date', 'score')
+        )
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(str(row.pop('employee_id')), []).append(row)
+        for employee_id in batch:
+            enrollments = grouped.get(employee_id, [])
+            yield {
+                'employee_id': employee_id,
+                'employee_name': enrollments[-1]['employee_name'] if enrollments else '',
+                'enrollments': enrollments,
+                'completed': sum(1 for row in enrollments if row['status'] == 'completed'),
+                'hours': hours.get(employee_id, 0),
+            }
+
+
+def render_document(payload, fmt, directory):
+    """Render one transcript into ``directory``; runs in a pool worker."""
+    html = render_to_string(TRANSCRIPT_TEMPLATE, {**payload, 'generated_at': timezone.now()})
+    if fmt == 'pdf':
+        from weasyprint import HTML
+        content = HTML(string=html).write_pdf()
+    else:
+        content = html.encode('utf-8')
+    path = os.path.join(directory, _document_name(payload, fmt))
+    handle, partial = tempfile.mkstemp(dir=directory, prefix='.')
+    with os.fdopen(handle, 'wb') as out:
+        out.write(content)
+    os.replace(partial, path)
+    return payload['employee_id']
+
+
+def _init_worker():
+    # Spawned workers (macOS, Windows) start without a configured Django.
+    django.setup()
+
+
+def _save_progress(job, rendered):
+    job.rendered = rendered
+    TranscriptJob.objects.filter(pk=job.pk).update(rendered=rendered, updated_at=timezone.now())
+
+
+def _render_all(job, payloads, directory, rendered, workers):
+    if workers <= 1:
+        for payload in payloads:
+            render_document(payload, job.format, directory)
+            rendered += 1
+            if rendered % PROGRESS_EVERY == 0:
+                _save_progress(job, rendered)
+        return rendered
+
+    limit = workers * IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        in_flight = set()
+        for payload in payloads:
+            in_flight.add(pool.submit(render_document, payload, job.format, directory))
+            if len(in_flight) >= limit:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                rendered += len(done)
+                _save_progress(job, rendered)
+        for future in in_flight:
+            future.result()
+        rendered += len(in_flight)
+    return rendered
+
+
+def _heartbeat(job):
+    TranscriptJob.objects.filter(pk=job.pk).update(updated_at=timezone.now())
+
+
+def _write_archive(job, directory):
+    path = archive_path(job)
+    partial = f'{path}.part'
+    names = [name for name in sorted(os.listdir(directory)) if not name.startswith('.')]
+    with zipfile.ZipFile(partial, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for count, name in enumerate(names, 1):
+            archive.write(os.path.join(directory, name), arcname=name)
+            # Keep claim_jobs from taking a long archive write for a dead job.
+            if count % PROGRESS_EVERY == 0:
+                _heartbeat(job)
+    os.replace(partial, path)
+    return path
+
+
+def run_job(job, workers=None):
+    """Render the job's missing documents and build its archive; safe to re-run."""
+    workers = workers or get_worker_count()
+    directory = staging_dir(job)
+    os.makedirs(directory, exist_ok=True)
+    TranscriptJob.objects.filter(pk=job.pk).update(status='running', error='', updated_at=timezone.now())
+    job.status = 'running'
+    try:
+        done = _rendered_ids(directory)
+        remaining = [employee_id for employee_id in job.employee_ids if employee_id not in done]
+        rendered = _render_all(job, iter_payloads(job.hub_id, remaining), directory, len(done), workers)
+        _save_progress(job, rendered)
+        job.archive_path = _write_archive(job, directory)
+        shutil.rmtree(directory, ignore_errors=True)
+        job.status = 'done'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'rendered', 'archive_path', 'finished_at', 'updated_at'])
+    except Exception as exc:
+        job.status = 'failed'
+        job.error = str(exc)
+        job.save(update_fields=['status', 'error', 'updated_at'])
+        raise
+    return job
+
+
+def claim_jobs():
+    """Yield pending jobs and interrupted running ones, each claimed by this process."""
+    stale = timezone.now() - datetime.timedelta(seconds=_setting('TRANSCRIPT_STALE_SECONDS', DEFAULT_STALE_SECONDS))
+    candidates = TranscriptJob.objects.filter(is_deleted=False, status__in=('pending', 'running')).order_by('created_at')
+    for job in candidates:
+        if job.status == 'running' and job.updated_at >= stale:
+            continue
+        # Only one runner wins the conditional update for a given job state.
+        claimed = TranscriptJob.objects.filter(pk=job.pk, status=job.status, updated_at=job.updated_at).update(
+            status='running', updated_at=timezone.now(),
+        )
+        if claimed:
+            job.refresh_from_db()
+            yield job
+
+
+def expire_archives(now=None):
+    """Remove archives past their hub's retention period; returns the jobs expired."""
+    now = now or timezone.now()
+    retention = TrainingSettings.objects.filter(is_deleted=False, archive_retention_days__gt=0)
+    expired = 0
+    for hub_id, days in retention.values_list('hub_id', 'archive_retention_days'):
+        jobs = list(TranscriptJob.objects.filter(
+            hub_id=hub_id, is_deleted=False, status='done', finished_at__lt=now - datetime.timedelta(days=days),
+        ).values_list('pk', 'archive_path'))
+        for _, path in jobs:
+            if path:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        expired += TranscriptJob.objects.filter(pk__in=[pk for pk, _ in jobs]).update(
+            is_deleted=True, deleted_at=now, archive_path='', updated_at=now,
+        )
+    return expired
@@ -0,0 +1,173 @@
+"""
+Completion trends and enrollment cohorts.
+
+Every live enrollment contributes fixed counts to a handful of rollup rows:
+
+* ``TrendRollup``: +1 enrolled in the week and month it started, and +1
+  completed or failed in the week and month it closed;
+* ``CohortRollup``: +1 enrolled in its start month's cohort, +1 completed,
+  and +1 in each "completed within N days" window it made.
+
+Each contribution is counted once for the program and once for the hub
+(``program`` empty). When an enrollment is saved or deleted, the counts of
+its previous state are subtracted and those of its new state added with
+``F()`` increments, so trend charts read pre-aggregated rows instead of
+scanning and truncating ``EmployeeTraining`` dates.
+
+``backfill_trends`` rebuilds a hub from scratch, streaming its enrollments in
+chunks, and is what ``training_backfill_trends`` runs.
+"""
+import datetime
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import TREND_GRAINS, CohortRollup, EmployeeTraining, TrendRollup
+
+COHORT_WINDOWS = (7, 30, 90)
+STATE_FIELDS = ('hub_id', 'program_id', 'status', 'start_date', 'completion_date', 'created_at', 'is_deleted')
+DEFAULT_CHUNK_SIZE = 2000
+MAX_ATTEMPTS = 3
+
+
+def period_start(grain, day):
+    if grain == 'week':
+        return day - datetime.timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def _clean(field_name, value):
+    # Views assign raw POST strings; normalise them like the database would.
+    return EmployeeTraining._meta.get_field(field_name).to_python(value)
+
+
+def enrollment_state(enrollment):
+    return {name: getattr(enrollment, name) for name in STATE_FIELDS}
+
+
+def stored_state(enrollment):
+    """The enrollment as currently stored, or None if it is not saved yet."""
+    if enrollment._state.adding:
+        return None
+    return EmployeeTraining.all_objects.filter(pk=enrollment.pk).values(*STATE_FIELDS).first()
+
+
+def contributions(state):
+    """Map ``(model, lookup)`` to the counts a stored enrollment adds to it."""
+    counts = defaultdict(Counter)
+    if state is None or state['is_deleted'] or state['hub_id'] is None:
+        return counts
+    hub_id = _clean('hub_id', state['hub_id'])
+    program_id = _clean('program', state['program_id'])
+    start = _clean('start_date', state['start_date'])
+    if start is None:
+        start = timezone.localdate(state['created_at']) if state['created_at'] else timezone.localdate()
+    completion = _clean('completion_date', state['completion_date'])
+    closed = state['status'] if state['status'] in ('completed', 'failed') else None
+
+    targets = [None] if program_id is None else [program_id, None]
+    for program_id in targets:
+        for grain in TREND_GRAINS:
+            key = (TrendRollup, (hub_id, program_id, grain, period_start(grain, start)))
+            counts[key]['enrolled'] += 1
+            if closed:
+                closed_on = completion or start
+                key = (TrendRollup, (hub_id, program_id, grain, period_start(grain, closed_on)))
+                counts[key][closed] += 1
+
+        cohort = counts[(CohortRollup, (hub_id, program_id, period_start('month', start)))]
+        cohort['enrolled'] += 1
+        if closed == 'completed':
+            cohort['completed'] += 1
+            days = (completion - start).days if completion else None
+            for window in COHORT_WINDOWS:
+                if days is not None and days <= window:
+                    cohort[f'completed_{window}d'] += 1
+    return counts
+
+
+def _lookup(model, key):
+    if model is TrendRollup:
+        hub_id, program_id, grain, period = key
+        return {'hub_id': hub_id, 'program_id': program_id, 'grain': grain, 'period': period}
+    hub_id, program_id, cohort = key
+    return {'hub_id': hub_id, 'program_id': program_id, 'cohort': cohort}
+
+
+def _add(model, lookup, deltas):
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    for _ in range(MAX_ATTEMPTS):
+        if model.objects.filter(**lookup).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup, **deltas)
+                return
+        except IntegrityError:
+            # A concurrent writer created the row; apply the increment to it.
+            continue
+    raise IntegrityError(f'Could not update {model.__name__} for {lookup}')
+
+
+def apply_change(before, after):
+    """Move an enrollment's counts from state ``before`` to state ``after``."""
+    old, new = contributions(before), contributions(after)
+    changes = []
+    for key in old.keys() | new.keys():
+        deltas = Counter(new.get(key, {}))
+        deltas.subtract(old.get(key, {}))
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            changes.append((key, deltas))
+    # A stable order keeps concurrent writers from locking rows in opposite orders.
+    changes.sort(key=lambda change: (change[0][0].__name__, str(change[0][1])))
+    with transaction.atomic():
+        for (model, key), deltas in changes:
+            _add(model, _lookup(model, key), deltas)
+
+
+def remove_enrollment_trends(queryset):
+    """Subtract enrollments that are about to be removed by a queryset ``update()``."""
+    for state in queryset.filter(is_deleted=False).values(*STATE_FIELDS).iterator():
+        apply_change(state, None)
+
+
+def backfill_trends(hub_id, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Rebuild a hub's trend and cohort rollups; return the enrollments counted."""
+    totals = defaultdict(Counter)
+    counted = 0
+    with transaction.atomic():
+        rows = (
+            EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False)
+            .order_by('pk').values(*STATE_FIELDS).iterator(chunk_size=chunk_size)
+        )
+        for state in rows:
+            for key, counts in contributions(state).items():
+                totals[key].update(counts)
+            counted += 1
+        TrendRollup.objects.filter(hub_id=hub_id).delete()
+        CohortRollup.objects.filter(hub_id=hub_id).delete()
+        for model in (TrendRollup, CohortRollup):
+            model.objects.bulk_create(
+                [model(**_lookup(m, key), **counts) for (m, key), counts in totals.items() if m is model],
+                batch_size=chunk_size,
+            )
+    return counted
+
+
+def trend(hub_id, grain, start, end, program=None):
+    """Rollup rows for periods in ``[start, end)``, oldest first."""
+    return TrendRollup.objects.filter(
+        hub_id=hub_id, grain=grain, program=program,
+        period__gte=period_start(grain, start), period__lt=end,
+    ).order_by('period')
+
+
+def cohorts(hub_id, start, end, program=None):
+    """Cohort rows for start months in ``[start, end)``, oldest first."""
+    return CohortRollup.objects.filter(
+        hub_id=hub_id, program=program,
+        cohort__gte=period_start('month', start), cohort__lt=end,
+    ).order_by('cohort')
@@ -0,0 +1,79 @@
+"""
+Signal handlers for the Training module.
+
+Row-level saves and deletes bump the table's cache version, and again when
+their transaction commits (see ``training.cache``). Queryset ``update()``
+calls bypass signals, so views that use them call ``bump_version``
+themselves.
+
+Enrollment and booking writes also keep the training hours ledger current,
+and enrollment writes keep the trend and cohort rollups and the program
+counters current. The latter read the stored row in ``pre_save`` so the
+previous counts can be undone.
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_version
+from .models import TrainingProgram, Skill, EmployeeTraining, SessionBooking, TrainingSettings
+from .services.counters import apply_counters
+from .services.hours import record_booking_hours, record_enrollment_hours
+from .services.trends import apply_change, enrollment_state, stored_state
+
+
+@receiver(post_save, sender=TrainingProgram)
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=EmployeeTraining)
+@receiver(post_save, sender=TrainingSettings)
+@receiver(post_delete, sender=TrainingProgram)
+@receiver(post_delete, sender=Skill)
+@receiver(post_delete, sender=EmployeeTraining)
+@receiver(post_delete, sender=TrainingSettings)
+def invalidate_table_cache(sender, instance, **kwargs):
+    bump_version(instance.hub_id, sender._meta.model_name)
+
+
+@receiver(post_save, sender=EmployeeTraining)
+def record_enrollment_ledger(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_enrollment_hours(instance)
+
+
+@receiver(pre_save, sender=EmployeeTraining)
+def capture_enrollment_state(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._stored_state = stored_state(instance)
+
+
+@receiver(post_save, sender=EmployeeTraining)
+def record_enrollment_trends(sender, instance, raw=False, **kwargs):
+    if not raw:
+        apply_change(getattr(instance, '_stored_state', None), enrollment_state(instance))
+
+
+@receiver(post_save, sender=EmployeeTraining)
+def record_enrollment_counters(sender, instance, raw=False, **kwargs):
+    if not raw:
+        apply_counters(getattr(instance, '_stored_state', None), enrollment_state(instance))
+
+
+@receiver(post_save, sender=SessionBooking)
+def record_booking_ledger(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_booking_hours(instance)
+
+
+@receiver(pre_delete, sender=EmployeeTraining)
+def reverse_enrollment_ledger(sender, instance, **kwargs):
+    # Hard deletes cascade to the entry; reverse it first so rollups follow.
+    state = stored_state(instance)
+    apply_change(state, None)
+    apply_counters(state, None)
+    instance.is_deleted = True
+    record_enrollment_hours(instance)
+
+
+@receiver(pre_delete, sender=SessionBooking)
+def reverse_booking_ledger(sender, instance, **kwargs):
+    instance.is_deleted = True
+    record_booking_hours(instance)
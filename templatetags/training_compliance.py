@@ -0,0 +1,26 @@
+from django import template
+
+from training.services.compliance import compliance
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def training_compliance(context, employee_ids, program_id=None, hub_id=None):
+    """
+    Load compliance for a whole roster at once::
+
+        {% training_compliance roster_ids as compliance %}
+        {% for employee in roster %}{% compliance_badge compliance employee.id %}{% endfor %}
+
+    ``hub_id`` defaults to the session hub of the current request.
+    """
+    if hub_id is None:
+        hub_id = context['request'].session.get('hub_id')
+    return compliance(hub_id, employee_ids, program_id)
+
+
+@register.inclusion_tag('training/partials/compliance_badge.html')
+def compliance_badge(statuses, employee_id):
+    """Render the badge for one employee from a ``training_compliance`` result."""
+    return {'status': statuses.get(str(employee_id))}
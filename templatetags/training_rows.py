@@ -0,0 +1,17 @@
+from django import template
+
+from training.rows import render_row_ids, render_rows
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def training_rows(context, name, items):
+    """Render datatable rows with the compiled ``<name>_row.html`` program."""
+    return render_rows(name, items, context)
+
+
+@register.simple_tag(takes_context=True)
+def training_row_ids(context, items):
+    """Render the quoted id list consumed by the select-all checkbox."""
+    return render_row_ids(items, context)
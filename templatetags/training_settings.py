@@ -0,0 +1,16 @@
+from django import template
+
+from training.hub_settings import request_settings
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def training_default_status(context):
+    """
+    The current hub's default enrollment status, for forms rendered outside
+    the Training views (the side panels)::
+
+        {% training_default_status as default_status %}
+    """
+    return request_settings(context['request']).default_status
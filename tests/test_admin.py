@@ -0,0 +1,60 @@
+"""Tests for the training admin."""
+import uuid
+from unittest import mock
+
+import pytest
+from django.contrib import admin
+from django.test import RequestFactory
+
+from training.admin import EmployeeTrainingAdmin
+from training.models import EmployeeTraining
+
+
+def _search(term, **params):
+    model_admin = EmployeeTrainingAdmin(EmployeeTraining, admin.site)
+    request = RequestFactory().get('/', params)
+    # The hub list filter narrows the changelist before search runs.
+    queryset = EmployeeTraining.objects.filter(**params)
+    with mock.patch.object(model_admin, 'message_user') as message_user:
+        queryset, may_have_duplicates = model_admin.get_search_results(request, queryset, term)
+    assert may_have_duplicates is False
+    return set(queryset), message_user
+
+
+@pytest.mark.django_db
+class TestEmployeeTrainingSearch:
+    """Enrollment changelist search tests."""
+
+    def _enroll(self, hub_id, program, name):
+        return EmployeeTraining.objects.create(
+            hub_id=hub_id, employee_id=uuid.uuid4(), employee_name=name, program=program,
+        )
+
+    def test_employee_id(self, hub_id, training_program):
+        """Test a UUID term matches that employee exactly, in any hub."""
+        ann = self._enroll(hub_id, training_program, 'Ann')
+        self._enroll(hub_id, training_program, 'Bob')
+        rows, _ = _search(f' {ann.employee_id} ')
+        assert rows == {ann}
+
+    def test_name_prefix_within_hub(self, hub_id, training_program):
+        """Test a name term is a case-insensitive prefix within the selected hub."""
+        ann = self._enroll(hub_id, training_program, 'Ann Lee')
+        self._enroll(hub_id, training_program, 'Joann')
+        self._enroll(uuid.uuid4(), training_program, 'Anna')
+        rows, message_user = _search('ann', hub_id=str(hub_id))
+        assert rows == {ann}
+        message_user.assert_not_called()
+
+    def test_name_needs_hub(self, hub_id, training_program):
+        """Test a name search across every hub returns nothing and asks for a hub."""
+        self._enroll(hub_id, training_program, 'Ann')
+        rows, message_user = _search('Ann')
+        assert rows == set()
+        message_user.assert_called_once()
+
+    def test_blank_term(self, hub_id, training_program):
+        """Test a blank term leaves the changelist unfiltered."""
+        ann = self._enroll(hub_id, training_program, 'Ann')
+        rows, _ = _search('  ')
+        assert rows == {ann}
@@ -0,0 +1,126 @@
+"""Tests for training async views."""
+import pytest
+from asgiref.sync import async_to_sync
+from django.utils.cache import patch_vary_headers
+from django.http import HttpResponse, HttpResponseRedirect
+from django.test import RequestFactory
+
+from training.ai_tools import ListTrainingEnrollments, ListTrainingPrograms
+from training.async_views import async_view, dashboard_counts
+
+
+def _deny(view):
+    def wrapper(request, *args, **kwargs):
+        return HttpResponseRedirect('/login/')
+    return wrapper
+
+
+def _render_dict(view):
+    def wrapper(request, *args, **kwargs):
+        result = view(request, *args, **kwargs)
+        if isinstance(result, dict):
+            return HttpResponse(','.join(sorted(result)))
+        return result
+    return wrapper
+
+
+class TestAsyncViewAdapter:
+    """async_view decorator adapter tests."""
+
+    def test_short_circuit_skips_body(self):
+        """Test a denying decorator stops the async body from running."""
+        calls = []
+
+        @async_view(_deny, render=(_render_dict,))
+        async def view(request):
+            calls.append(request)
+            return {}
+
+        response = async_to_sync(view)(RequestFactory().get('/'))
+        assert response.status_code == 302
+        assert calls == []
+
+    def test_context_is_rendered_by_decorators(self):
+        """Test the returned context goes through the render decorators."""
+        @async_view(render=(_render_dict,))
+        async def view(request):
+            return {'a': 1, 'b': 2}
+
+        response = async_to_sync(view)(RequestFactory().get('/'))
+        assert response.content == b'a,b'
+
+    def test_decorators_run_once(self):
+        """Test each check and render decorator wraps the request exactly once."""
+        calls = []
+
+        def _record(name):
+            def decorator(view):
+                def wrapper(request, *args, **kwargs):
+                    calls.append(name)
+                    return view(request, *args, **kwargs)
+                return wrapper
+            return decorator
+
+        @async_view(_record('check'), render=(_record('render'), _render_dict))
+        async def view(request):
+            calls.append('body')
+            return {'a': 1}
+
+        async_to_sync(view)(RequestFactory().get('/'))
+        assert calls == ['check', 'body', 'render']
+
+    def test_check_headers_carried_over(self):
+        """Test headers a check sets on a passing request reach the final response."""
+        def _tag(view):
+            def wrapper(request, *args, **kwargs):
+                response = view(request, *args, **kwargs)
+                response['ETag'] = '"v1"'
+                patch_vary_headers(response, ['Cookie'])
+                return response
+            return wrapper
+
+        def _vary_htmx(view):
+            def wrapper(request, *args, **kwargs):
+                response = view(request, *args, **kwargs)
+                patch_vary_headers(response, ['HX-Request'])
+                return response
+            return wrapper
+
+        @async_view(_tag, render=(_vary_htmx, _render_dict))
+        async def view(request):
+            return {'a': 1}
+
+        response = async_to_sync(view)(RequestFactory().get('/'))
+        assert response['ETag'] == '"v1"'
+        assert response['Vary'] == 'HX-Request, Cookie'
+        assert response.content == b'a'
+
+    def test_response_passthrough(self):
+        """Test an HttpResponse from the body is returned untouched."""
+        @async_view(render=(_render_dict,))
+        async def view(request):
+            return HttpResponse(status=204)
+
+        response = async_to_sync(view)(RequestFactory().get('/'))
+        assert response.status_code == 204
+
+
+@pytest.mark.django_db
+class TestAsyncQueries:
+    """Async ORM path tests."""
+
+    def test_dashboard_counts(self, hub_id, training_program, skill):
+        """Test dashboard counts gathered concurrently."""
+        counts = async_to_sync(dashboard_counts)(hub_id)
+        assert counts == {
+            'total_training_programs': 1,
+            'total_skills': 1,
+            'total_employee_trainings': 0,
+        }
+
+    def test_list_tools_aexecute(self, training_program):
+        """Test async list tools match their sync counterparts."""
+        tool = ListTrainingPrograms()
+        assert async_to_sync(tool.aexecute)({}, None) == tool.execute({}, None)
+        tool = ListTrainingEnrollments()
+        assert async_to_sync(tool.aexecute)({}, None) == tool.execute({}, None)
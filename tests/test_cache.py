@@ -0,0 +1,30 @@
+"""Tests for the versioned cache helpers."""
+import pytest
+from django.db import transaction
+
+from training.cache import bump_version, get_version
+
+
+@pytest.mark.django_db
+class TestBumpVersion:
+    """Write version tests."""
+
+    def test_bumps_again_on_commit(self, hub_id, django_capture_on_commit_callbacks):
+        """Test a bump inside a transaction is repeated when it commits."""
+        before = get_version(hub_id, 'skill')
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                bump_version(hub_id, 'skill')
+                during = get_version(hub_id, 'skill')
+                assert during > before
+        # A reader that cached pre-commit rows under ``during`` no longer hits.
+        assert get_version(hub_id, 'skill') > during
+
+    def test_rolled_back_write_keeps_first_bump(self, hub_id):
+        """Test a rolled-back write still leaves the table invalidated once."""
+        before = get_version(hub_id, 'skill')
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                bump_version(hub_id, 'skill')
+                raise RuntimeError
+        assert get_version(hub_id, 'skill') == before + 1
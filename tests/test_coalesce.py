@@ -0,0 +1,119 @@
+"""Tests for request coalescing."""
+import asyncio
+import threading
+
+import pytest
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django.test import RequestFactory
+
+from training.coalesce import SingleFlight, coalesced, flights
+from training.models import TrainingProgram
+
+
+def _training_queries(context):
+    return [q for q in context.captured_queries if 'training_' in q['sql']]
+
+
+class TestSingleFlight:
+    """Single-flight and micro-cache tests."""
+
+    def test_concurrent_calls_share_one_run(self):
+        """Test waiters reuse the leader's result instead of running again."""
+        group = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls, results = [], []
+
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'rows'
+
+        # Threads that arrive after the leader finished hit the micro-cache.
+        threads = [threading.Thread(target=lambda: results.append(group.do('k', work, ttl=60))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        assert len(calls) == 1
+        assert results == ['rows'] * 8
+
+    def test_errors_reach_waiters_and_are_not_cached(self):
+        """Test a failing leader raises in the caller and the next call runs again."""
+        group = SingleFlight()
+        with pytest.raises(ZeroDivisionError):
+            group.do('k', lambda: 1 / 0, ttl=60)
+        assert group.do('k', lambda: 'ok', ttl=60) == 'ok'
+
+    def test_micro_cache_ttl(self):
+        """Test results are reused within the TTL and not at all with a TTL of 0."""
+        group = SingleFlight()
+        assert group.do('a', lambda: 1, ttl=60) == 1
+        assert group.do('a', lambda: 2, ttl=60) == 1
+        assert group.do('b', lambda: 1) == 1
+        assert group.do('b', lambda: 2) == 2
+
+    def test_async_calls_share_one_run(self):
+        """Test concurrent tasks await the same call."""
+        group = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'rows'
+
+        async def burst():
+            return await asyncio.gather(*(group.ado('k', work) for _ in range(5)))
+
+        assert asyncio.run(burst()) == ['rows'] * 5
+        assert len(calls) == 1
+
+
+@pytest.mark.django_db
+class TestCoalescedViews:
+    """View-level coalescing tests."""
+
+    def test_shared_context_is_materialized_and_copied(self, hub_id, training_program):
+        """Test pages are evaluated once and every caller gets its own dict."""
+        calls = []
+
+        @coalesced('trainingprogram')
+        def view(request):
+            calls.append(1)
+            qs = TrainingProgram.objects.filter(hub_id=hub_id).order_by('name')
+            return {'page_obj': Paginator(qs, 10).get_page(1)}
+
+        request = RequestFactory().get('/programs/', {'q': 'x'})
+        request.session = {'hub_id': str(hub_id)}
+        first = view(request)
+        first['extra'] = True
+        with CaptureQueriesContext(connection) as ctx:
+            second = view(request)
+        assert len(calls) == 1
+        assert not ctx.captured_queries
+        assert 'extra' not in second
+        assert [p.name for p in second['page_obj'].object_list] == ['Test Name']
+
+    def test_repeat_request_is_served_from_micro_cache(self, auth_client, training_program):
+        """Test an identical request within the TTL runs no training queries."""
+        flights.clear()
+        url = reverse('training:training_programs_list')
+        auth_client.get(url, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+        with CaptureQueriesContext(connection) as ctx:
+            response = auth_client.get(url, HTTP_HX_REQUEST='true', HTTP_HX_TARGET='datatable-body')
+        assert b'Test Name' in response.content
+        assert not _training_queries(ctx)
+
+    def test_write_starts_a_new_flight(self, auth_client, training_program):
+        """Test a write is visible on the next request."""
+        url = reverse('training:training_programs_list')
+        auth_client.get(url)
+        TrainingProgram.objects.create(hub_id=training_program.hub_id, name='Fresh Program')
+        assert b'Fresh Program' in auth_client.get(url).content
@@ -0,0 +1,90 @@
+"""Tests for the batch compliance API."""
+import datetime
+import uuid
+
+import pytest
+from django.db import connection
+from django.template import Context, Template
+from django.test.utils import CaptureQueriesContext
+
+from training.models import EmployeeTraining, TrainingProgram
+from training.services.compliance import compliance, is_certified, is_compliant
+
+TODAY = datetime.date(2026, 6, 1)
+
+
+def _complete(hub_id, program, employee_id, completed_on=TODAY - datetime.timedelta(days=10)):
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=employee_id, employee_name='Ann', program=program,
+        status='completed', completion_date=completed_on,
+    )
+
+
+@pytest.fixture
+def mandatory(hub_id):
+    """Two mandatory programs and an optional one."""
+    return [
+        TrainingProgram.objects.create(hub_id=hub_id, name='Safety', is_mandatory=True),
+        TrainingProgram.objects.create(hub_id=hub_id, name='Hygiene', is_mandatory=True),
+    ]
+
+
+@pytest.mark.django_db
+class TestCompliance:
+    """Compliance lookup tests."""
+
+    def test_mandatory_programs(self, hub_id, mandatory):
+        """Test an employee is compliant only with every mandatory program completed."""
+        full, partial, none = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        for program in mandatory:
+            _complete(hub_id, program, full)
+        _complete(hub_id, mandatory[0], partial)
+        status = compliance(hub_id, [full, partial, none], today=TODAY)
+        assert status[str(full)]['compliant'] is True
+        assert status[str(full)]['expires_on'] == TODAY + datetime.timedelta(days=355)
+        assert status[str(partial)]['missing'] == [str(mandatory[1].pk)]
+        assert status[str(none)]['compliant'] is False
+
+    def test_single_program_and_expiry(self, hub_id, training_program, settings):
+        """Test a program check honours the certification validity window."""
+        settings.TRAINING_CERTIFICATION_VALID_DAYS = 30
+        employee_id = uuid.uuid4()
+        _complete(hub_id, training_program, employee_id, TODAY - datetime.timedelta(days=40))
+        assert is_certified(hub_id, employee_id, training_program.pk, today=TODAY) is False
+        _complete(hub_id, training_program, employee_id, TODAY - datetime.timedelta(days=5))
+        assert is_certified(hub_id, employee_id, training_program.pk, today=TODAY) is True
+
+    def test_roster_is_one_query_then_cached(self, hub_id, mandatory):
+        """Test a 200-person roster costs one query per table, then none."""
+        roster = [uuid.uuid4() for _ in range(200)]
+        _complete(hub_id, mandatory[0], roster[0])
+        with CaptureQueriesContext(connection) as ctx:
+            compliance(hub_id, roster, today=TODAY)
+        assert len(ctx.captured_queries) == 2
+        with CaptureQueriesContext(connection) as ctx:
+            status = compliance(hub_id, roster, today=TODAY)
+        assert len(ctx.captured_queries) == 0
+        assert len(status) == 200
+
+    def test_writes_invalidate(self, hub_id, mandatory):
+        """Test a completion or a program change is seen on the next lookup."""
+        employee_id = uuid.uuid4()
+        _complete(hub_id, mandatory[0], employee_id)
+        assert is_compliant(hub_id, employee_id, today=TODAY) is False
+        _complete(hub_id, mandatory[1], employee_id)
+        assert is_compliant(hub_id, employee_id, today=TODAY) is True
+        TrainingProgram.objects.create(hub_id=hub_id, name='Fire', is_mandatory=True)
+        assert is_compliant(hub_id, employee_id, today=TODAY) is False
+
+    def test_badge_tag(self, hub_id, training_program):
+        """Test the roster tags render a badge per employee."""
+        employee_id = uuid.uuid4()
+        _complete(hub_id, training_program, employee_id)
+        template = Template(
+            '{% load training_compliance %}'
+            '{% training_compliance ids program_id=program hub_id=hub as status %}'
+            '{% for id in ids %}{% compliance_badge status id %}{% endfor %}'
+        )
+        html = template.render(Context({'ids': [employee_id, uuid.uuid4()], 'program': training_program.pk, 'hub': hub_id}))
+        assert 'Certified' in html
+        assert 'Not certified' in html
@@ -0,0 +1,91 @@
+"""Tests for the denormalized program enrollment counters."""
+import uuid
+
+import pytest
+from django.core.management import call_command
+
+from training.models import EmployeeTraining, TrainingProgram
+from training.services.counters import reconcile_counters, remove_enrollment_counters, with_completion_ratio
+
+
+def _enroll(hub_id, program, **fields):
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann', program=program, **fields,
+    )
+
+
+def _counters(program):
+    program = TrainingProgram.all_objects.get(pk=program.pk)
+    return program.enrollment_count, program.in_progress_count, program.completed_count
+
+
+@pytest.mark.django_db
+class TestCounters:
+    """Program counter tests."""
+
+    def test_create_and_status_change(self, hub_id, training_program):
+        """Test counters follow enrollment creates and status changes."""
+        enrollment = _enroll(hub_id, training_program)
+        _enroll(hub_id, training_program, status='in_progress')
+        assert _counters(training_program) == (2, 1, 0)
+
+        enrollment.status = 'completed'
+        enrollment.save()
+        assert _counters(training_program) == (2, 1, 1)
+        assert TrainingProgram.objects.get(pk=training_program.pk).completion_rate == 50
+
+    def test_soft_and_hard_delete(self, hub_id, training_program):
+        """Test soft deletes, hard deletes and program moves release their counts."""
+        other = TrainingProgram.objects.create(hub_id=hub_id, name='Other')
+        first = _enroll(hub_id, training_program, status='completed')
+        second = _enroll(hub_id, training_program)
+
+        first.is_deleted = True
+        first.save()
+        second.program = other
+        second.save()
+        assert _counters(training_program) == (0, 0, 0)
+        assert _counters(other) == (1, 0, 0)
+
+        second.delete()
+        assert _counters(other) == (0, 0, 0)
+
+    def test_bulk_removal(self, hub_id, training_program):
+        """Test a queryset update is subtracted before it runs."""
+        for status in ('enrolled', 'completed', 'completed'):
+            _enroll(hub_id, training_program, status=status)
+        qs = EmployeeTraining.objects.filter(hub_id=hub_id, status='completed')
+        remove_enrollment_counters(qs)
+        qs.update(is_deleted=True)
+        assert _counters(training_program) == (1, 0, 0)
+
+    def test_program_save_keeps_counters(self, hub_id, training_program):
+        """Test saving a stale program instance does not overwrite its counters."""
+        _enroll(hub_id, training_program)
+        training_program.name = 'Renamed'
+        training_program.save()
+        assert _counters(training_program) == (1, 0, 0)
+
+    def test_reconcile(self, hub_id, training_program):
+        """Test reconciliation repairs drift and leaves correct programs alone."""
+        _enroll(hub_id, training_program, status='completed')
+        healthy = TrainingProgram.objects.create(hub_id=hub_id, name='Healthy')
+        _enroll(hub_id, healthy)
+        TrainingProgram.all_objects.filter(pk=training_program.pk).update(enrollment_count=7, completed_count=-2)
+
+        assert reconcile_counters(hub_id) == 1
+        assert _counters(training_program) == (1, 0, 1)
+        assert _counters(healthy) == (1, 0, 0)
+        call_command('training_reconcile_counters', hub=[str(hub_id)])
+        assert reconcile_counters(hub_id) == 0
+
+    def test_sort_by_completion(self, hub_id, training_program):
+        """Test programs sort by completion ratio without touching enrollments."""
+        busy = TrainingProgram.objects.create(hub_id=hub_id, name='Busy')
+        _enroll(hub_id, training_program, status='completed')
+        _enroll(hub_id, busy, status='completed')
+        _enroll(hub_id, busy)
+        _enroll(hub_id, busy)
+        qs = with_completion_ratio(TrainingProgram.objects.filter(hub_id=hub_id))
+        assert [p.name for p in qs.order_by('-completion_ratio')] == ['Test Name', 'Busy']
+        assert [p.name for p in qs.order_by('-enrollment_count')] == ['Busy', 'Test Name']
@@ -0,0 +1,76 @@
+"""Tests for idempotent enrollment."""
+import uuid
+
+import pytest
+from django.db import IntegrityError, transaction
+
+from training.models import EmployeeTraining, TrainingHoursEntry, TrainingProgram
+from training.services.enrollment import complete_enrollments, enroll_employee, soft_delete_enrollments
+
+
+@pytest.mark.django_db
+class TestEnrollEmployee:
+    """enroll_employee tests."""
+
+    def test_enroll_is_idempotent(self, training_program):
+        """Test enrolling twice returns the existing active enrollment."""
+        employee_id = uuid.uuid4()
+        first, created = enroll_employee(training_program, employee_id, 'Ann')
+        second, created_again = enroll_employee(training_program, employee_id, 'Ann')
+        assert created is True
+        assert created_again is False
+        assert first.pk == second.pk
+        assert EmployeeTraining.objects.filter(employee_id=employee_id).count() == 1
+
+    def test_closed_enrollment_allows_reenroll(self, training_program):
+        """Test a completed enrollment does not block a new active one."""
+        employee_id = uuid.uuid4()
+        enroll_employee(training_program, employee_id, 'Ann', status='completed')
+        _, created = enroll_employee(training_program, employee_id, 'Ann')
+        assert created is True
+
+    def test_constraint_rejects_duplicate_active(self, hub_id, training_program):
+        """Test the partial unique constraint rejects a second active row."""
+        employee_id = uuid.uuid4()
+        enroll_employee(training_program, employee_id, 'Ann')
+        with pytest.raises(IntegrityError), transaction.atomic():
+            EmployeeTraining.objects.create(
+                hub_id=hub_id, employee_id=employee_id, employee_name='Ann', program=training_program,
+            )
+
+    def test_soft_deleted_does_not_block(self, training_program):
+        """Test a soft-deleted enrollment does not count as active."""
+        employee_id = uuid.uuid4()
+        enrollment, _ = enroll_employee(training_program, employee_id, 'Ann')
+        enrollment.is_deleted = True
+        enrollment.save()
+        _, created = enroll_employee(training_program, employee_id, 'Ann')
+        assert created is True
+
+
+@pytest.mark.django_db
+class TestBulkEnrollmentChanges:
+    """Chunked bulk action tests."""
+
+    def test_soft_delete_in_chunks(self, hub_id, training_program):
+        """Test every chunk is removed from the counters and hours ledger."""
+        for i in range(5):
+            enroll_employee(training_program, uuid.uuid4(), f'Ann {i}', status='completed')
+        assert TrainingHoursEntry.objects.filter(hub_id=hub_id, is_deleted=False).count() == 5
+
+        assert soft_delete_enrollments(EmployeeTraining.objects.filter(hub_id=hub_id), chunk_size=2) == 5
+        assert not EmployeeTraining.objects.filter(hub_id=hub_id).exists()
+        assert TrainingProgram.objects.get(pk=training_program.pk).enrollment_count == 0
+        assert not TrainingHoursEntry.objects.filter(hub_id=hub_id, is_deleted=False).exists()
+
+    def test_complete_skips_closed(self, hub_id, training_program):
+        """Test completing leaves closed enrollments and their dates alone."""
+        dropped, _ = enroll_employee(training_program, uuid.uuid4(), 'Ann', status='dropped')
+        for i in range(3):
+            enroll_employee(training_program, uuid.uuid4(), f'Bob {i}')
+
+        assert complete_enrollments(EmployeeTraining.objects.filter(hub_id=hub_id), chunk_size=2) == 3
+        dropped.refresh_from_db()
+        assert dropped.status == 'dropped'
+        program = TrainingProgram.objects.get(pk=training_program.pk)
+        assert (program.enrollment_count, program.completed_count) == (4, 3)
@@ -0,0 +1,110 @@
+"""Tests for the list view facets."""
+import datetime
+import uuid
+
+import pytest
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from training.facets import EMPLOYEE_TRAINING_FACETS, SKILL_FACETS, filter_list
+from training.models import EmployeeTraining, Skill, TrainingProgram
+
+
+def _enroll(hub_id, program, status='enrolled', start_date=None):
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann', program=program,
+        status=status, start_date=start_date,
+    )
+
+
+def _options(facets, param):
+    facet = next(f for f in facets if f['param'] == param)
+    return {option['value']: option['count'] for option in facet['options']}
+
+
+@pytest.fixture
+def enrollments(hub_id, training_program):
+    """Two programs, one mandatory, with enrollments in several statuses."""
+    other = TrainingProgram.objects.create(hub_id=hub_id, name='Other', is_mandatory=True)
+    _enroll(hub_id, training_program, 'enrolled', datetime.date(2026, 1, 5))
+    _enroll(hub_id, training_program, 'completed', datetime.date(2026, 2, 5))
+    _enroll(hub_id, other, 'completed', datetime.date(2026, 3, 5))
+    _enroll(hub_id, other, 'failed', datetime.date(2026, 3, 6))
+    return training_program, other
+
+
+def _filter(hub_id, query):
+    qs = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False)
+    return filter_list(EMPLOYEE_TRAINING_FACETS, qs, QueryDict(query), hub_id)
+
+
+@pytest.mark.django_db
+class TestFacets:
+    """Facet filtering and counting tests."""
+
+    def test_counts_without_selection(self, hub_id, enrollments):
+        """Test every facet counts the whole list."""
+        program, other = enrollments
+        qs, context = _filter(hub_id, '')
+        assert qs.count() == 4
+        assert _options(context['facets'], 'status') == {'enrolled': 1, 'completed': 2, 'failed': 1}
+        assert _options(context['facets'], 'program') == {str(program.pk): 2, str(other.pk): 2}
+        assert _options(context['facets'], 'mandatory') == {'0': 2, '1': 2}
+
+    def test_selection_narrows_other_facets_only(self, hub_id, enrollments):
+        """Test a status selection filters the rows and the other facets but not its own counts."""
+        program, other = enrollments
+        qs, context = _filter(hub_id, 'status=completed&status=failed')
+        assert qs.count() == 3
+        assert _options(context['facets'], 'status') == {'enrolled': 1, 'completed': 2, 'failed': 1}
+        assert _options(context['facets'], 'program') == {str(program.pk): 1, str(other.pk): 2}
+        selected = [o['value'] for o in context['facets'][0]['options'] if o['selected']]
+        assert sorted(selected) == ['completed', 'failed']
+
+    def test_facets_combine_with_date_range(self, hub_id, enrollments):
+        """Test facets and the date range combine, and bad values are ignored."""
+        program, _ = enrollments
+        qs, context = _filter(hub_id, f'mandatory=1&program={program.pk}&program=nope&date_from=2026-02-01&date_to=bad')
+        assert qs.count() == 0
+        qs, context = _filter(hub_id, 'mandatory=1&date_from=2026-03-06')
+        assert [e.status for e in qs] == ['failed']
+        assert context['date_from'] == datetime.date(2026, 3, 6)
+        assert context['date_to'] is None
+
+    def test_one_grouped_query_then_cached(self, hub_id, enrollments):
+        """Test all counts come from one query and are cached until a write."""
+        with CaptureQueriesContext(connection) as ctx:
+            _filter(hub_id, 'status=completed')
+        assert len(ctx.captured_queries) == 1
+        with CaptureQueriesContext(connection) as ctx:
+            _filter(hub_id, 'status=completed')
+        assert len(ctx.captured_queries) == 0
+        _enroll(hub_id, enrollments[0], 'completed')
+        _, context = _filter(hub_id, 'status=completed')
+        assert _options(context['facets'], 'status')['completed'] == 3
+
+    def test_program_flag_change_refreshes_counts(self, hub_id, enrollments):
+        """Test the mandatory counts follow a change on the joined program."""
+        program, _ = enrollments
+        _filter(hub_id, '')
+        program.is_mandatory = True
+        program.save()
+        _, context = _filter(hub_id, '')
+        assert _options(context['facets'], 'mandatory') == {'1': 4}
+
+    def test_skill_categories(self, hub_id):
+        """Test blank categories are grouped as uncategorized."""
+        Skill.objects.create(hub_id=hub_id, name='Welding', category='Trade')
+        Skill.objects.create(hub_id=hub_id, name='Listening')
+        qs = Skill.objects.filter(hub_id=hub_id, is_deleted=False)
+        qs, context = filter_list(SKILL_FACETS, qs, QueryDict('category='), hub_id)
+        assert [s.name for s in qs] == ['Listening']
+        labels = {o['value']: str(o['label']) for o in context['facets'][0]['options']}
+        assert labels == {'': 'Uncategorized', 'Trade': 'Trade'}
+
+    def test_list_view_filters(self, auth_client, hub_id, enrollments):
+        """Test the list view applies facets and renders their counts."""
+        response = auth_client.get(reverse('training:employee_trainings_list'), {'status': 'failed'})
+        assert response.status_code == 200
@@ -0,0 +1,128 @@
+"""Tests for the training hours ledger and its rollups."""
+import datetime
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from training.models import EmployeeTraining, HubHoursRollup, TrainingHoursEntry, TrainingSession
+from training.services.hours import employee_hours, hub_hours, quarter_bounds
+from training.services.sessions import book_seat
+
+
+def _complete(hub_id, program, employee_id, day):
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=employee_id, employee_name='Ann',
+        program=program, status='completed', completion_date=day,
+    )
+
+
+@pytest.mark.django_db
+class TestHoursLedger:
+    """Ledger and rollup maintenance tests."""
+
+    def test_quarter_bounds(self):
+        """Test quarter bounds wrap into the next year for Q4."""
+        assert quarter_bounds(2026, 1) == (datetime.date(2026, 1, 1), datetime.date(2026, 4, 1))
+        assert quarter_bounds(2026, 4) == (datetime.date(2026, 10, 1), datetime.date(2027, 1, 1))
+
+    def test_completion_records_hours_once(self, hub_id, training_program):
+        """Test completing an enrollment records one entry, even when saved again."""
+        enrollment = _complete(hub_id, training_program, uuid.uuid4(), datetime.date(2026, 2, 10))
+        enrollment.save()
+        assert TrainingHoursEntry.objects.filter(enrollment=enrollment).count() == 1
+        rollup = HubHoursRollup.objects.get(hub_id=hub_id, period=datetime.date(2026, 2, 1))
+        assert rollup.hours == Decimal('30')
+        assert rollup.entries == 1
+
+    def test_quarter_rollup_read(self, hub_id, training_program):
+        """Test quarterly employee hours sum the monthly rollups."""
+        employee_id = uuid.uuid4()
+        _complete(hub_id, training_program, employee_id, datetime.date(2026, 1, 5))
+        _complete(hub_id, training_program, employee_id, datetime.date(2026, 3, 20))
+        _complete(hub_id, training_program, employee_id, datetime.date(2026, 4, 1))
+        rows = list(employee_hours(hub_id, *quarter_bounds(2026, 1)))
+        assert len(rows) == 1
+        assert rows[0]['total_hours'] == Decimal('60')
+        assert rows[0]['total_entries'] == 2
+        assert [m.period.month for m in hub_hours(hub_id, *quarter_bounds(2026, 1))] == [1, 3]
+
+    def test_reopening_reverses_hours(self, hub_id, training_program):
+        """Test moving an enrollment out of completed reverses its hours."""
+        enrollment = _complete(hub_id, training_program, uuid.uuid4(), datetime.date(2026, 2, 10))
+        enrollment.status = 'in_progress'
+        enrollment.save()
+        assert not TrainingHoursEntry.objects.filter(enrollment=enrollment).exists()
+        rollup = HubHoursRollup.objects.get(hub_id=hub_id, period=datetime.date(2026, 2, 1))
+        assert rollup.hours == 0
+        assert rollup.entries == 0
+
+    def test_moving_completion_date_moves_hours(self, hub_id, training_program):
+        """Test changing the completion month moves hours between periods."""
+        enrollment = _complete(hub_id, training_program, uuid.uuid4(), datetime.date(2026, 2, 10))
+        enrollment.completion_date = datetime.date(2026, 5, 1)
+        enrollment.save()
+        assert HubHoursRollup.objects.get(hub_id=hub_id, period=datetime.date(2026, 2, 1)).hours == 0
+        assert HubHoursRollup.objects.get(hub_id=hub_id, period=datetime.date(2026, 5, 1)).hours == Decimal('30')
+
+    def test_undated_completion_keeps_its_period(self, hub_id, training_program, monkeypatch):
+        """Test saving an undated completion on a later day does not move its hours."""
+        enrollment = _complete(hub_id, training_program, uuid.uuid4(), None)
+        period = timezone.localdate(enrollment.created_at).replace(day=1)
+        localdate = timezone.localdate
+        monkeypatch.setattr(
+            timezone, 'localdate',
+            lambda value=None, timezone=None: localdate(value, timezone) if value else datetime.date(2030, 5, 5),
+        )
+        enrollment.employee_name = 'Renamed'
+        enrollment.save()
+        assert HubHoursRollup.objects.get(hub_id=hub_id, period=period).hours == Decimal('30')
+        assert not HubHoursRollup.objects.filter(hub_id=hub_id, period=datetime.date(2030, 5, 1)).exists()
+
+    @override_settings(TIME_ZONE='Pacific/Auckland')
+    def test_undated_completion_uses_local_day(self, hub_id, training_program, monkeypatch):
+        """Test an undated completion is dated by its local creation day, like sessions."""
+        # 20:00 UTC on Jan 31 is already Feb 1 in Auckland.
+        monkeypatch.setattr(timezone, 'now', lambda: datetime.datetime(2026, 1, 31, 20, tzinfo=datetime.timezone.utc))
+        enrollment = _complete(hub_id, training_program, uuid.uuid4(), None)
+        assert TrainingHoursEntry.objects.get(enrollment=enrollment).occurred_on == datetime.date(2026, 2, 1)
+        assert HubHoursRollup.objects.get(hub_id=hub_id, period=datetime.date(2026, 2, 1)).hours == Decimal('30')
+
+    def test_hard_delete_reverses_hours(self, hub_id, training_program):
+        """Test deleting an enrollment row reverses its hours first."""
+        enrollment = _complete(hub_id, training_program, uuid.uuid4(), datetime.date(2026, 2, 10))
+        enrollment.delete()
+        assert HubHoursRollup.objects.get(hub_id=hub_id, period=datetime.date(2026, 2, 1)).hours == 0
+
+    def test_attended_session_records_scheduled_length(self, hub_id, training_program):
+        """Test an attended booking records the session's scheduled hours."""
+        starts_at = timezone.now()
+        session = TrainingSession.objects.create(
+            hub_id=hub_id, program=training_program, starts_at=starts_at,
+            ends_at=starts_at + datetime.timedelta(minutes=90), capacity=5,
+        )
+        booking, _ = book_seat(session, uuid.uuid4(), 'Ann')
+        booking.status = 'attended'
+        booking.save()
+        assert TrainingHoursEntry.objects.get(booking=booking).hours == Decimal('1.50')
+
+
+@pytest.mark.django_db
+class TestHoursReportView:
+    """Hours report view tests."""
+
+    def test_hours_report(self, auth_client, hub_id, training_program):
+        """Test the quarterly report lists employees from the rollups."""
+        _complete(hub_id, training_program, uuid.uuid4(), datetime.date(2026, 2, 10))
+        response = auth_client.get(reverse('training:hours_report'), {'year': 2026, 'quarter': 1})
+        assert response.status_code == 200
+        assert b'Ann' in response.content
+
+    def test_bulk_delete_reverses_hours(self, auth_client, hub_id, training_program):
+        """Test the bulk delete action reverses the ledger entries it hides."""
+        enrollment = _complete(hub_id, training_program, uuid.uuid4(), datetime.date(2026, 2, 10))
+        auth_client.post(reverse('training:employee_trainings_bulk_action'), {'ids': str(enrollment.pk), 'action': 'delete'})
+        assert HubHoursRollup.objects.get(hub_id=hub_id, period=datetime.date(2026, 2, 1)).hours == 0
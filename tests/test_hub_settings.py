@@ -0,0 +1,108 @@
+"""Tests for the cached per-hub settings."""
+import datetime
+import uuid
+
+import pytest
+from django.db import connection
+from django.template import Context, Template
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from training.forms import TrainingSettingsForm
+from training.hub_settings import clear_local, get_hub_settings, request_settings
+from training.models import TrainingSettings, TranscriptJob
+from training.services.transcripts import expire_archives
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings():
+    clear_local()
+    yield
+    clear_local()
+
+
+@pytest.mark.django_db
+class TestHubSettings:
+    """Per-hub settings lookup tests."""
+
+    def test_defaults_without_row(self, hub_id, settings):
+        """Test a hub without a row gets the project defaults."""
+        settings.TRAINING_FACET_CACHE_TIMEOUT = 42
+        obj = get_hub_settings(hub_id)
+        assert obj.pk is not None and obj._state.adding
+        assert obj.default_per_page == 12
+        assert obj.search_mode == 'contains'
+        assert obj.facet_cache_timeout == 42
+
+    def test_cached_until_saved(self, hub_id):
+        """Test lookups hit neither database nor shared cache until the row changes."""
+        row = TrainingSettings.objects.create(hub_id=hub_id, default_per_page=48)
+        assert get_hub_settings(hub_id).default_per_page == 48
+        with CaptureQueriesContext(connection) as queries:
+            assert get_hub_settings(hub_id).default_per_page == 48
+        assert len(queries) == 0
+
+        row.default_per_page = 24
+        row.save()
+        assert get_hub_settings(hub_id).default_per_page == 24
+
+    def test_other_hubs_unaffected(self, hub_id):
+        """Test one hub's settings never leak into another's."""
+        TrainingSettings.objects.create(hub_id=hub_id, search_mode='prefix')
+        assert get_hub_settings(hub_id).search_mode == 'prefix'
+        assert get_hub_settings(uuid.uuid4()).search_mode == 'contains'
+
+    def test_request_memo(self, hub_id):
+        """Test a request reads its settings once."""
+        request = RequestFactory().get('/')
+        request.session = {'hub_id': hub_id}
+        first = request_settings(request)
+        TrainingSettings.objects.create(hub_id=hub_id, default_per_page=96)
+        assert request_settings(request) is first
+
+    def test_default_status_tag(self, hub_id):
+        """Test side panels can read the hub's default enrollment status."""
+        TrainingSettings.objects.create(hub_id=hub_id, default_status='in_progress')
+        request = RequestFactory().get('/')
+        request.session = {'hub_id': hub_id}
+        template = Template('{% load training_settings %}{% training_default_status as status %}{{ status }}')
+        assert template.render(Context({'request': request})) == 'in_progress'
+
+    def test_form_rejects_unknown_values(self, hub_id):
+        """Test the form only accepts offered page sizes and modes."""
+        form = TrainingSettingsForm({
+            'default_per_page': 13, 'search_mode': 'regex', 'default_status': 'enrolled',
+            'export_row_limit': 0, 'archive_retention_days': 0,
+            'count_cache_timeout': 300, 'facet_cache_timeout': 300, 'leaderboard_cache_timeout': 900,
+        }, instance=TrainingSettings(hub_id=hub_id))
+        assert not form.is_valid()
+        assert set(form.errors) == {'default_per_page', 'search_mode'}
+
+
+@pytest.mark.django_db
+class TestArchiveRetention:
+    """Transcript archive expiry tests."""
+
+    def test_expires_old_archives(self, hub_id, tmp_path):
+        """Test archives past the hub's retention are removed and their jobs hidden."""
+        TrainingSettings.objects.create(hub_id=hub_id, archive_retention_days=30)
+        now = timezone.now()
+        old_path, new_path = tmp_path / 'old.zip', tmp_path / 'new.zip'
+        old_path.write_bytes(b'zip')
+        new_path.write_bytes(b'zip')
+        old = TranscriptJob.objects.create(
+            hub_id=hub_id, status='done', archive_path=str(old_path), finished_at=now - datetime.timedelta(days=31),
+        )
+        new = TranscriptJob.objects.create(
+            hub_id=hub_id, status='done', archive_path=str(new_path), finished_at=now - datetime.timedelta(days=1),
+        )
+        other_hub = TranscriptJob.objects.create(
+            hub_id=uuid.uuid4(), status='done', finished_at=now - datetime.timedelta(days=400),
+        )
+
+        assert expire_archives(now) == 1
+        assert not old_path.exists() and new_path.exists()
+        assert TranscriptJob.all_objects.get(pk=old.pk).is_deleted
+        assert not TranscriptJob.all_objects.get(pk=new.pk).is_deleted
+        assert not TranscriptJob.all_objects.get(pk=other_hub.pk).is_deleted
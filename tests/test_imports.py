@@ -0,0 +1,17 @@
+"""Import-time guards for the training entry points."""
+import pytest
+
+from training.benchmarks.bench_import_time import MODULES, eager_lazy_modules, measure
+
+
+class TestLazyImports:
+    """Heavy dependencies must load on first use, not at import."""
+
+    @pytest.mark.parametrize('module', MODULES)
+    def test_cold_import_skips_lazy_modules(self, module):
+        """Test a cold import does not pull in export writers or tool handlers."""
+        assert eager_lazy_modules(measure(module)['new_modules']) == []
+
+    def test_eager_lazy_modules(self):
+        """Test submodules of lazy packages are reported."""
+        assert eager_lazy_modules(['openpyxl.workbook', 'openpyxlsx', 'training.views']) == ['openpyxl.workbook']
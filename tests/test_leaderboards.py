@@ -0,0 +1,75 @@
+"""Tests for the per-program leaderboards."""
+import datetime
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from training.models import EmployeeTraining, TrainingProgram
+from training.services.leaderboards import compute_top_scorers, get_leaderboard
+
+START = datetime.date(2026, 3, 2)
+
+
+def _complete(hub_id, program, name, score=None, days=0, status='completed'):
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=uuid.uuid4(), employee_name=name, program=program, status=status,
+        score=score, start_date=START, completion_date=START + datetime.timedelta(days=days),
+    )
+
+
+@pytest.mark.django_db
+class TestLeaderboards:
+    """Leaderboard ranking and caching tests."""
+
+    def test_top_scorers_per_program(self, hub_id, training_program):
+        """Test each program keeps its top N, with ties sharing a rank."""
+        other = TrainingProgram.objects.create(hub_id=hub_id, name='Other')
+        for name, score in (('Ann', 95), ('Bob', 80), ('Cid', 95), ('Dee', 60)):
+            _complete(hub_id, training_program, name, Decimal(score))
+        _complete(hub_id, other, 'Eve', Decimal(70))
+        _complete(hub_id, other, 'Fay', Decimal(99), status='failed')
+
+        board = compute_top_scorers(hub_id, 3)
+        assert [p['program_name'] for p in board] == ['Other', 'Test Name']
+        assert [(e['employee_name'], e['rank']) for e in board[0]['entries']] == [('Eve', 1)]
+        entries = board[1]['entries']
+        assert [e['rank'] for e in entries] == [1, 1, 3]
+        assert {e['employee_name'] for e in entries[:2]} == {'Ann', 'Cid'}
+
+    def test_fastest_completions(self, hub_id, training_program):
+        """Test the speed board ranks by days from start to completion."""
+        _complete(hub_id, training_program, 'Slow', days=9)
+        _complete(hub_id, training_program, 'Fast', days=2)
+        entries = get_leaderboard(hub_id, 'speed', 5)[0]['entries']
+        assert [(e['employee_name'], e['days']) for e in entries] == [('Fast', 2), ('Slow', 9)]
+
+    def test_whole_hub_is_one_query(self, hub_id):
+        """Test the number of queries does not grow with the number of programs."""
+        for i in range(20):
+            program = TrainingProgram.objects.create(hub_id=hub_id, name=f'Program {i:02d}')
+            _complete(hub_id, program, 'Ann', Decimal(90))
+        with CaptureQueriesContext(connection) as ctx:
+            board = compute_top_scorers(hub_id, 10)
+        assert len(board) == 20
+        assert len(ctx.captured_queries) == 1
+
+    def test_cached_until_scores_change(self, hub_id, training_program):
+        """Test the board is served from the cache and refreshed on a score change."""
+        enrollment = _complete(hub_id, training_program, 'Ann', Decimal(50))
+        get_leaderboard(hub_id)
+        with CaptureQueriesContext(connection) as ctx:
+            get_leaderboard(hub_id)
+        assert len(ctx.captured_queries) == 0
+        enrollment.score = Decimal(75)
+        enrollment.save()
+        assert get_leaderboard(hub_id)[0]['entries'][0]['score'] == Decimal(75)
+
+    def test_leaderboard_view(self, auth_client):
+        """Test the leaderboard page and JSON output render."""
+        url = reverse('training:leaderboard')
+        assert auth_client.get(url).status_code == 200
+        assert auth_client.get(url, {'kind': 'speed', 'format': 'json'}).json() == {'kind': 'speed', 'programs': []}
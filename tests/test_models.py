@@ -1,4 +1,6 @@
 """Tests for training models."""
+import uuid
+
 import pytest
 from django.utils import timezone
 
@@ -109,3 +111,24 @@ class TestEmployeeTraining:
         assert EmployeeTraining.objects.filter(hub_id=hub_id).count() == 0
 
 
+@pytest.mark.django_db
+class TestProgramNameDenormalization:
+    """EmployeeTraining.program_name sync tests."""
+
+    def test_set_on_create(self, hub_id, training_program):
+        """Test program_name is copied from the program on create."""
+        enrollment = EmployeeTraining.objects.create(
+            hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann', program=training_program,
+        )
+        assert enrollment.program_name == training_program.name
+
+    def test_rename_updates_enrollments(self, hub_id, training_program):
+        """Test renaming a program updates existing enrollments."""
+        enrollment = EmployeeTraining.objects.create(
+            hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann', program=training_program,
+        )
+        program = TrainingProgram.objects.get(pk=training_program.pk)
+        program.name = 'Renamed'
+        program.save()
+        enrollment.refresh_from_db()
+        assert enrollment.program_name == 'Renamed'
@@ -0,0 +1,63 @@
+"""Tests for training counting strategies."""
+import pytest
+
+from training import pagination
+from training.models import TrainingProgram
+from training.pagination import CountingPaginator, EstimatingPaginator, round_estimate
+
+
+@pytest.mark.django_db
+class TestCountingPaginator:
+    """CountingPaginator tests."""
+
+    def test_exact_count(self, hub_id, training_program):
+        """Test exact count for small tables."""
+        qs = TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False)
+        paginator = CountingPaginator(qs, 12, hub_id=hub_id)
+        assert paginator.count == 1
+        assert paginator.count_is_estimate is False
+
+    def test_count_is_cached(self, hub_id, training_program, django_assert_num_queries):
+        """Test repeated counts are served from the cache."""
+        qs = TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False)
+        assert CountingPaginator(qs, 12, hub_id=hub_id).count == 1
+        with django_assert_num_queries(0):
+            assert CountingPaginator(qs, 12, hub_id=hub_id).count == 1
+
+    def test_write_invalidates_count(self, hub_id, training_program):
+        """Test a save bumps the version and refreshes the count."""
+        qs = TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False)
+        assert CountingPaginator(qs, 12, hub_id=hub_id).count == 1
+        TrainingProgram.objects.create(hub_id=hub_id, name='Another')
+        assert CountingPaginator(qs, 12, hub_id=hub_id).count == 2
+
+    def test_estimate_above_threshold(self, hub_id, training_program, monkeypatch, settings):
+        """Test planner estimates replace exact counts above the threshold."""
+        settings.TRAINING_COUNT_ESTIMATE_THRESHOLD = 1000
+        monkeypatch.setattr(pagination, 'planner_estimate', lambda qs: 241873)
+        qs = TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False)
+        paginator = CountingPaginator(qs, 12, hub_id=hub_id)
+        assert paginator.count == 240000
+        assert paginator.count_is_estimate is True
+
+    def test_round_estimate(self):
+        """Test estimates round to two significant digits."""
+        assert round_estimate(42) == 42
+        assert round_estimate(241873) == 240000
+        assert round_estimate(1260) == 1300
+
+
+@pytest.mark.django_db
+class TestEstimatingPaginator:
+    """EstimatingPaginator tests."""
+
+    def test_exact_below_threshold(self, hub_id, training_program):
+        """Test small results are counted exactly, without an estimate."""
+        qs = TrainingProgram.objects.filter(hub_id=hub_id)
+        assert EstimatingPaginator(qs, 100).count == 1
+
+    def test_estimate_above_threshold(self, training_program, monkeypatch, settings):
+        """Test the planner estimate is used across hubs above the threshold."""
+        settings.TRAINING_COUNT_ESTIMATE_THRESHOLD = 1000
+        monkeypatch.setattr(pagination, 'planner_estimate', lambda qs: 2_412_345)
+        assert EstimatingPaginator(TrainingProgram.objects.all(), 100).count == 2_400_000
@@ -0,0 +1,74 @@
+"""Tests for hub partitioning of enrollments."""
+import re
+import uuid
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from training.models import EmployeeTraining, TrainingProgram
+from training import partitioning
+from training.partitioning import is_partitioned, partition_enrollments, partition_names, supports_partitioning
+
+postgres_only = pytest.mark.skipif(
+    not supports_partitioning(connection), reason='declarative partitioning needs PostgreSQL 11+',
+)
+
+
+@pytest.mark.django_db
+class TestPartitioningFallback:
+    """Behaviour on databases without partitioning."""
+
+    def test_other_databases_keep_the_table(self, settings):
+        """Test the conversion is a no-op where partitioning is unsupported or off."""
+        settings.TRAINING_ENROLLMENT_PARTITIONS = 0
+        assert partition_enrollments(connection) is False
+        if not supports_partitioning(connection):
+            assert partition_enrollments(connection, partitions=4) is False
+            assert partition_names(connection) == []
+
+    def test_command_reports_unsupported(self, capsys):
+        """Test the command explains why nothing was done."""
+        if supports_partitioning(connection):
+            pytest.skip('runs on databases without partitioning')
+        call_command('training_partition_enrollments', partitions=4)
+        assert 'does not support partitioning' in capsys.readouterr().out
+
+
+@postgres_only
+@pytest.mark.django_db(transaction=True)
+class TestPartitioning:
+    """Conversion tests; they leave the test table partitioned."""
+
+    def test_convert_in_batches_and_prune(self, monkeypatch):
+        """Test rows survive a batched conversion, including writes made during the copy."""
+        hubs = [uuid.uuid4() for _ in range(3)]
+        programs = []
+        for hub_id in hubs:
+            program = TrainingProgram.objects.create(hub_id=hub_id, name='Program')
+            programs.append(program)
+            for i in range(3):
+                EmployeeTraining.objects.create(
+                    hub_id=hub_id, employee_id=uuid.uuid4(), employee_name=f'E{i}', program=program,
+                )
+        copy_batches = partitioning._copy_batches
+
+        def copy_then_write(*args, **kwargs):
+            copied = copy_batches(*args, **kwargs)
+            EmployeeTraining.objects.filter(hub_id=hubs[0]).update(employee_name='Renamed')
+            EmployeeTraining.objects.filter(hub_id=hubs[1]).first().delete()
+            EmployeeTraining.objects.create(
+                hub_id=hubs[2], employee_id=uuid.uuid4(), employee_name='Late', program=programs[2],
+            )
+            return copied
+
+        monkeypatch.setattr(partitioning, '_copy_batches', copy_then_write)
+        if not is_partitioned(connection):
+            assert partition_enrollments(connection, partitions=4, batch_size=2) is True
+            assert EmployeeTraining.objects.filter(hub_id=hubs[0], employee_name='Renamed').count() == 3
+            assert EmployeeTraining.objects.filter(hub_id=hubs[1]).count() == 2
+            assert EmployeeTraining.objects.filter(hub_id=hubs[2], employee_name='Late').exists()
+        assert is_partitioned(connection)
+        assert EmployeeTraining.objects.filter(hub_id__in=hubs).count() == 9
+        plan = EmployeeTraining.objects.filter(hub_id=hubs[0], is_deleted=False).explain()
+        assert len(set(re.findall(r'training_employeetraining_p\d+', plan))) == 1
@@ -0,0 +1,174 @@
+"""Tests for program prerequisites and the transitive closure."""
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from training.models import EmployeeTraining, ProgramClosure, ProgramPrerequisite, TrainingProgram
+from training.services.prerequisites import (
+    PrerequisiteCycleError, add_prerequisite, missing_prerequisites, next_programs,
+    rebuild_hub_closure, remove_prerequisite,
+)
+
+
+@pytest.fixture
+def chain(db, hub_id):
+    """Advanced Forklift -> Forklift Basics -> Warehouse Safety."""
+    safety = TrainingProgram.objects.create(hub_id=hub_id, name='Warehouse Safety')
+    basics = TrainingProgram.objects.create(hub_id=hub_id, name='Forklift Basics')
+    advanced = TrainingProgram.objects.create(hub_id=hub_id, name='Advanced Forklift')
+    add_prerequisite(basics, safety)
+    add_prerequisite(advanced, basics)
+    return safety, basics, advanced
+
+
+def _closure(program):
+    return {
+        (row.prerequisite.name, row.depth)
+        for row in ProgramClosure.objects.filter(program=program).select_related('prerequisite')
+    }
+
+
+def _complete(hub_id, employee_id, program):
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=employee_id, employee_name='Ann', program=program, status='completed',
+    )
+
+
+@pytest.mark.django_db
+class TestClosure:
+    """add_prerequisite / remove_prerequisite tests."""
+
+    def test_chain_is_closed_transitively(self, chain):
+        """Test the closure holds direct and indirect prerequisites with depths."""
+        safety, basics, advanced = chain
+        assert _closure(advanced) == {('Forklift Basics', 1), ('Warehouse Safety', 2)}
+        assert _closure(basics) == {('Warehouse Safety', 1)}
+        assert _closure(safety) == set()
+
+    def test_adding_below_updates_dependents(self, hub_id, chain):
+        """Test a new edge deep in the chain reaches every dependent."""
+        safety, basics, advanced = chain
+        induction = TrainingProgram.objects.create(hub_id=hub_id, name='Induction')
+        add_prerequisite(safety, induction)
+        assert ('Induction', 3) in _closure(advanced)
+        assert ('Induction', 2) in _closure(basics)
+
+    def test_depth_is_shortest_path(self, chain):
+        """Test a direct shortcut lowers the depth of an indirect prerequisite."""
+        safety, basics, advanced = chain
+        add_prerequisite(advanced, safety)
+        assert _closure(advanced) == {('Forklift Basics', 1), ('Warehouse Safety', 1)}
+
+    def test_cycles_are_rejected(self, chain):
+        """Test direct and indirect cycles, and self-edges, raise."""
+        safety, basics, advanced = chain
+        with pytest.raises(PrerequisiteCycleError):
+            add_prerequisite(safety, advanced)
+        with pytest.raises(PrerequisiteCycleError):
+            add_prerequisite(basics, basics)
+        assert not ProgramClosure.objects.filter(program=safety).exists()
+
+    def test_adding_twice_is_idempotent(self, chain):
+        """Test re-adding an existing edge returns it."""
+        safety, basics, advanced = chain
+        edge, created = add_prerequisite(basics, safety)
+        assert not created
+        assert ProgramPrerequisite.objects.filter(program=basics).count() == 1
+
+    def test_remove_rebuilds_dependents(self, chain):
+        """Test removing an edge drops the closure rows that went through it."""
+        safety, basics, advanced = chain
+        remove_prerequisite(ProgramPrerequisite.objects.get(program=basics, requires=safety))
+        assert _closure(advanced) == {('Forklift Basics', 1)}
+        assert _closure(basics) == set()
+        # Safety no longer sits below Advanced, so this is not a cycle any more.
+        add_prerequisite(safety, advanced)
+
+    def test_rebuild_hub_closure(self, hub_id, chain):
+        """Test a full rebuild reproduces the maintained closure."""
+        safety, basics, advanced = chain
+        before = _closure(advanced)
+        ProgramClosure.objects.all().delete()
+        rebuild_hub_closure(hub_id)
+        assert _closure(advanced) == before
+
+    def test_deep_chain(self, hub_id):
+        """Test a long chain is closed end to end."""
+        programs = TrainingProgram.objects.bulk_create(
+            TrainingProgram(hub_id=hub_id, name=f'Level {i:04d}') for i in range(300)
+        )
+        ProgramPrerequisite.objects.bulk_create(
+            ProgramPrerequisite(hub_id=hub_id, program=upper, requires=lower)
+            for lower, upper in zip(programs, programs[1:])
+        )
+        rebuild_hub_closure(hub_id)
+        assert ProgramClosure.objects.get(program=programs[-1], prerequisite=programs[0]).depth == 299
+
+
+@pytest.mark.django_db
+class TestEligibility:
+    """missing_prerequisites / next_programs tests."""
+
+    def test_missing_prerequisites_nearest_first(self, chain):
+        """Test every uncompleted prerequisite is listed, nearest first."""
+        safety, basics, advanced = chain
+        assert list(missing_prerequisites(advanced, uuid.uuid4())) == [basics, safety]
+
+    def test_completed_prerequisites_are_not_missing(self, hub_id, chain):
+        """Test completions clear prerequisites, other statuses do not."""
+        safety, basics, advanced = chain
+        employee_id = uuid.uuid4()
+        _complete(hub_id, employee_id, safety)
+        EmployeeTraining.objects.create(
+            hub_id=hub_id, employee_id=employee_id, employee_name='Ann', program=basics, status='in_progress',
+        )
+        assert list(missing_prerequisites(advanced, employee_id)) == [basics]
+
+    def test_next_programs(self, hub_id, chain):
+        """Test next programs are the uncompleted ones with every prerequisite met."""
+        safety, basics, advanced = chain
+        employee_id = uuid.uuid4()
+        assert list(next_programs(hub_id, employee_id)) == [safety]
+        _complete(hub_id, employee_id, safety)
+        assert list(next_programs(hub_id, employee_id)) == [basics]
+        _complete(hub_id, employee_id, basics)
+        assert list(next_programs(hub_id, employee_id)) == [advanced]
+
+    def test_next_programs_is_one_query(self, hub_id, chain):
+        """Test next programs does not walk the graph per program."""
+        with CaptureQueriesContext(connection) as ctx:
+            list(next_programs(hub_id, uuid.uuid4()))
+        assert len(ctx.captured_queries) == 1
+
+
+@pytest.mark.django_db
+class TestPrerequisiteViews:
+    """Prerequisite view tests."""
+
+    def test_add_and_remove(self, auth_client):
+        """Test prerequisites are added and removed through the views."""
+        admin_hub = auth_client.session['hub_id']
+        program = TrainingProgram.objects.create(hub_id=admin_hub, name='Advanced Forklift')
+        basics = TrainingProgram.objects.create(hub_id=admin_hub, name='Forklift Basics')
+        url = reverse('training:program_prerequisites', args=[program.pk])
+        response = auth_client.post(url, {'requires': str(basics.pk)})
+        assert response.status_code == 200
+        edge = ProgramPrerequisite.objects.get(program=program)
+        assert edge.requires == basics
+        auth_client.post(reverse('training:prerequisite_delete', args=[edge.pk]))
+        assert not ProgramPrerequisite.objects.filter(program=program).exists()
+
+    def test_enrollment_requires_prerequisites(self, auth_client):
+        """Test enrolling is refused until prerequisites are completed."""
+        admin_hub = auth_client.session['hub_id']
+        basics = TrainingProgram.objects.create(hub_id=admin_hub, name='Forklift Basics')
+        advanced = TrainingProgram.objects.create(hub_id=admin_hub, name='Advanced Forklift')
+        add_prerequisite(advanced, basics)
+        response = auth_client.post(reverse('training:employee_training_add'), {
+            'employee_id': str(uuid.uuid4()), 'employee_name': 'Ann', 'program': str(advanced.pk),
+        })
+        assert b'Forklift Basics' in response.content
+        assert not EmployeeTraining.objects.filter(program=advanced).exists()
@@ -0,0 +1,98 @@
+"""Tests for mandatory training reminder digests."""
+import datetime
+import uuid
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from training.models import EmployeeTraining, ReminderOutbox, TrainingProgram
+from training.services.reminders import build_digests, queue_reminders
+
+
+@pytest.fixture
+def mandatory_program(db, hub_id):
+    """Create a mandatory TrainingProgram."""
+    return TrainingProgram.objects.create(hub_id=hub_id, name='Safety', duration_hours=4, is_mandatory=True)
+
+
+def _enroll(hub_id, program, status='enrolled', **fields):
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann', program=program, status=status, **fields,
+    )
+
+
+@pytest.mark.django_db
+class TestReminderDigests:
+    """Reminder digest tests."""
+
+    def test_classifies_items(self, hub_id, mandatory_program, training_program):
+        """Test overdue, not-started and expiring items are picked up; optional programs are not."""
+        today = timezone.localdate()
+        overdue = _enroll(hub_id, mandatory_program, 'in_progress', start_date=today - datetime.timedelta(days=60))
+        not_started = _enroll(hub_id, mandatory_program, start_date=today)
+        expiring = _enroll(hub_id, mandatory_program, 'completed', completion_date=today - datetime.timedelta(days=350))
+        _enroll(hub_id, training_program, start_date=today - datetime.timedelta(days=60))
+
+        digests = build_digests(hub_id, today)
+        kinds = {
+            recipient_id: [item['kind'] for item in items]
+            for (kind, recipient_id), (_, items) in digests.items() if kind == 'employee'
+        }
+        assert kinds == {
+            overdue.employee_id: ['overdue'],
+            not_started.employee_id: ['not_started'],
+            expiring.employee_id: ['expiring'],
+        }
+        assert len(digests[('manager', None)][1]) == 3
+
+    def test_renewed_completion_is_not_expiring(self, hub_id, mandatory_program):
+        """Test a later enrollment in the same program suppresses the expiry reminder."""
+        today = timezone.localdate()
+        old = _enroll(hub_id, mandatory_program, 'completed', completion_date=today - datetime.timedelta(days=350))
+        EmployeeTraining.objects.create(
+            hub_id=hub_id, employee_id=old.employee_id, employee_name='Ann',
+            program=mandatory_program, status='in_progress', start_date=today,
+        )
+        assert ('employee', old.employee_id) not in build_digests(hub_id, today)
+
+    def test_closed_retake_is_not_a_renewal(self, hub_id, mandatory_program):
+        """Test a later failed or cancelled enrollment does not suppress the expiry reminder."""
+        today = timezone.localdate()
+        old = _enroll(hub_id, mandatory_program, 'completed', completion_date=today - datetime.timedelta(days=350))
+        for status in ('failed', 'cancelled'):
+            EmployeeTraining.objects.create(
+                hub_id=hub_id, employee_id=old.employee_id, employee_name='Ann',
+                program=mandatory_program, status=status, start_date=today,
+            )
+        items = build_digests(hub_id, today)[('employee', old.employee_id)][1]
+        assert [item['kind'] for item in items] == ['expiring']
+
+    def test_lapsed_completion_is_not_expiring(self, hub_id, mandatory_program):
+        """Test a certification that expired before today is not queued again."""
+        today = timezone.localdate()
+        _enroll(hub_id, mandatory_program, 'completed', completion_date=today - datetime.timedelta(days=365 * 3))
+        assert build_digests(hub_id, today) == {}
+
+    def test_queue_deduplicates_within_window(self, hub_id, mandatory_program):
+        """Test an unchanged digest is not queued twice within the window."""
+        _enroll(hub_id, mandatory_program)
+        assert queue_reminders(hub_id) == 2
+        assert queue_reminders(hub_id) == 0
+        _enroll(hub_id, mandatory_program)
+        # The new employee and the changed manager summary are queued.
+        assert queue_reminders(hub_id) == 2
+        assert ReminderOutbox.objects.filter(hub_id=hub_id).count() == 4
+
+    def test_dedup_window_setting(self, settings, hub_id, mandatory_program):
+        """Test a zero-hour window queues every run."""
+        settings.TRAINING_REMINDER_DEDUP_HOURS = 0
+        _enroll(hub_id, mandatory_program)
+        queue_reminders(hub_id)
+        assert queue_reminders(hub_id) == 2
+
+    def test_command(self, hub_id, mandatory_program):
+        """Test the management command queues digests for every hub."""
+        _enroll(hub_id, mandatory_program)
+        call_command('training_send_reminders')
+        assert ReminderOutbox.objects.filter(hub_id=hub_id, recipient_kind='employee').count() == 1
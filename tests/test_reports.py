@@ -0,0 +1,60 @@
+"""Tests for cross-hub rollup reports."""
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from training.models import TrainingProgram, EmployeeTraining
+from training.reports import compute_hub_aggregates, iter_hub_aggregates, merge_aggregates
+
+
+def _enroll(hub_id, program, status='enrolled', score=None):
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Employee',
+        program=program, status=status, score=score,
+    )
+
+
+@pytest.mark.django_db
+class TestRollup:
+    """Rollup aggregation tests."""
+
+    def test_hub_aggregates(self, hub_id):
+        """Test totals, completion, mandatory compliance and average score."""
+        mandatory = TrainingProgram.objects.create(hub_id=hub_id, name='Safety', is_mandatory=True)
+        optional = TrainingProgram.objects.create(hub_id=hub_id, name='Excel')
+        _enroll(hub_id, mandatory, 'completed', Decimal('90'))
+        _enroll(hub_id, mandatory)
+        _enroll(hub_id, optional, 'completed', Decimal('70'))
+        row = compute_hub_aggregates(hub_id)
+        assert row['total'] == 3
+        assert row['completed'] == 2
+        assert row['mandatory_total'] == 2
+        assert row['mandatory_compliance'] == 0.5
+        assert row['average_score'] == Decimal('80.00')
+
+    def test_iter_and_merge(self, hub_id):
+        """Test per-hub rows are merged with a weighted average."""
+        other_hub = uuid.uuid4()
+        program = TrainingProgram.objects.create(hub_id=hub_id, name='Safety')
+        other_program = TrainingProgram.objects.create(hub_id=other_hub, name='Safety')
+        _enroll(hub_id, program, 'completed', Decimal('100'))
+        _enroll(other_hub, other_program, 'completed', Decimal('50'))
+        _enroll(other_hub, other_program, 'completed', Decimal('60'))
+        rows = list(iter_hub_aggregates([str(hub_id), str(other_hub)], max_workers=1))
+        assert {row['hub_id'] for row in rows} == {str(hub_id), str(other_hub)}
+        merged = merge_aggregates(rows)
+        assert merged['hubs'] == 2
+        assert merged['total'] == 3
+        assert merged['completion_rate'] == 1.0
+        assert merged['average_score'] == Decimal('70.00')
+
+    def test_cached_until_write(self, hub_id, django_assert_num_queries):
+        """Test a hub's aggregates are cached until an enrollment changes."""
+        program = TrainingProgram.objects.create(hub_id=hub_id, name='Safety')
+        _enroll(hub_id, program)
+        assert list(iter_hub_aggregates([str(hub_id)], max_workers=1))[0]['total'] == 1
+        with django_assert_num_queries(0):
+            assert list(iter_hub_aggregates([str(hub_id)], max_workers=1))[0]['total'] == 1
+        _enroll(hub_id, program)
+        assert list(iter_hub_aggregates([str(hub_id)], max_workers=1))[0]['total'] == 2
@@ -0,0 +1,111 @@
+"""Tests for read-replica routing."""
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from training.cache import bump_version
+from training.models import TrainingProgram
+from training.routers import TrainingReplicaRouter, primary, read_replica, routed_stream
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(settings):
+    """Register a 'replica' alias that mirrors the test database."""
+    connections.settings[REPLICA] = dict(connections['default'].settings_dict)
+    # Open it up front: the test case only lets pre-declared aliases connect lazily.
+    connections[REPLICA].connect()
+    settings.TRAINING_READ_REPLICA = REPLICA
+    settings.TRAINING_REPLICA_LAG_SECONDS = 5
+    settings.DATABASE_ROUTERS = ['training.routers.TrainingReplicaRouter', *settings.DATABASE_ROUTERS]
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def _training_queries(context):
+    return [q for q in context.captured_queries if 'training_' in q['sql']]
+
+
+class TestRouter:
+    """Router decision tests."""
+
+    @pytest.mark.django_db
+    def test_reads_use_primary_outside_replica_block(self, replica):
+        """Test reads default to the primary."""
+        assert TrainingReplicaRouter().db_for_read(TrainingProgram) is None
+
+    @pytest.mark.django_db
+    def test_replica_block_routes_reads(self, replica, hub_id):
+        """Test reads inside read_replica() go to the replica alias."""
+        with read_replica(hub_id, ['trainingprogram']):
+            assert TrainingReplicaRouter().db_for_read(TrainingProgram) == REPLICA
+            with primary():
+                assert TrainingReplicaRouter().db_for_read(TrainingProgram) is None
+
+    @pytest.mark.django_db
+    def test_recent_write_sticks_to_primary(self, replica, hub_id):
+        """Test a write within the lag window pins reads of that table to the primary."""
+        bump_version(hub_id, 'trainingprogram')
+        with read_replica(hub_id, ['trainingprogram']):
+            assert TrainingReplicaRouter().db_for_read(TrainingProgram) is None
+        with read_replica(hub_id, ['skill']):
+            assert TrainingReplicaRouter().db_for_read(TrainingProgram) == REPLICA
+
+    @pytest.mark.django_db
+    def test_stream_keeps_view_routing(self, replica, hub_id):
+        """Test a stream consumed after the replica block still reads from the replica."""
+        def aliases():
+            for _ in range(2):
+                yield TrainingReplicaRouter().db_for_read(TrainingProgram)
+
+        with read_replica(hub_id, ['trainingprogram']):
+            stream = routed_stream(aliases())
+        assert list(stream) == [REPLICA, REPLICA]
+        assert TrainingReplicaRouter().db_for_read(TrainingProgram) is None
+
+    def test_unconfigured_alias_is_ignored(self, settings, hub_id):
+        """Test an alias missing from DATABASES falls back to the primary."""
+        settings.TRAINING_READ_REPLICA = 'missing'
+        with read_replica(hub_id, ['trainingprogram']):
+            assert TrainingReplicaRouter().db_for_read(TrainingProgram) is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaSplit:
+    """Per-alias query counters prove the read/write split."""
+
+    def test_list_view_reads_from_replica(self, replica, settings, auth_client, training_program):
+        """Test the list view queries the replica once writes have settled."""
+        settings.TRAINING_REPLICA_LAG_SECONDS = 0
+        with CaptureQueriesContext(connections['default']) as on_primary, \
+                CaptureQueriesContext(connections[REPLICA]) as on_replica:
+            response = auth_client.get(reverse('training:training_programs_list'))
+        assert response.status_code == 200
+        assert _training_queries(on_replica)
+        assert not _training_queries(on_primary)
+
+    def test_read_after_write_uses_primary(self, replica, auth_client, training_program):
+        """Test the list shown right after an edit is read from the primary."""
+        url = reverse('training:training_program_edit', args=[training_program.pk])
+        auth_client.post(url, {'name': 'Renamed', 'duration_hours': 1})
+        with CaptureQueriesContext(connections['default']) as on_primary, \
+                CaptureQueriesContext(connections[REPLICA]) as on_replica:
+            response = auth_client.get(reverse('training:training_programs_list'))
+        assert b'Renamed' in response.content
+        assert _training_queries(on_primary)
+        assert not _training_queries(on_replica)
+
+    def test_columnar_export_reads_from_replica(self, replica, settings, auth_client, training_program):
+        """Test a streamed Parquet export fetches its rows from the replica."""
+        pytest.importorskip('pyarrow')
+        settings.TRAINING_REPLICA_LAG_SECONDS = 0
+        response = auth_client.get(reverse('training:training_programs_list'), {'export': 'parquet'})
+        with CaptureQueriesContext(connections['default']) as on_primary, \
+                CaptureQueriesContext(connections[REPLICA]) as on_replica:
+            b''.join(response.streaming_content)
+        assert _training_queries(on_replica)
+        assert not _training_queries(on_primary)
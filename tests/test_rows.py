@@ -0,0 +1,56 @@
+"""Tests for compiled datatable row rendering."""
+import datetime
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.template import Context, engines
+
+from training.models import TrainingProgram, Skill, EmployeeTraining
+from training.rows import ROW_TEMPLATE
+
+
+def _render_both(name, items):
+    engine = engines['django'].engine
+    loop = engine.from_string(
+        '{% for item in items %}{% include "' + ROW_TEMPLATE.format(name) + '" %}{% endfor %}'
+    )
+    compiled = engine.from_string(f'{{% load training_rows %}}{{% training_rows "{name}" items %}}')
+    return loop.render(Context({'items': items})), compiled.render(Context({'items': items}))
+
+
+@pytest.mark.django_db
+class TestCompiledRows:
+    """Compiled rows must match the template loop byte for byte."""
+
+    def test_training_program_rows(self, hub_id):
+        """Test training program rows, including both branches of is_mandatory."""
+        items = [
+            TrainingProgram(hub_id=hub_id, name='<Safety> & "Co"', description="O'Neil",
+                            duration_hours=8, is_mandatory=True, is_active=False),
+            TrainingProgram(hub_id=hub_id, name='Forklift', is_mandatory=False, is_active=True),
+        ]
+        loop, compiled = _render_both('training_program', items)
+        assert loop == compiled
+
+    def test_skill_rows(self, hub_id):
+        """Test skill rows."""
+        items = [Skill(hub_id=hub_id, name='Welding', category='A & B', is_active=True)]
+        loop, compiled = _render_both('skill', items)
+        assert loop == compiled
+
+    def test_employee_training_rows(self, hub_id):
+        """Test enrollment rows with dates, decimals and empty values."""
+        program = TrainingProgram(hub_id=hub_id, name='Forklift Basics')
+        items = [
+            EmployeeTraining(hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann <b>',
+                             program=program, score=Decimal('85.50'), start_date=datetime.date(2025, 1, 15)),
+            EmployeeTraining(hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Bob', program=program),
+        ]
+        loop, compiled = _render_both('employee_training', items)
+        assert loop == compiled
+
+    def test_empty(self):
+        """Test no rows renders nothing."""
+        loop, compiled = _render_both('skill', [])
+        assert loop == compiled == ''
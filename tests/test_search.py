@@ -0,0 +1,57 @@
+"""Tests for the program and employee search pickers."""
+import uuid
+
+import pytest
+from django.urls import reverse
+
+from training.forms import EmployeeTrainingForm
+from training.models import EmployeeTraining, TrainingProgram
+from training.services.search import search_employees, search_programs
+
+
+@pytest.mark.django_db
+class TestSearch:
+    """Prefix search tests."""
+
+    def test_program_prefix_is_case_insensitive(self, hub_id):
+        """Test program search matches a prefix regardless of case."""
+        TrainingProgram.objects.create(hub_id=hub_id, name='Forklift Safety')
+        TrainingProgram.objects.create(hub_id=hub_id, name='First Aid')
+        TrainingProgram.objects.create(hub_id=hub_id, name='Fire Drill', is_active=False)
+        TrainingProgram.objects.create(hub_id=hub_id, name='Food Hygiene', is_deleted=True)
+        TrainingProgram.objects.create(hub_id=uuid.uuid4(), name='Fall Protection')
+        assert [r['name'] for r in search_programs(hub_id, 'f')] == ['First Aid', 'Forklift Safety']
+
+    def test_program_search_is_limited(self, settings, hub_id):
+        """Test results are capped at TRAINING_SEARCH_LIMIT."""
+        settings.TRAINING_SEARCH_LIMIT = 3
+        for i in range(5):
+            TrainingProgram.objects.create(hub_id=hub_id, name=f'Program {i}')
+        assert len(search_programs(hub_id, 'prog')) == 3
+
+    def test_employee_search_is_distinct(self, hub_id, training_program):
+        """Test an employee with several enrollments appears once."""
+        employee_id = uuid.uuid4()
+        for status in ('completed', 'enrolled'):
+            EmployeeTraining.objects.create(
+                hub_id=hub_id, employee_id=employee_id, employee_name='Ann Lee', program=training_program, status=status,
+            )
+        assert search_employees(hub_id, 'an') == [{'employee_id': employee_id, 'employee_name': 'Ann Lee'}]
+
+    def test_program_search_view(self, auth_client, training_program):
+        """Test the endpoint returns JSON, or options for HTMX requests."""
+        url = reverse('training:program_search')
+        response = auth_client.get(url, {'q': 'test'})
+        assert response.json() == {'results': [{'id': str(training_program.pk), 'label': 'Test Name'}]}
+        response = auth_client.get(url, {'q': 'test'}, HTTP_HX_REQUEST='true')
+        assert f'<option value="{training_program.pk}">Test Name</option>'.encode() in response.content
+
+    def test_form_renders_only_selected_program(self, hub_id, training_program):
+        """Test the form widget does not render every program as an option."""
+        TrainingProgram.objects.create(hub_id=hub_id, name='Other Program')
+        enrollment = EmployeeTraining.objects.create(
+            hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann', program=training_program,
+        )
+        html = str(EmployeeTrainingForm(instance=enrollment, hub_id=hub_id)['program'])
+        assert 'Test Name' in html
+        assert 'Other Program' not in html
@@ -0,0 +1,166 @@
+"""Tests for session seat allocation and the waitlist."""
+import threading
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.db import IntegrityError, connection, connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from training.models import SessionBooking, TrainingHoursEntry, TrainingSession
+from training.services.sessions import book_seat, cancel_booking, set_attendance
+
+
+@pytest.fixture
+def training_session(db, hub_id, training_program):
+    """Create a TrainingSession with two seats."""
+    return TrainingSession.objects.create(
+        hub_id=hub_id,
+        program=training_program,
+        starts_at=timezone.now() + timedelta(days=7),
+        location='Room 1',
+        capacity=2,
+    )
+
+
+@pytest.mark.django_db
+class TestBookSeat:
+    """book_seat / cancel_booking tests."""
+
+    def test_confirms_until_full_then_waitlists(self, training_session):
+        """Test seats are confirmed up to capacity and later bookings wait."""
+        results = [book_seat(training_session, uuid.uuid4(), f'E{i}')[0] for i in range(4)]
+        assert [b.status for b in results] == ['confirmed', 'confirmed', 'waitlisted', 'waitlisted']
+        training_session.refresh_from_db()
+        assert training_session.seats_taken == 2
+        assert training_session.seats_available == 0
+
+    def test_booking_twice_returns_existing(self, training_session):
+        """Test booking the same employee twice keeps one seat."""
+        employee_id = uuid.uuid4()
+        first, created = book_seat(training_session, employee_id, 'Ann')
+        second, created_again = book_seat(training_session, employee_id, 'Ann')
+        assert created is True
+        assert created_again is False
+        assert first.pk == second.pk
+        training_session.refresh_from_db()
+        assert training_session.seats_taken == 1
+
+    def test_cancel_promotes_oldest_waitlisted(self, training_session):
+        """Test a cancelled seat goes to the oldest waitlisted booking."""
+        confirmed = [book_seat(training_session, uuid.uuid4(), f'E{i}')[0] for i in range(2)]
+        first_waiting, _ = book_seat(training_session, uuid.uuid4(), 'W1')
+        book_seat(training_session, uuid.uuid4(), 'W2')
+        promoted = cancel_booking(confirmed[0])
+        assert [b.pk for b in promoted] == [first_waiting.pk]
+        first_waiting.refresh_from_db()
+        assert first_waiting.status == 'confirmed'
+        training_session.refresh_from_db()
+        assert training_session.seats_taken == 2
+
+    def test_cancel_waitlisted_keeps_seats(self, training_session):
+        """Test cancelling a waitlist entry does not free a seat."""
+        for i in range(2):
+            book_seat(training_session, uuid.uuid4(), f'E{i}')
+        waiting, _ = book_seat(training_session, uuid.uuid4(), 'W1')
+        assert cancel_booking(waiting) == []
+        training_session.refresh_from_db()
+        assert training_session.seats_taken == 2
+
+    def test_attendance_records_hours(self, training_session):
+        """Test marking a booking attended records its hours and undoing reverses them."""
+        booking, _ = book_seat(training_session, uuid.uuid4(), 'Ann')
+        assert set_attendance(booking).status == 'attended'
+        assert TrainingHoursEntry.objects.filter(booking=booking).count() == 1
+        assert set_attendance(booking, attended=False).status == 'confirmed'
+        assert not TrainingHoursEntry.objects.filter(booking=booking).exists()
+
+    def test_waitlisted_cannot_attend(self, training_session):
+        """Test only seat holders can be marked attended."""
+        for i in range(2):
+            book_seat(training_session, uuid.uuid4(), f'E{i}')
+        waiting, _ = book_seat(training_session, uuid.uuid4(), 'W1')
+        assert set_attendance(waiting).status == 'waitlisted'
+
+    def test_constraint_rejects_overbooking(self, training_session):
+        """Test the check constraint rejects seats_taken above capacity."""
+        with pytest.raises(IntegrityError), transaction.atomic():
+            TrainingSession.objects.filter(pk=training_session.pk).update(seats_taken=3)
+
+
+@pytest.mark.skipif(connection.vendor == 'sqlite', reason='SQLite serializes all writers')
+@pytest.mark.django_db(transaction=True)
+class TestBookSeatConcurrency:
+    """Concurrent booking stress test."""
+
+    def test_concurrent_bookings_never_overbook(self, hub_id, training_program):
+        """Test 50 concurrent bookings for 10 seats confirm exactly 10."""
+        session = TrainingSession.objects.create(
+            hub_id=hub_id, program=training_program, starts_at=timezone.now(), capacity=10,
+        )
+        barrier = threading.Barrier(50)
+        errors = []
+
+        def book(i):
+            try:
+                barrier.wait()
+                book_seat(session, uuid.uuid4(), f'E{i}')
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=book, args=(i,)) for i in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        session.refresh_from_db()
+        assert session.seats_taken == 10
+        assert SessionBooking.objects.filter(session=session, status='confirmed').count() == 10
+        assert SessionBooking.objects.filter(session=session, status='waitlisted').count() == 40
+
+
+@pytest.mark.django_db
+class TestSessionViews:
+    """Session view tests."""
+
+    def test_program_sessions(self, auth_client, training_session):
+        """Test the program sessions page lists sessions."""
+        url = reverse('training:program_sessions', args=[training_session.program_id])
+        response = auth_client.get(url)
+        assert response.status_code == 200
+        assert b'Room 1' in response.content
+
+    def test_book_and_cancel(self, auth_client, training_session):
+        """Test booking and cancelling through the views."""
+        employee_id = uuid.uuid4()
+        response = auth_client.post(
+            reverse('training:session_book', args=[training_session.pk]),
+            {'employee_id': str(employee_id), 'employee_name': 'Ann'},
+        )
+        assert response.status_code == 200
+        booking = SessionBooking.objects.get(session=training_session, employee_id=employee_id)
+        assert booking.status == 'confirmed'
+        response = auth_client.post(reverse('training:booking_cancel', args=[booking.pk]))
+        assert response.status_code == 200
+        booking.refresh_from_db()
+        assert booking.status == 'cancelled'
+
+    def test_attendance_view(self, auth_client, training_session):
+        """Test marking attendance through the view."""
+        booking, _ = book_seat(training_session, uuid.uuid4(), 'Ann')
+        response = auth_client.post(reverse('training:booking_attendance', args=[booking.pk]), {'attended': '1'})
+        assert response.status_code == 200
+        booking.refresh_from_db()
+        assert booking.status == 'attended'
+
+    def test_invalid_capacity(self, auth_client, training_session):
+        """Test a non-numeric capacity re-renders with an error instead of failing."""
+        url = reverse('training:program_sessions', args=[training_session.program_id])
+        response = auth_client.post(url, {'starts_at': '2030-01-01T09:00', 'capacity': 'ten'})
+        assert response.status_code == 200
+        assert TrainingSession.objects.filter(program_id=training_session.program_id).count() == 1
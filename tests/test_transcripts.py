@@ -0,0 +1,153 @@
+"""Tests for batch transcript generation."""
+import datetime
+import os
+import uuid
+import zipfile
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from training.models import EmployeeTraining, TranscriptJob
+from training.services.transcripts import (
+    PROGRESS_EVERY, claim_jobs, create_job, iter_payloads, run_job, staging_dir,
+)
+
+
+@pytest.fixture
+def transcript_dir(settings, tmp_path):
+    """Write transcripts under a temporary directory."""
+    settings.TRAINING_TRANSCRIPT_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def employees(db, hub_id, training_program):
+    """Three employees with one completed enrollment each."""
+    ids = [uuid.uuid4() for _ in range(3)]
+    for i, employee_id in enumerate(ids):
+        EmployeeTraining.objects.create(
+            hub_id=hub_id, employee_id=employee_id, employee_name=f'Employee {i}',
+            program=training_program, status='completed', score=80 + i,
+        )
+    return ids
+
+
+def _archive_names(job):
+    with zipfile.ZipFile(job.archive_path) as archive:
+        return sorted(archive.namelist())
+
+
+@pytest.mark.django_db
+class TestTranscripts:
+    """Transcript job tests."""
+
+    def test_create_job_defaults_to_every_employee(self, hub_id, employees):
+        """Test a job without employees covers everyone in the hub."""
+        job = create_job(hub_id)
+        assert job.total == 3
+        assert sorted(job.employee_ids) == sorted(str(e) for e in employees)
+
+    def test_pdf_requires_weasyprint(self, hub_id, monkeypatch):
+        """Test PDF jobs are refused when the renderer is not installed."""
+        monkeypatch.setattr('training.services.transcripts.pdf_available', lambda: False)
+        with pytest.raises(ValueError):
+            create_job(hub_id, [uuid.uuid4()], fmt='pdf')
+
+    def test_payloads_are_fetched_in_batches(self, hub_id, employees):
+        """Test enrollments and hours are read with two queries per batch."""
+        ids = [str(e) for e in employees]
+        with CaptureQueriesContext(connection) as ctx:
+            payloads = list(iter_payloads(hub_id, ids, batch_size=2))
+        assert len(ctx.captured_queries) == 4
+        assert [p['employee_id'] for p in payloads] == ids
+        assert all(p['completed'] == 1 for p in payloads)
+
+    def test_run_job_builds_archive(self, hub_id, employees, transcript_dir):
+        """Test every employee gets a document in the archive and staging is removed."""
+        job = run_job(create_job(hub_id), workers=1)
+        assert job.status == 'done'
+        assert job.rendered == 3
+        names = _archive_names(job)
+        assert len(names) == 3
+        assert all(name.startswith('employee-') and name.endswith('.html') for name in names)
+        assert not os.path.exists(staging_dir(job))
+
+    def test_process_pool(self, hub_id, employees, transcript_dir):
+        """Test documents rendered by worker processes end up in the archive."""
+        job = run_job(create_job(hub_id), workers=2)
+        assert len(_archive_names(job)) == 3
+
+    def test_resume_skips_rendered_documents(self, hub_id, employees, transcript_dir):
+        """Test an interrupted job only renders what is missing."""
+        job = create_job(hub_id)
+        directory = staging_dir(job)
+        os.makedirs(directory)
+        done = f'employee-0_{job.employee_ids[0]}.html'
+        with open(os.path.join(directory, done), 'w') as out:
+            out.write('already rendered')
+        job = run_job(job, workers=1)
+        with zipfile.ZipFile(job.archive_path) as archive:
+            assert archive.read(done) == b'already rendered'
+            assert len(archive.namelist()) == 3
+
+    def test_claim_skips_live_running_jobs(self, hub_id, employees, transcript_dir):
+        """Test only pending and stale running jobs are claimed."""
+        pending = create_job(hub_id)
+        running = create_job(hub_id)
+        TranscriptJob.objects.filter(pk=running.pk).update(status='running')
+        assert [job.pk for job in claim_jobs()] == [pending.pk]
+
+    def test_slow_archive_write_is_not_reclaimed(self, hub_id, employees, transcript_dir, settings, monkeypatch):
+        """Test a job stays claimed while a long archive write is in progress."""
+        settings.TRAINING_TRANSCRIPT_STALE_SECONDS = 300
+        job = create_job(hub_id)
+        directory = staging_dir(job)
+        os.makedirs(directory)
+        for i in range(PROGRESS_EVERY * 2):
+            with open(os.path.join(directory, f'filler-{i}_{i}.html'), 'w') as out:
+                out.write('filler')
+
+        clock = [timezone.now()]
+        monkeypatch.setattr(timezone, 'now', lambda: clock[0])
+        write = zipfile.ZipFile.write
+
+        def slow_write(archive, *args, **kwargs):
+            # Each document takes 10s, so the whole archive outlasts the stale limit.
+            clock[0] += datetime.timedelta(seconds=10)
+            assert list(claim_jobs()) == []
+            return write(archive, *args, **kwargs)
+
+        monkeypatch.setattr(zipfile.ZipFile, 'write', slow_write)
+        job = run_job(job, workers=1)
+        assert job.status == 'done'
+        assert len(_archive_names(job)) == PROGRESS_EVERY * 2 + 3
+
+    def test_command_runs_pending_jobs(self, hub_id, employees, transcript_dir, settings):
+        """Test the management command finishes queued jobs."""
+        settings.TRAINING_TRANSCRIPT_WORKERS = 1
+        job = create_job(hub_id)
+        call_command('training_run_transcripts', verbosity=0)
+        job.refresh_from_db()
+        assert job.status == 'done'
+
+    def test_command_rejects_malformed_job_id(self):
+        """Test an unparseable job id is reported as not found."""
+        with pytest.raises(CommandError):
+            call_command('training_run_transcripts', job='nope', verbosity=0)
+
+    def test_malformed_employee_ids_are_rejected(self, auth_client, transcript_dir):
+        """Test a request with only malformed employee ids queues nothing."""
+        response = auth_client.post(reverse('training:transcripts'), {'employee_id': ['nope']})
+        assert response.status_code == 200
+        assert not TranscriptJob.objects.exists()
+
+    def test_status_endpoint(self, auth_client, transcript_dir):
+        """Test the status endpoint reports progress as JSON."""
+        job = create_job(auth_client.session['hub_id'], [uuid.uuid4()])
+        response = auth_client.get(reverse('training:transcript_status', args=[job.pk]))
+        assert response.json()['status'] == 'pending'
+        assert response.json()['total'] == 1
@@ -0,0 +1,102 @@
+"""Tests for the trend and cohort rollups."""
+import datetime
+import uuid
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from training.models import CohortRollup, EmployeeTraining, TrendRollup
+from training.services.trends import backfill_trends, cohorts, period_start, remove_enrollment_trends, trend
+
+JAN_10 = datetime.date(2026, 1, 10)
+
+
+def _enroll(hub_id, program, **fields):
+    fields.setdefault('start_date', JAN_10)
+    return EmployeeTraining.objects.create(
+        hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann', program=program, **fields,
+    )
+
+
+def _snapshot(hub_id):
+    trends = {
+        (r.program_id, r.grain, r.period): (r.enrolled, r.completed, r.failed)
+        for r in TrendRollup.objects.filter(hub_id=hub_id)
+        if r.enrolled or r.completed or r.failed
+    }
+    cohort_rows = {
+        (r.program_id, r.cohort): (r.enrolled, r.completed, r.completed_7d, r.completed_30d, r.completed_90d)
+        for r in CohortRollup.objects.filter(hub_id=hub_id)
+        if r.enrolled
+    }
+    return trends, cohort_rows
+
+
+@pytest.mark.django_db
+class TestTrends:
+    """Incremental trend and cohort rollup tests."""
+
+    def test_period_start(self):
+        """Test weeks start on Monday and months on the 1st."""
+        assert period_start('week', datetime.date(2026, 1, 10)) == datetime.date(2026, 1, 5)
+        assert period_start('month', datetime.date(2026, 1, 10)) == datetime.date(2026, 1, 1)
+
+    def test_enrollment_counts_for_program_and_hub(self, hub_id, training_program):
+        """Test a new enrollment is counted per program and per hub."""
+        _enroll(hub_id, training_program)
+        month = datetime.date(2026, 1, 1)
+        assert [r.enrolled for r in trend(hub_id, 'month', month, datetime.date(2026, 2, 1))] == [1]
+        assert [r.enrolled for r in trend(hub_id, 'week', JAN_10, datetime.date(2026, 1, 12), program=training_program)] == [1]
+        assert cohorts(hub_id, month, datetime.date(2026, 2, 1)).get().enrolled == 1
+
+    def test_completion_moves_counts(self, hub_id, training_program):
+        """Test completing an enrollment counts it in its completion month and cohort windows."""
+        enrollment = _enroll(hub_id, training_program)
+        enrollment.status = 'completed'
+        enrollment.completion_date = '2026-02-05'
+        enrollment.save()
+        feb = TrendRollup.objects.get(hub_id=hub_id, program=None, grain='month', period=datetime.date(2026, 2, 1))
+        assert (feb.enrolled, feb.completed) == (0, 1)
+        cohort = CohortRollup.objects.get(hub_id=hub_id, program=None, cohort=datetime.date(2026, 1, 1))
+        assert (cohort.completed, cohort.completed_7d, cohort.completed_30d, cohort.completed_90d) == (1, 0, 1, 1)
+
+        enrollment.status = 'failed'
+        enrollment.save()
+        feb.refresh_from_db()
+        cohort.refresh_from_db()
+        assert (feb.completed, feb.failed) == (0, 1)
+        assert (cohort.completed, cohort.completed_30d) == (0, 0)
+
+    def test_deletes_are_subtracted(self, hub_id, training_program):
+        """Test soft, hard and bulk deletes remove an enrollment's counts."""
+        soft, hard, bulk = (_enroll(hub_id, training_program) for _ in range(3))
+        soft.is_deleted = True
+        soft.save(update_fields=['is_deleted', 'updated_at'])
+        hard.delete()
+        qs = EmployeeTraining.objects.filter(pk=bulk.pk)
+        remove_enrollment_trends(qs)
+        qs.update(is_deleted=True)
+        assert _snapshot(hub_id) == ({}, {})
+
+    def test_backfill_matches_incremental(self, hub_id, training_program):
+        """Test a rebuild reproduces the incrementally maintained rows."""
+        _enroll(hub_id, training_program)
+        _enroll(hub_id, training_program, status='completed', completion_date=datetime.date(2026, 1, 12))
+        _enroll(hub_id, training_program, status='failed', start_date=datetime.date(2025, 11, 30))
+        before = _snapshot(hub_id)
+        TrendRollup.objects.all().delete()
+        assert backfill_trends(hub_id, chunk_size=2) == 3
+        assert _snapshot(hub_id) == before
+
+    def test_backfill_command(self, hub_id, training_program):
+        """Test the management command rebuilds every hub."""
+        _enroll(hub_id, training_program)
+        TrendRollup.objects.all().delete()
+        call_command('training_backfill_trends', verbosity=0)
+        assert TrendRollup.objects.filter(hub_id=hub_id).count() == 4
+
+    def test_trends_view(self, auth_client):
+        """Test the trends report renders."""
+        response = auth_client.get(reverse('training:trends_report'), {'grain': 'week'})
+        assert response.status_code == 200
@@ -1,7 +1,11 @@
 """Tests for training views."""
+import uuid
+
 import pytest
 from django.urls import reverse
 
+from training.models import TrainingProgram, EmployeeTraining
+
 
 @pytest.mark.django_db
 class TestDashboard:
@@ -130,6 +134,23 @@ class TestTrainingProgramViews:
         training_program.refresh_from_db()
         assert training_program.is_deleted is True
 
+    def test_conditional_get_not_modified(self, auth_client, training_program):
+        """Test a matching If-None-Match is answered with 304."""
+        url = reverse('training:training_programs_list')
+        response = auth_client.get(url, HTTP_HX_REQUEST='true')
+        etag = response['ETag']
+        response = auth_client.get(url, HTTP_HX_REQUEST='true', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_conditional_get_after_write(self, auth_client, hub_id, training_program):
+        """Test a write invalidates the previous ETag."""
+        url = reverse('training:training_programs_list')
+        etag = auth_client.get(url)['ETag']
+        TrainingProgram.objects.create(hub_id=hub_id, name='Another')
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
     def test_list_requires_auth(self, client):
         """Test list requires authentication."""
         url = reverse('training:training_programs_list')
@@ -272,6 +293,16 @@ class TestEmployeeTrainingViews:
         response = auth_client.get(url, {'sort': 'created_at', 'dir': 'desc'})
         assert response.status_code == 200
 
+    def test_conditional_get_after_program_change(self, auth_client, training_program):
+        """Test a program flag change invalidates the list's ETag (mandatory facet)."""
+        url = reverse('training:employee_trainings_list')
+        etag = auth_client.get(url)['ETag']
+        training_program.is_mandatory = not training_program.is_mandatory
+        training_program.save()
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
     def test_export_csv(self, auth_client):
         """Test CSV export."""
         url = reverse('training:employee_trainings_list')
@@ -285,6 +316,21 @@ class TestEmployeeTrainingViews:
         response = auth_client.get(url, {'export': 'excel'})
         assert response.status_code == 200
 
+    def test_export_parquet(self, auth_client, hub_id, training_program):
+        """Test Parquet export streams the filtered rows."""
+        import io
+        pq = pytest.importorskip('pyarrow.parquet')
+        for status in ('enrolled', 'completed'):
+            EmployeeTraining.objects.create(
+                hub_id=hub_id, employee_id=uuid.uuid4(), employee_name='Ann', program=training_program, status=status,
+            )
+        url = reverse('training:employee_trainings_list')
+        response = auth_client.get(url, {'export': 'parquet', 'status': 'completed'})
+        assert response.status_code == 200
+        assert 'employee_trainings.parquet' in response['Content-Disposition']
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        assert table.column('status').to_pylist() == ['completed']
+
     def test_add_form_loads(self, auth_client):
         """Test add form loads."""
         url = reverse('training:employee_training_add')
@@ -303,6 +349,19 @@ class TestEmployeeTrainingViews:
         response = auth_client.post(url, data)
         assert response.status_code == 200
 
+    def test_add_post_is_idempotent(self, auth_client, training_program):
+        """Test a double-submitted enrollment creates one row."""
+        url = reverse('training:employee_training_add')
+        data = {
+            'employee_id': str(uuid.uuid4()),
+            'employee_name': 'New Employee Name',
+            'program': str(training_program.pk),
+            'status': 'enrolled',
+        }
+        auth_client.post(url, data)
+        auth_client.post(url, data)
+        assert EmployeeTraining.objects.filter(employee_id=data['employee_id']).count() == 1
+
     def test_edit_form_loads(self, auth_client, employee_training):
         """Test edit form loads."""
         url = reverse('training:employee_training_edit', args=[employee_training.pk])
@@ -344,6 +403,21 @@ class TestEmployeeTrainingViews:
         assert response.status_code == 302
 
 
+@pytest.mark.django_db
+class TestRollupReport:
+    """Rollup report view tests."""
+
+    def test_rollup_streams_session_hub(self, auth_client, hub_id):
+        """Test the report streams the session hub and the merged total."""
+        url = reverse('training:rollup_report')
+        response = auth_client.get(url)
+        assert response.status_code == 200
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 2
+        assert str(hub_id) in lines[0]
+        assert lines[1].startswith('{"total"')
+
+
 @pytest.mark.django_db
 class TestSettings:
     """Settings view tests."""
@@ -354,6 +428,22 @@ class TestSettings:
         response = auth_client.get(url)
         assert response.status_code == 200
 
+    def test_settings_save(self, auth_client, hub_id, training_program):
+        """Test saved settings apply to the list views."""
+        from training.models import TrainingSettings
+        response = auth_client.post(reverse('training:settings'), {
+            'default_per_page': 24, 'search_mode': 'prefix', 'default_status': 'in_progress',
+            'export_row_limit': 0, 'archive_retention_days': 90,
+            'count_cache_timeout': 60, 'facet_cache_timeout': 60, 'leaderboard_cache_timeout': 60,
+        })
+        assert response.status_code == 200
+        assert TrainingSettings.objects.get(hub_id=hub_id).default_per_page == 24
+
+        response = auth_client.get(reverse('training:training_programs_list'), {'q': 'Name'})
+        assert response.status_code == 200
+        assert response.context['per_page'] == 24
+        assert not list(response.context['training_programs'])
+
     def test_settings_requires_auth(self, client):
         """Test settings requires authentication."""
         url = reverse('training:settings')
@@ -0,0 +1,145 @@
+"""
+Execution code for the Training assistant tools.
+
+``ai_tools`` only declares tool metadata and is imported by every worker at
+boot to register the tools. This module holds the ORM and service code and
+is imported the first time a tool actually runs.
+"""
+from training.models import EmployeeTraining, TrainingProgram
+from training.routers import read_replica
+from training.services.counters import with_completion_ratio
+from training.services.enrollment import enroll_employee
+from training.services.leaderboards import LEADERBOARDS, get_leaderboard
+from training.services.prerequisites import missing_prerequisites
+
+NOT_FOUND = {"error": "Training program not found"}
+PROGRAM_ORDER = {'name': ('name',), 'popularity': ('-enrollment_count', 'name'), 'completion_rate': ('-completion_ratio', 'name')}
+
+
+def _replica(request, *tables):
+    hub_id = request.session.get('hub_id') if request is not None else None
+    return read_replica(hub_id, tables)
+
+
+def _program(program_id):
+    try:
+        return TrainingProgram.objects.get(id=program_id)
+    except TrainingProgram.DoesNotExist:
+        return None
+
+
+def _programs(args):
+    qs = TrainingProgram.objects.all()
+    if 'is_active' in args:
+        qs = qs.filter(is_active=args['is_active'])
+    if 'is_mandatory' in args:
+        qs = qs.filter(is_mandatory=args['is_mandatory'])
+    sort = args.get('sort') if args.get('sort') in PROGRAM_ORDER else 'name'
+    if sort == 'completion_rate':
+        qs = with_completion_ratio(qs)
+    return qs.order_by(*PROGRAM_ORDER[sort])
+
+
+def _serialize_program(p):
+    return {
+        "id": str(p.id), "name": p.name, "duration_hours": p.duration_hours, "is_mandatory": p.is_mandatory, "is_active": p.is_active,
+        "enrollment_count": p.enrollment_count, "in_progress_count": p.in_progress_count,
+        "completed_count": p.completed_count, "completion_rate": p.completion_rate,
+    }
+
+
+def list_training_programs(args, request):
+    with _replica(request, 'trainingprogram'):
+        return {"programs": [_serialize_program(p) for p in _programs(args)]}
+
+
+async def alist_training_programs(args, request):
+    with _replica(request, 'trainingprogram'):
+        return {"programs": [_serialize_program(p) async for p in _programs(args)]}
+
+
+def create_training_program(args, request):
+    p = TrainingProgram.objects.create(name=args['name'], description=args.get('description', ''), duration_hours=args.get('duration_hours', 0), is_mandatory=args.get('is_mandatory', False))
+    return {"id": str(p.id), "name": p.name, "created": True}
+
+
+def enroll_employee_in_training(args, request):
+    program = _program(args['program_id'])
+    if program is None:
+        return NOT_FOUND
+    missing = list(missing_prerequisites(program, args['employee_id']).values_list('name', flat=True))
+    if missing:
+        return {"error": "Prerequisites not completed", "missing_prerequisites": missing}
+    t, created = enroll_employee(program, args['employee_id'], args['employee_name'], start_date=args.get('start_date'))
+    return {"id": str(t.id), "created": created}
+
+
+def get_training_program(args, request):
+    with _replica(request, 'trainingprogram'):
+        p = _program(args['program_id'])
+    if p is None:
+        return NOT_FOUND
+    return {"id": str(p.id), "name": p.name, "description": p.description, "duration_hours": p.duration_hours, "is_mandatory": p.is_mandatory, "is_active": p.is_active}
+
+
+def update_training_program(args, request):
+    p = _program(args['program_id'])
+    if p is None:
+        return NOT_FOUND
+    for field in ('name', 'description', 'duration_hours', 'is_mandatory', 'is_active'):
+        if field in args:
+            setattr(p, field, args[field])
+    p.save()
+    return {"id": str(p.id), "name": p.name, "updated": True}
+
+
+def delete_training_program(args, request):
+    p = _program(args['program_id'])
+    if p is None:
+        return NOT_FOUND
+    p.delete()
+    return {"deleted": True}
+
+
+def _enrollments(args):
+    qs = EmployeeTraining.objects.all()
+    if args.get('program_id'):
+        qs = qs.filter(program_id=args['program_id'])
+    if args.get('employee_id'):
+        qs = qs.filter(employee_id=args['employee_id'])
+    if args.get('status'):
+        qs = qs.filter(status=args['status'])
+    return qs
+
+
+def _serialize_enrollment(e):
+    return {"id": str(e.id), "employee_name": e.employee_name, "program": e.program_name, "status": e.status, "start_date": str(e.start_date) if e.start_date else None, "completion_date": str(e.completion_date) if e.completion_date else None, "score": str(e.score) if e.score else None}
+
+
+def list_training_enrollments(args, request):
+    with _replica(request, 'employeetraining'):
+        return {"enrollments": [_serialize_enrollment(e) for e in _enrollments(args)]}
+
+
+async def alist_training_enrollments(args, request):
+    with _replica(request, 'employeetraining'):
+        return {"enrollments": [_serialize_enrollment(e) async for e in _enrollments(args)]}
+
+
+
+def _serialize_entry(e):
+    return {**e, "score": str(e['score'])} if 'score' in e else e
+
+
+def get_training_leaderboard(args, request):
+    kind = args.get('kind') or 'score'
+    if kind not in LEADERBOARDS:
+        return {"error": f"Unknown leaderboard: {kind}"}
+    hub_id = request.session.get('hub_id') if request is not None else None
+    with _replica(request, 'employeetraining', 'trainingprogram'):
+        board = get_leaderboard(hub_id, kind)
+    if args.get('program_id'):
+        board = [p for p in board if p['program_id'] == str(args['program_id'])]
+    return {"kind": kind, "programs": [
+        {**p, "entries": [_serialize_entry(e) for e in p['entries']]} for p in board
+    ]}
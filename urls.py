@@ -1,18 +1,24 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if getattr(settings, 'TRAINING_ASYNC_VIEWS', False):
+    from . import async_views as read_views
+else:
+    read_views = views
+
 app_name = 'training'
 
 urlpatterns = [
     # Dashboard
-    path('', views.dashboard, name='dashboard'),
+    path('', read_views.dashboard, name='dashboard'),
 
     # Navigation tab aliases
-    path('programs/', views.training_programs_list, name='programs'),
+    path('programs/', read_views.training_programs_list, name='programs'),
 
 
     # TrainingProgram
-    path('training_programs/', views.training_programs_list, name='training_programs_list'),
+    path('training_programs/', read_views.training_programs_list, name='training_programs_list'),
     path('training_programs/add/', views.training_program_add, name='training_program_add'),
     path('training_programs/<uuid:pk>/edit/', views.training_program_edit, name='training_program_edit'),
     path('training_programs/<uuid:pk>/delete/', views.training_program_delete, name='training_program_delete'),
@@ -20,7 +26,7 @@ urlpatterns = [
     path('training_programs/bulk/', views.training_programs_bulk_action, name='training_programs_bulk_action'),
 
     # Skill
-    path('skills/', views.skills_list, name='skills_list'),
+    path('skills/', read_views.skills_list, name='skills_list'),
     path('skills/add/', views.skill_add, name='skill_add'),
     path('skills/<uuid:pk>/edit/', views.skill_edit, name='skill_edit'),
     path('skills/<uuid:pk>/delete/', views.skill_delete, name='skill_delete'),
@@ -28,12 +34,38 @@ urlpatterns = [
     path('skills/bulk/', views.skills_bulk_action, name='skills_bulk_action'),
 
     # EmployeeTraining
-    path('employee_trainings/', views.employee_trainings_list, name='employee_trainings_list'),
+    path('employee_trainings/', read_views.employee_trainings_list, name='employee_trainings_list'),
     path('employee_trainings/add/', views.employee_training_add, name='employee_training_add'),
     path('employee_trainings/<uuid:pk>/edit/', views.employee_training_edit, name='employee_training_edit'),
     path('employee_trainings/<uuid:pk>/delete/', views.employee_training_delete, name='employee_training_delete'),
     path('employee_trainings/bulk/', views.employee_trainings_bulk_action, name='employee_trainings_bulk_action'),
 
+    # TrainingSession
+    path('training_programs/<uuid:pk>/sessions/', views.program_sessions, name='program_sessions'),
+    path('sessions/<uuid:pk>/', views.session_detail, name='session_detail'),
+    path('sessions/<uuid:pk>/book/', views.session_book, name='session_book'),
+    path('bookings/<uuid:pk>/cancel/', views.booking_cancel, name='booking_cancel'),
+    path('bookings/<uuid:pk>/attendance/', views.booking_attendance, name='booking_attendance'),
+
+    # ProgramPrerequisite
+    path('training_programs/<uuid:pk>/prerequisites/', views.program_prerequisites, name='program_prerequisites'),
+    path('prerequisites/<uuid:pk>/delete/', views.prerequisite_delete, name='prerequisite_delete'),
+
+    # Search pickers
+    path('search/programs/', views.program_search, name='program_search'),
+    path('search/employees/', views.employee_search, name='employee_search'),
+
+    # Reports
+    path('reports/rollup/', views.rollup_report, name='rollup_report'),
+    path('reports/hours/', views.hours_report, name='hours_report'),
+    path('reports/trends/', views.trends_report, name='trends_report'),
+    path('reports/leaderboard/', views.leaderboard, name='leaderboard'),
+
+    # Transcripts
+    path('transcripts/', views.transcripts, name='transcripts'),
+    path('transcripts/<uuid:pk>/status/', views.transcript_status, name='transcript_status'),
+    path('transcripts/<uuid:pk>/download/', views.transcript_download, name='transcript_download'),
+
     # Settings
     path('settings/', views.settings_view, name='settings'),
 ]
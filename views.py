@@ -1,23 +1,93 @@
 """
 Training & Skills Module Views
 """
+import datetime
+import json
+import uuid
+
 from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
 from django.db.models import Q, Count
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.urls import reverse
 from django.shortcuts import get_object_or_404, render as django_render
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_POST
 
 from apps.accounts.decorators import login_required, permission_required
 from apps.core.htmx import htmx_view
-from apps.core.services import export_to_csv, export_to_excel
 from apps.modules_runtime.navigation import with_module_nav
 
-from .models import TrainingProgram, Skill, EmployeeTraining
+from .cache import bump_version
+from .coalesce import coalesced
+from .conditional import conditional_on
+from .facets import EMPLOYEE_TRAINING_FACETS, SKILL_FACETS, TRAINING_PROGRAM_FACETS, filter_list
+from .forms import TrainingSettingsForm
+from .hub_settings import default_settings, request_settings
+from .models import (
+    CLOSED_STATUSES, SEAT_HOLDING_STATUSES, TrainingProgram, Skill, EmployeeTraining, TrainingSession, SessionBooking,
+    ProgramPrerequisite, TranscriptJob, TrainingSettings,
+)
+from .pagination import CountingPaginator
+from .reports import allowed_hub_ids, iter_hub_aggregates, merge_aggregates
+from .routers import replica_reads, routed_stream
+from .services.columnar import COLUMNAR_CONTENT_TYPES, COLUMNAR_EXTENSIONS, COLUMNAR_FORMATS, arrow_available, stream_columnar
+from .services.counters import with_completion_ratio
+from .services.enrollment import enroll_employee, soft_delete_enrollments
+from .services.search import search_employees, search_programs
+from .services.leaderboards import LEADERBOARDS, get_leaderboard
+from .services.hours import employee_hours, hub_hours, quarter_bounds
+from .services.prerequisites import (
+    PrerequisiteCycleError, add_prerequisite, missing_prerequisites, remove_prerequisite,
+)
+from .services.sessions import book_seat, cancel_booking, set_attendance
+from .services.transcripts import create_job, pdf_available
+from .services.trends import cohorts, trend
 
 PER_PAGE_CHOICES = [12, 24, 48, 96, 0]
+SEARCH_LOOKUPS = {'contains': 'icontains', 'prefix': 'istartswith'}
+EXPORT_FORMATS = ('csv', 'excel') + COLUMNAR_FORMATS
+
+
+def _parse_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def list_per_page(request, hub_settings):
+    """The requested page size, or the hub's default when missing or not offered."""
+    per_page = int(request.GET.get('per_page', hub_settings.default_per_page))
+    if per_page not in PER_PAGE_CHOICES:
+        per_page = hub_settings.default_per_page
+    return per_page
+
+
+def search_filter(query, fields, hub_settings):
+    """OR of ``fields`` matching ``query`` in the hub's search mode."""
+    lookup = SEARCH_LOOKUPS.get(hub_settings.search_mode, 'icontains')
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__{lookup}': query})
+    return condition
+
+
+def export_rows(qs, hub_settings):
+    """Cap an export at the hub's row limit (0: no limit)."""
+    return qs[:hub_settings.export_row_limit] if hub_settings.export_row_limit else qs
+
+
+def columnar_response(stream, fmt, basename):
+    """Download response for a Parquet or Arrow ``stream`` (see ``services.columnar``)."""
+    if not arrow_available():
+        raise Http404
+    response = StreamingHttpResponse(stream, content_type=COLUMNAR_CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{basename}.{COLUMNAR_EXTENSIONS[fmt]}"'
+    return response
 
 
 # ======================================================================
@@ -25,6 +95,8 @@ PER_PAGE_CHOICES = [12, 24, 48, 96, 0]
 # ======================================================================
 
 @login_required
+@conditional_on('trainingprogram', 'skill', 'employeetraining')
+@replica_reads('trainingprogram', 'skill', 'employeetraining')
 @with_module_nav('training', 'dashboard')
 @htmx_view('training/pages/index.html', 'training/partials/dashboard_content.html')
 def dashboard(request):
@@ -47,11 +119,33 @@ TRAINING_PROGRAM_SORT_FIELDS = {
     'duration_hours': 'duration_hours',
     'description': 'description',
     'created_at': 'created_at',
+    'enrollment_count': 'enrollment_count',
+    'completed_count': 'completed_count',
+    'completion_rate': 'completion_ratio',
 }
 
+
+def filter_program_counters(qs, params):
+    """
+    Apply ``min_enrollments`` and ``min_completion`` (percent) from the query
+    string, annotating the completion ratio only when it is filtered or sorted on.
+    """
+    try:
+        min_enrollments = int(params.get('min_enrollments') or 0)
+        min_completion = float(params.get('min_completion') or 0)
+    except ValueError:
+        min_enrollments = min_completion = 0
+    if min_completion > 0 or params.get('sort') == 'completion_rate':
+        qs = with_completion_ratio(qs)
+    if min_enrollments > 0:
+        qs = qs.filter(enrollment_count__gte=min_enrollments)
+    if min_completion > 0:
+        qs = qs.filter(completion_ratio__gte=min_completion / 100)
+    return qs
+
 def _build_training_programs_context(hub_id, per_page=10):
     qs = TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False).order_by('name')
-    paginator = Paginator(qs, per_page if per_page > 0 else max(qs.count(), 1))
+    paginator = CountingPaginator(qs, per_page if per_page > 0 else max(qs.count(), 1), hub_id=hub_id)
     page_obj = paginator.get_page(1)
     return {
         'training_programs': page_obj,
@@ -68,8 +162,11 @@ def _render_training_programs_list(request, hub_id, per_page=10):
     return django_render(request, 'training/partials/training_programs_list.html', ctx)
 
 @login_required
+@conditional_on('trainingprogram', 'trainingsettings')
+@replica_reads('trainingprogram', 'trainingsettings')
 @with_module_nav('training', 'programs')
 @htmx_view('training/pages/training_programs.html', 'training/partials/training_programs_content.html')
+@coalesced('trainingprogram', 'trainingsettings')
 def training_programs_list(request):
     hub_id = request.session.get('hub_id')
     search_query = request.GET.get('q', '').strip()
@@ -77,29 +174,44 @@ def training_programs_list(request):
     sort_dir = request.GET.get('dir', 'asc')
     page_number = request.GET.get('page', 1)
     current_view = request.GET.get('view', 'table')
-    per_page = int(request.GET.get('per_page', 12))
-    if per_page not in PER_PAGE_CHOICES:
-        per_page = 12
+    hub_settings = request_settings(request)
+    per_page = list_per_page(request, hub_settings)
 
     qs = TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False)
 
     if search_query:
-        qs = qs.filter(Q(name__icontains=search_query) | Q(description__icontains=search_query))
+        qs = qs.filter(search_filter(search_query, ['name', 'description'], hub_settings))
+    qs = filter_program_counters(qs, request.GET)
+
+    export_format = request.GET.get('export')
+    qs, facet_context = filter_list(
+        TRAINING_PROGRAM_FACETS, qs, request.GET, hub_id, with_counts=export_format not in EXPORT_FORMATS,
+        timeout=hub_settings.facet_cache_timeout,
+    )
 
     order_by = TRAINING_PROGRAM_SORT_FIELDS.get(sort_field, 'name')
     if sort_dir == 'desc':
         order_by = f'-{order_by}'
     qs = qs.order_by(order_by)
 
-    export_format = request.GET.get('export')
     if export_format in ('csv', 'excel'):
-        fields = ['name', 'is_mandatory', 'is_active', 'duration_hours', 'description']
-        headers = ['Name', 'Is Mandatory', 'Is Active', 'Duration Hours', 'Description']
+        # Loaded on first export: pulls in the spreadsheet writers.
+        from apps.core.services import export_to_csv, export_to_excel
+        fields = ['name', 'is_mandatory', 'is_active', 'duration_hours', 'description', 'enrollment_count', 'completed_count']
+        headers = ['Name', 'Is Mandatory', 'Is Active', 'Duration Hours', 'Description', 'Enrollments', 'Completed']
+        qs = export_rows(qs, hub_settings)
         if export_format == 'csv':
             return export_to_csv(qs, fields=fields, headers=headers, filename='training_programs.csv')
         return export_to_excel(qs, fields=fields, headers=headers, filename='training_programs.xlsx')
-
-    paginator = Paginator(qs, per_page if per_page > 0 else max(qs.count(), 1))
+    if export_format in COLUMNAR_FORMATS:
+        qs = export_rows(qs, hub_settings)
+        stream = routed_stream(stream_columnar(qs.model._meta.model_name, qs, export_format))
+        return columnar_response(stream, export_format, 'training_programs')
+
+    paginator = CountingPaginator(
+        qs, per_page if per_page > 0 else max(qs.count(), 1), hub_id=hub_id,
+        timeout=hub_settings.count_cache_timeout,
+    )
     page_obj = paginator.get_page(page_number)
 
     if request.htmx and request.htmx.target == 'datatable-body':
@@ -107,12 +219,15 @@ def training_programs_list(request):
             'training_programs': page_obj, 'page_obj': page_obj,
             'search_query': search_query, 'sort_field': sort_field,
             'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
+            **facet_context,
         })
 
     return {
         'training_programs': page_obj, 'page_obj': page_obj,
         'search_query': search_query, 'sort_field': sort_field,
         'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
+        'columnar_available': arrow_available(),
+        **facet_context,
     }
 
 @login_required
@@ -184,6 +299,7 @@ def training_programs_bulk_action(request):
         qs.update(is_active=False)
     elif action == 'delete':
         qs.update(is_deleted=True, deleted_at=timezone.now())
+    bump_version(hub_id, 'trainingprogram')
     return _render_training_programs_list(request, hub_id)
 
 
@@ -200,7 +316,7 @@ SKILL_SORT_FIELDS = {
 
 def _build_skills_context(hub_id, per_page=10):
     qs = Skill.objects.filter(hub_id=hub_id, is_deleted=False).order_by('name')
-    paginator = Paginator(qs, per_page if per_page > 0 else max(qs.count(), 1))
+    paginator = CountingPaginator(qs, per_page if per_page > 0 else max(qs.count(), 1), hub_id=hub_id)
     page_obj = paginator.get_page(1)
     return {
         'skills': page_obj,
@@ -217,8 +333,11 @@ def _render_skills_list(request, hub_id, per_page=10):
     return django_render(request, 'training/partials/skills_list.html', ctx)
 
 @login_required
+@conditional_on('skill', 'trainingsettings')
+@replica_reads('skill', 'trainingsettings')
 @with_module_nav('training', 'skills')
 @htmx_view('training/pages/skills.html', 'training/partials/skills_content.html')
+@coalesced('skill', 'trainingsettings')
 def skills_list(request):
     hub_id = request.session.get('hub_id')
     search_query = request.GET.get('q', '').strip()
@@ -226,29 +345,42 @@ def skills_list(request):
     sort_dir = request.GET.get('dir', 'asc')
     page_number = request.GET.get('page', 1)
     current_view = request.GET.get('view', 'table')
-    per_page = int(request.GET.get('per_page', 12))
-    if per_page not in PER_PAGE_CHOICES:
-        per_page = 12
+    hub_settings = request_settings(request)
+    per_page = list_per_page(request, hub_settings)
 
     qs = Skill.objects.filter(hub_id=hub_id, is_deleted=False)
 
     if search_query:
-        qs = qs.filter(Q(name__icontains=search_query) | Q(category__icontains=search_query))
+        qs = qs.filter(search_filter(search_query, ['name', 'category'], hub_settings))
+
+    export_format = request.GET.get('export')
+    qs, facet_context = filter_list(
+        SKILL_FACETS, qs, request.GET, hub_id, with_counts=export_format not in EXPORT_FORMATS,
+        timeout=hub_settings.facet_cache_timeout,
+    )
 
     order_by = SKILL_SORT_FIELDS.get(sort_field, 'name')
     if sort_dir == 'desc':
         order_by = f'-{order_by}'
     qs = qs.order_by(order_by)
 
-    export_format = request.GET.get('export')
     if export_format in ('csv', 'excel'):
+        from apps.core.services import export_to_csv, export_to_excel
         fields = ['name', 'is_active', 'category']
         headers = ['Name', 'Is Active', 'Category']
+        qs = export_rows(qs, hub_settings)
         if export_format == 'csv':
             return export_to_csv(qs, fields=fields, headers=headers, filename='skills.csv')
         return export_to_excel(qs, fields=fields, headers=headers, filename='skills.xlsx')
-
-    paginator = Paginator(qs, per_page if per_page > 0 else max(qs.count(), 1))
+    if export_format in COLUMNAR_FORMATS:
+        qs = export_rows(qs, hub_settings)
+        stream = routed_stream(stream_columnar(qs.model._meta.model_name, qs, export_format))
+        return columnar_response(stream, export_format, 'skills')
+
+    paginator = CountingPaginator(
+        qs, per_page if per_page > 0 else max(qs.count(), 1), hub_id=hub_id,
+        timeout=hub_settings.count_cache_timeout,
+    )
     page_obj = paginator.get_page(page_number)
 
     if request.htmx and request.htmx.target == 'datatable-body':
@@ -256,12 +388,15 @@ def skills_list(request):
             'skills': page_obj, 'page_obj': page_obj,
             'search_query': search_query, 'sort_field': sort_field,
             'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
+            **facet_context,
         })
 
     return {
         'skills': page_obj, 'page_obj': page_obj,
         'search_query': search_query, 'sort_field': sort_field,
         'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
+        'columnar_available': arrow_available(),
+        **facet_context,
     }
 
 @login_required
@@ -327,6 +462,7 @@ def skills_bulk_action(request):
         qs.update(is_active=False)
     elif action == 'delete':
         qs.update(is_deleted=True, deleted_at=timezone.now())
+    bump_version(hub_id, 'skill')
     return _render_skills_list(request, hub_id)
 
 
@@ -335,7 +471,7 @@ def skills_bulk_action(request):
 # ======================================================================
 
 EMPLOYEE_TRAINING_SORT_FIELDS = {
-    'program': 'program',
+    'program': 'program_name',
     'status': 'status',
     'score': 'score',
     'employee_id': 'employee_id',
@@ -345,8 +481,8 @@ EMPLOYEE_TRAINING_SORT_FIELDS = {
 }
 
 def _build_employee_trainings_context(hub_id, per_page=10):
-    qs = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False).order_by('program')
-    paginator = Paginator(qs, per_page if per_page > 0 else max(qs.count(), 1))
+    qs = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False).order_by('program_name')
+    paginator = CountingPaginator(qs, per_page if per_page > 0 else max(qs.count(), 1), hub_id=hub_id)
     page_obj = paginator.get_page(1)
     return {
         'employee_trainings': page_obj,
@@ -363,8 +499,11 @@ def _render_employee_trainings_list(request, hub_id, per_page=10):
     return django_render(request, 'training/partials/employee_trainings_list.html', ctx)
 
 @login_required
+@conditional_on('employeetraining', 'trainingprogram', 'trainingsettings')
+@replica_reads('employeetraining', 'trainingprogram', 'trainingsettings')
 @with_module_nav('training', 'programs')
 @htmx_view('training/pages/employee_trainings.html', 'training/partials/employee_trainings_content.html')
+@coalesced('employeetraining', 'trainingprogram', 'trainingsettings')
 def employee_trainings_list(request):
     hub_id = request.session.get('hub_id')
     search_query = request.GET.get('q', '').strip()
@@ -372,29 +511,46 @@ def employee_trainings_list(request):
     sort_dir = request.GET.get('dir', 'asc')
     page_number = request.GET.get('page', 1)
     current_view = request.GET.get('view', 'table')
-    per_page = int(request.GET.get('per_page', 12))
-    if per_page not in PER_PAGE_CHOICES:
-        per_page = 12
+    hub_settings = request_settings(request)
+    per_page = list_per_page(request, hub_settings)
 
     qs = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False)
 
     if search_query:
-        qs = qs.filter(Q(employee_name__icontains=search_query) | Q(status__icontains=search_query))
+        qs = qs.filter(search_filter(search_query, ['employee_name', 'program_name', 'status'], hub_settings))
 
-    order_by = EMPLOYEE_TRAINING_SORT_FIELDS.get(sort_field, 'program')
+    program_name = request.GET.get('program_name', '').strip()
+    if program_name:
+        qs = qs.filter(program_name=program_name)
+
+    export_format = request.GET.get('export')
+    qs, facet_context = filter_list(
+        EMPLOYEE_TRAINING_FACETS, qs, request.GET, hub_id, with_counts=export_format not in EXPORT_FORMATS,
+        timeout=hub_settings.facet_cache_timeout,
+    )
+
+    order_by = EMPLOYEE_TRAINING_SORT_FIELDS.get(sort_field, 'program_name')
     if sort_dir == 'desc':
         order_by = f'-{order_by}'
     qs = qs.order_by(order_by)
 
-    export_format = request.GET.get('export')
     if export_format in ('csv', 'excel'):
-        fields = ['program', 'status', 'score', 'employee_id', 'employee_name', 'start_date']
+        from apps.core.services import export_to_csv, export_to_excel
+        fields = ['program_name', 'status', 'score', 'employee_id', 'employee_name', 'start_date']
         headers = ['TrainingProgram', 'Status', 'Score', 'Employee Id', 'Employee Name', 'Start Date']
+        qs = export_rows(qs, hub_settings)
         if export_format == 'csv':
             return export_to_csv(qs, fields=fields, headers=headers, filename='employee_trainings.csv')
         return export_to_excel(qs, fields=fields, headers=headers, filename='employee_trainings.xlsx')
-
-    paginator = Paginator(qs, per_page if per_page > 0 else max(qs.count(), 1))
+    if export_format in COLUMNAR_FORMATS:
+        qs = export_rows(qs, hub_settings)
+        stream = routed_stream(stream_columnar(qs.model._meta.model_name, qs, export_format))
+        return columnar_response(stream, export_format, 'employee_trainings')
+
+    paginator = CountingPaginator(
+        qs, per_page if per_page > 0 else max(qs.count(), 1), hub_id=hub_id,
+        timeout=hub_settings.count_cache_timeout,
+    )
     page_obj = paginator.get_page(page_number)
 
     if request.htmx and request.htmx.target == 'datatable-body':
@@ -402,37 +558,49 @@ def employee_trainings_list(request):
             'employee_trainings': page_obj, 'page_obj': page_obj,
             'search_query': search_query, 'sort_field': sort_field,
             'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
+            **facet_context,
         })
 
     return {
         'employee_trainings': page_obj, 'page_obj': page_obj,
         'search_query': search_query, 'sort_field': sort_field,
         'sort_dir': sort_dir, 'current_view': current_view, 'per_page': per_page,
+        'columnar_available': arrow_available(),
+        **facet_context,
     }
 
 @login_required
 @htmx_view('training/pages/employee_training_add.html', 'training/partials/employee_training_add_content.html')
 def employee_training_add(request):
     hub_id = request.session.get('hub_id')
+    programs = TrainingProgram.objects.filter(hub_id=hub_id, is_deleted=False, is_active=True)
+    default_status = request_settings(request).default_status
     if request.method == 'POST':
         employee_id = request.POST.get('employee_id', '').strip()
         employee_name = request.POST.get('employee_name', '').strip()
-        status = request.POST.get('status', '').strip()
+        status = request.POST.get('status', '').strip() or default_status
         start_date = request.POST.get('start_date') or None
         completion_date = request.POST.get('completion_date') or None
         score = request.POST.get('score', '0') or '0'
-        obj = EmployeeTraining(hub_id=hub_id)
-        obj.employee_id = employee_id
-        obj.employee_name = employee_name
-        obj.status = status
-        obj.start_date = start_date
-        obj.completion_date = completion_date
-        obj.score = score
-        obj.save()
+        program = programs.filter(pk=_parse_uuid(request.POST.get('program'))).first()
+        if program is None or _parse_uuid(employee_id) is None:
+            return {'error': _('Select an employee and a training program.'), 'default_status': default_status}
+        if status not in CLOSED_STATUSES:
+            missing = list(missing_prerequisites(program, employee_id).values_list('name', flat=True))
+            if missing:
+                return {
+                    'error': _('Complete these programs first: %(names)s') % {'names': ', '.join(missing)},
+                    'default_status': default_status,
+                }
+        # Idempotent: a double-submit returns the enrollment the first one created.
+        enroll_employee(
+            program, employee_id, employee_name, status=status,
+            start_date=start_date, completion_date=completion_date, score=score,
+        )
         response = HttpResponse(status=204)
         response['HX-Redirect'] = reverse('training:employee_trainings_list')
         return response
-    return {}
+    return {'default_status': default_status}
 
 @login_required
 @htmx_view('training/pages/employee_training_edit.html', 'training/partials/employee_training_edit_content.html')
@@ -446,7 +614,11 @@ def employee_training_edit(request, pk):
         obj.start_date = request.POST.get('start_date') or None
         obj.completion_date = request.POST.get('completion_date') or None
         obj.score = request.POST.get('score', '0') or '0'
-        obj.save()
+        try:
+            with transaction.atomic():
+                obj.save()
+        except IntegrityError:
+            return {'obj': obj, 'error': _('This employee already has an active enrollment in this program.')}
         return _render_employee_trainings_list(request, hub_id)
     return {'obj': obj}
 
@@ -468,14 +640,349 @@ def employee_trainings_bulk_action(request):
     action = request.POST.get('action', '')
     qs = EmployeeTraining.objects.filter(hub_id=hub_id, is_deleted=False, id__in=ids)
     if action == 'delete':
-        qs.update(is_deleted=True, deleted_at=timezone.now())
+        soft_delete_enrollments(qs)
+    bump_version(hub_id, 'employeetraining')
     return _render_employee_trainings_list(request, hub_id)
 
 
+# ======================================================================
+# TrainingSession
+# ======================================================================
+
+def _parse_aware_datetime(value):
+    value = parse_datetime(value or '')
+    if value is not None and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+def _build_session_detail_context(session):
+    bookings = session.bookings.filter(is_deleted=False).order_by('created_at', 'id')
+    return {
+        'session': session,
+        'program': session.program,
+        'confirmed_bookings': [b for b in bookings if b.status in SEAT_HOLDING_STATUSES],
+        'waitlisted_bookings': [b for b in bookings if b.status == 'waitlisted'],
+    }
+
+def _render_session_detail(request, session):
+    session.refresh_from_db(fields=['seats_taken'])
+    ctx = _build_session_detail_context(session)
+    return django_render(request, 'training/partials/session_detail_content.html', ctx)
+
+@login_required
+@with_module_nav('training', 'programs')
+@htmx_view('training/pages/program_sessions.html', 'training/partials/program_sessions_content.html')
+def program_sessions(request, pk):
+    hub_id = request.session.get('hub_id')
+    program = get_object_or_404(TrainingProgram, pk=pk, hub_id=hub_id, is_deleted=False)
+    error = None
+    if request.method == 'POST':
+        starts_at = _parse_aware_datetime(request.POST.get('starts_at'))
+        try:
+            capacity = int(request.POST.get('capacity', 0) or 0)
+        except ValueError:
+            capacity = -1
+        if starts_at is None:
+            error = _('Enter a start date and time.')
+        elif capacity < 0:
+            error = _('Enter the number of seats as a whole number of 0 or more.')
+        else:
+            TrainingSession.objects.create(
+                hub_id=hub_id, program=program, starts_at=starts_at,
+                ends_at=_parse_aware_datetime(request.POST.get('ends_at')),
+                location=request.POST.get('location', '').strip(),
+                capacity=capacity,
+            )
+    waitlisted = Q(bookings__status='waitlisted', bookings__is_deleted=False)
+    sessions = (
+        TrainingSession.objects.filter(hub_id=hub_id, program=program, is_deleted=False)
+        .annotate(waitlisted=Count('bookings', filter=waitlisted))
+        .order_by('starts_at')
+    )
+    return {'program': program, 'sessions': sessions, 'error': error}
+
+@login_required
+@with_module_nav('training', 'programs')
+@htmx_view('training/pages/session_detail.html', 'training/partials/session_detail_content.html')
+def session_detail(request, pk):
+    hub_id = request.session.get('hub_id')
+    session = get_object_or_404(TrainingSession.objects.select_related('program'), pk=pk, hub_id=hub_id, is_deleted=False)
+    return _build_session_detail_context(session)
+
+@login_required
+@require_POST
+def session_book(request, pk):
+    hub_id = request.session.get('hub_id')
+    session = get_object_or_404(TrainingSession.objects.select_related('program'), pk=pk, hub_id=hub_id, is_deleted=False)
+    employee_id = _parse_uuid(request.POST.get('employee_id'))
+    if employee_id is not None:
+        book_seat(session, employee_id, request.POST.get('employee_name', '').strip())
+    return _render_session_detail(request, session)
+
+@login_required
+@require_POST
+def booking_cancel(request, pk):
+    hub_id = request.session.get('hub_id')
+    booking = get_object_or_404(SessionBooking.objects.select_related('session__program'), pk=pk, hub_id=hub_id, is_deleted=False)
+    cancel_booking(booking)
+    return _render_session_detail(request, booking.session)
+
+@login_required
+@require_POST
+def booking_attendance(request, pk):
+    hub_id = request.session.get('hub_id')
+    booking = get_object_or_404(SessionBooking.objects.select_related('session__program'), pk=pk, hub_id=hub_id, is_deleted=False)
+    set_attendance(booking, attended=request.POST.get('attended') != '0')
+    return _render_session_detail(request, booking.session)
+
+
+# ======================================================================
+# ProgramPrerequisite
+# ======================================================================
+
+def _build_prerequisites_context(program, error=None):
+    links = (
+        program.prerequisite_links.filter(is_deleted=False)
+        .select_related('requires').order_by('requires__name')
+    )
+    chain = (
+        program.closure_prerequisites.filter(depth__gt=1, prerequisite__is_deleted=False)
+        .select_related('prerequisite').order_by('depth', 'prerequisite__name')
+    )
+    return {'program': program, 'links': links, 'chain': chain, 'error': error}
+
+@login_required
+@with_module_nav('training', 'programs')
+@htmx_view('training/pages/program_prerequisites.html', 'training/partials/program_prerequisites_content.html')
+def program_prerequisites(request, pk):
+    hub_id = request.session.get('hub_id')
+    program = get_object_or_404(TrainingProgram, pk=pk, hub_id=hub_id, is_deleted=False)
+    error = None
+    if request.method == 'POST':
+        requires = TrainingProgram.objects.filter(
+            hub_id=hub_id, is_deleted=False, pk=_parse_uuid(request.POST.get('requires')),
+        ).first()
+        if requires is None:
+            error = _('Select a training program.')
+        else:
+            try:
+                add_prerequisite(program, requires)
+            except PrerequisiteCycleError:
+                error = _('%(name)s already requires this program.') % {'name': requires.name}
+    return _build_prerequisites_context(program, error)
+
+@login_required
+@require_POST
+def prerequisite_delete(request, pk):
+    hub_id = request.session.get('hub_id')
+    link = get_object_or_404(ProgramPrerequisite.objects.select_related('program'), pk=pk, hub_id=hub_id, is_deleted=False)
+    remove_prerequisite(link)
+    ctx = _build_prerequisites_context(link.program)
+    return django_render(request, 'training/partials/program_prerequisites_content.html', ctx)
+
+
+# ======================================================================
+# Search pickers
+# ======================================================================
+
+def _search_response(request, results):
+    """``<option>`` tags for HTMX pickers, JSON ``{"results": [...]}`` otherwise."""
+    if request.htmx:
+        return django_render(request, 'training/partials/search_options.html', {'results': results})
+    return JsonResponse({'results': results})
+
+@login_required
+@replica_reads('trainingprogram')
+@coalesced('trainingprogram')
+def program_search(request):
+    hub_id = request.session.get('hub_id')
+    results = [
+        {'id': str(row['id']), 'label': row['name']}
+        for row in search_programs(hub_id, request.GET.get('q', '').strip())
+    ]
+    return _search_response(request, results)
+
+@login_required
+@replica_reads('employeetraining')
+@coalesced('employeetraining')
+def employee_search(request):
+    hub_id = request.session.get('hub_id')
+    results = [
+        {'id': str(row['employee_id']), 'label': row['employee_name']}
+        for row in search_employees(hub_id, request.GET.get('q', '').strip())
+    ]
+    return _search_response(request, results)
+
+
+# ======================================================================
+# Reports
+# ======================================================================
+
+@login_required
+@permission_required('training.view_rollup')
+def rollup_report(request):
+    """
+    Stream per-hub training aggregates as NDJSON, then the merged totals.
+
+    ``?hub=<uuid>`` (repeatable) narrows the report to some of the hubs the
+    user may see; without it every allowed hub is included.
+    """
+    allowed = allowed_hub_ids(request)
+    requested = request.GET.getlist('hub')
+    hub_ids = [hub_id for hub_id in allowed if hub_id in requested] if requested else allowed
+
+    def stream():
+        rows = []
+        for row in iter_hub_aggregates(hub_ids):
+            rows.append(row)
+            yield json.dumps({'hub': row}, cls=DjangoJSONEncoder) + '\n'
+        yield json.dumps({'total': merge_aggregates(rows)}, cls=DjangoJSONEncoder) + '\n'
+
+    return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+@login_required
+@permission_required('training.view_rollup')
+@replica_reads('employeetraining')
+@with_module_nav('training', 'dashboard')
+@htmx_view('training/pages/hours_report.html', 'training/partials/hours_report_content.html')
+def hours_report(request):
+    """Quarterly training hours per employee, read from the monthly rollups."""
+    hub_id = request.session.get('hub_id')
+    today = timezone.localdate()
+    try:
+        year = int(request.GET.get('year', today.year))
+        quarter = min(max(int(request.GET.get('quarter', (today.month - 1) // 3 + 1)), 1), 4)
+    except ValueError:
+        year, quarter = today.year, (today.month - 1) // 3 + 1
+    start, end = quarter_bounds(year, quarter)
+    months = list(hub_hours(hub_id, start, end))
+    paginator = Paginator(employee_hours(hub_id, start, end), 50)
+    return {
+        'year': year,
+        'quarter': quarter,
+        'quarters': [1, 2, 3, 4],
+        'months': months,
+        'total_hours': sum((m.hours for m in months), 0),
+        'page_obj': paginator.get_page(request.GET.get('page', 1)),
+    }
+
+
+@login_required
+@permission_required('training.view_rollup')
+@conditional_on('employeetraining', 'trainingprogram')
+@replica_reads('employeetraining', 'trainingprogram', 'trainingsettings')
+@with_module_nav('training', 'dashboard')
+@htmx_view('training/pages/leaderboard.html', 'training/partials/leaderboard_content.html')
+def leaderboard(request):
+    """Top scorers or fastest completions of every program in the hub."""
+    hub_id = request.session.get('hub_id')
+    kind = request.GET.get('kind') if request.GET.get('kind') in LEADERBOARDS else 'score'
+    board = get_leaderboard(hub_id, kind, timeout=request_settings(request).leaderboard_cache_timeout)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'kind': kind, 'programs': board})
+    return {'kind': kind, 'board': board}
+
+
+TREND_RANGES = {'week': 26, 'month': 24}
+
+@login_required
+@permission_required('training.view_rollup')
+@replica_reads('employeetraining')
+@with_module_nav('training', 'dashboard')
+@htmx_view('training/pages/trends_report.html', 'training/partials/trends_report_content.html')
+def trends_report(request):
+    """Enrollment, completion and failure trends plus start-month cohorts, read from the rollups."""
+    hub_id = request.session.get('hub_id')
+    grain = request.GET.get('grain') if request.GET.get('grain') in TREND_RANGES else 'month'
+    program = TrainingProgram.objects.filter(
+        hub_id=hub_id, is_deleted=False, pk=_parse_uuid(request.GET.get('program')),
+    ).first()
+    today = timezone.localdate()
+    end = today + datetime.timedelta(days=1)
+    if grain == 'week':
+        start = today - datetime.timedelta(weeks=TREND_RANGES['week'])
+    else:
+        start = (today.replace(day=1) - datetime.timedelta(days=31 * TREND_RANGES['month'])).replace(day=1)
+    cohort_start = (today.replace(day=1) - datetime.timedelta(days=31 * 12)).replace(day=1)
+    return {
+        'grain': grain,
+        'grains': list(TREND_RANGES),
+        'program': program,
+        'periods': list(trend(hub_id, grain, start, end, program=program)),
+        'cohorts': list(cohorts(hub_id, cohort_start, end, program=program)),
+    }
+
+
+# ======================================================================
+# Transcripts
+# ======================================================================
+
+@login_required
+@permission_required('training.view_rollup')
+@with_module_nav('training', 'dashboard')
+@htmx_view('training/pages/transcripts.html', 'training/partials/transcripts_content.html')
+def transcripts(request):
+    """Queue batch transcript jobs and list the hub's recent ones."""
+    hub_id = request.session.get('hub_id')
+    error = None
+    if request.method == 'POST':
+        submitted = request.POST.getlist('employee_id')
+        employee_ids = [e for e in submitted if _parse_uuid(e) is not None]
+        if submitted and not employee_ids:
+            # Without this, a job for the whole hub would be queued.
+            error = _('Select valid employees, or none for the whole hub.')
+        else:
+            try:
+                create_job(
+                    hub_id, employee_ids, fmt=request.POST.get('format', 'html'),
+                    user_id=_parse_uuid(request.session.get('local_user_id')),
+                )
+            except ValueError as exc:
+                error = str(exc)
+    jobs = TranscriptJob.objects.filter(hub_id=hub_id, is_deleted=False).order_by('-created_at')[:20]
+    return {'jobs': jobs, 'error': error, 'pdf_available': pdf_available()}
+
+@login_required
+@permission_required('training.view_rollup')
+def transcript_status(request, pk):
+    hub_id = request.session.get('hub_id')
+    job = get_object_or_404(TranscriptJob, pk=pk, hub_id=hub_id, is_deleted=False)
+    if request.htmx:
+        return django_render(request, 'training/partials/transcript_job_row.html', {'job': job})
+    return JsonResponse({
+        'id': str(job.pk), 'status': job.status, 'total': job.total, 'rendered': job.rendered,
+        'progress': job.progress, 'error': job.error,
+        'download_url': reverse('training:transcript_download', args=[job.pk]) if job.status == 'done' else None,
+    })
+
+@login_required
+@permission_required('training.view_rollup')
+def transcript_download(request, pk):
+    hub_id = request.session.get('hub_id')
+    job = get_object_or_404(TranscriptJob, pk=pk, hub_id=hub_id, is_deleted=False, status='done')
+    try:
+        archive = open(job.archive_path, 'rb')
+    except OSError:
+        raise Http404
+    return FileResponse(archive, as_attachment=True, filename=f'transcripts-{job.created_at:%Y%m%d}-{job.pk}.zip')
+
+
 @login_required
 @permission_required('training.manage_settings')
 @with_module_nav('training', 'settings')
 @htmx_view('training/pages/settings.html', 'training/partials/settings_content.html')
 def settings_view(request):
-    return {}
+    hub_id = request.session.get('hub_id')
+    instance = TrainingSettings.objects.filter(hub_id=hub_id, is_deleted=False).first()
+    if instance is None:
+        instance = default_settings(hub_id)
+    saved = False
+    if request.method == 'POST':
+        form = TrainingSettingsForm(request.POST, instance=instance)
+        if form.is_valid():
+            form.save()
+            saved = True
+    else:
+        form = TrainingSettingsForm(instance=instance)
+    return {'form': form, 'saved': saved}
 